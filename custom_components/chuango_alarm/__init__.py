@@ -1,18 +1,21 @@
 from __future__ import annotations
 
+from functools import partial
 import logging
 from typing import Any
 
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
-from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.helpers.aiohttp_client import async_create_clientsession
 
 from homeassistant.const import EVENT_HOMEASSISTANT_STOP
 
 from .api import DreamcatcherApiClient
 from .const import DOMAIN, PLATFORMS
-from .coordinator import DreamcatcherCoordinator
+from .coordinator import DreamcatcherCoordinator, async_remove_entry_storage
 from .mqtt import DreamcatcherMqttManager
+from .services import async_setup_services, async_unload_services
+from .websocket_api import async_setup_websocket_api
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -20,8 +23,12 @@ _LOGGER = logging.getLogger(__name__)
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     hass.data.setdefault(DOMAIN, {})
 
-    session = async_get_clientsession(hass)
-    api = DreamcatcherApiClient(session=session, logger=_LOGGER)
+    # Own session with the client's trace hooks; HA closes it on unload and shutdown.
+    api = DreamcatcherApiClient(
+        session=None,
+        logger=_LOGGER,
+        session_factory=partial(async_create_clientsession, hass),
+    )
 
     coordinator = DreamcatcherCoordinator(
         hass=hass,
@@ -38,14 +45,21 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         "mqtt": mqtt,
     }
 
-    # 1) Ensure we have initial shared_devices etc.
-    await coordinator.async_config_entry_first_refresh()
+    # 1) Start from the last stored shared_devices if there is one (REST refresh
+    #    follows in the background), otherwise wait for the initial refresh.
+    serving_stored = await coordinator.async_load_stored_devices()
+    if not serving_stored:
+        await coordinator.async_config_entry_first_refresh()
+
+    # 1b) Last known MQTT state and parts, so entities come up populated.
+    await coordinator.async_restore_runtime_snapshot()
 
     # 2) Start MQTT manager (intern wartet er ggf. bis HA fully started)
     await mqtt.async_start()
 
     # 3) Ensure MQTT stops on reload/remove and on HA shutdown.
     entry.async_on_unload(mqtt.async_stop)
+    entry.async_on_unload(coordinator.async_shutdown)
 
     # Listen for HA stop event (fires before final task cleanup).
     async def _on_ha_stop(_event: Any) -> None:
@@ -58,6 +72,21 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     # 4) Setup entities
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
 
+    # 5) Integration services and websocket commands (registered once for all entries)
+    async_setup_services(hass)
+    async_setup_websocket_api(hass)
+
+    # 6) Revalidate the stored device list; listeners only run on differences.
+    if serving_stored:
+        entry.async_create_background_task(
+            hass, coordinator.async_refresh(), f"{DOMAIN}_devices_refresh_{entry.entry_id}"
+        )
+
+    # 7) Continue history backfills interrupted by a restart or a failure.
+    entry.async_create_background_task(
+        hass, coordinator.async_resume_history_backfills(), f"{DOMAIN}_history_backfill_resume_{entry.entry_id}"
+    )
+
     return True
 
 
@@ -72,5 +101,10 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
 
     if unload_ok:
         (hass.data.get(DOMAIN) or {}).pop(entry.entry_id, None)
+        async_unload_services(hass)
 
     return unload_ok
+
+
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    await async_remove_entry_storage(hass, entry.entry_id)
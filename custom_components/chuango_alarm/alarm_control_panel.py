@@ -10,7 +10,7 @@ from homeassistant.components.alarm_control_panel import (
 
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant, callback
-from homeassistant.helpers import entity_platform
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
 # from homeassistant.helpers.device_registry import DeviceInfo
 from homeassistant.helpers.entity import DeviceInfo
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
@@ -25,27 +25,20 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry, async_add_e
     if coordinator.data is None:
         await coordinator.async_config_entry_first_refresh()
 
-    known: set[str] = set()
-    entities: list[AlarmControlPanelEntity] = []
+    def _device_entities(dev_id: str) -> list[AlarmControlPanelEntity]:
+        return [
+            DreamcatcherAlarmPanel(coordinator, entry, dev_id),
+        ]
 
-    for dev_id in coordinator.get_device_ids():
-        known.add(dev_id)
-        entities.append(DreamcatcherAlarmPanel(coordinator, entry, dev_id))
-
-    async_add_entities(entities)
-
-    platform = entity_platform.async_get_current_platform()
+    async_add_entities([e for dev_id in coordinator.get_device_ids() for e in _device_entities(dev_id)])
 
     @callback
-    def _on_update() -> None:
-        now_ids = set(coordinator.get_device_ids())
-        new = [DreamcatcherAlarmPanel(coordinator, entry, dev_id) for dev_id in now_ids if dev_id not in known]
-        for e in new:
-            known.add(e.device_id)
-        if new:
-            hass.async_create_task(platform.async_add_entities(new))
+    def _on_devices_added(device_ids: list[str]) -> None:
+        async_add_entities([e for dev_id in device_ids for e in _device_entities(dev_id)])
 
-    coordinator.async_add_listener(_on_update)
+    entry.async_on_unload(
+        async_dispatcher_connect(hass, coordinator.signal_devices_added, _on_devices_added)
+    )
 
 # https://developers.home-assistant.io/docs/core/entity/alarm-control-panel/
 class DreamcatcherAlarmPanel(CoordinatorEntity[DreamcatcherCoordinator], AlarmControlPanelEntity):
@@ -54,7 +47,7 @@ class DreamcatcherAlarmPanel(CoordinatorEntity[DreamcatcherCoordinator], AlarmCo
     _attr_code_format = None
 
     def __init__(self, coordinator: DreamcatcherCoordinator, entry: ConfigEntry, device_id: str) -> None:
-        super().__init__(coordinator)
+        super().__init__(coordinator, context=device_id)
         self._entry = entry
         self._attr_unique_id = f"{entry.entry_id}_{device_id}_alarm"
         self._attr_name = "Alarm"
@@ -160,6 +153,8 @@ class DreamcatcherAlarmPanel(CoordinatorEntity[DreamcatcherCoordinator], AlarmCo
             "alarm_evt_nick": st.get("alarm_evt_nick"),
             "alarm_evt_ts": st.get("alarm_evt_ts"),
             "alarm_evt_sn": st.get("alarm_evt_sn"),
+            # last known state from the runtime snapshot, not yet confirmed via MQTT
+            "restored": self.coordinator.is_state_restored(self.device_id),
         }
     
     async def async_alarm_arm_home(self, code: str | None = None) -> None:
@@ -3,8 +3,12 @@ from __future__ import annotations
 import asyncio
 import json
 import logging
+import time
+from collections.abc import Awaitable, Callable, Hashable
 from dataclasses import dataclass
-from typing import Any
+from types import SimpleNamespace
+from typing import Any, TypeVar
+from urllib.parse import urlsplit
 
 import aiohttp
 
@@ -20,11 +24,36 @@ from .const import (
     DEFAULT_USER_AGENT,
     FWINFO_PATH,
     LOGIN_PATH,
+    REST_CONNECTION_LIMIT,
+    REST_CONNECTION_LIMIT_PER_HOST,
+    REST_MIN_TIMEOUT_SECONDS,
+    REST_READ_CACHE_SECONDS,
+    REST_TIMEOUT_SECONDS,
     SHARED_DEVICES_PATH,
     ZONE_API_BASE,
     ZONE_PATH,
 )
 from .http_log import pretty_json, redact_headers, redact_mapping, truncate
+from .metrics import EndpointStats
+from .resilience import (
+    DEFAULT_RETRY_POLICY,
+    RETRY_POLICIES,
+    CircuitBreaker,
+    LatencyWindow,
+    RetryBudget,
+    adaptive_timeout,
+)
+
+# Headers the DreamCatcher app sends with every request.
+_BASE_HEADERS: dict[str, str] = {
+    "Appversion": DEFAULT_APP_VER,
+    "Platform": DEFAULT_OS,
+    "Lang": DEFAULT_LANG,
+    "Brand": DEFAULT_BRAND_HEADER,
+    "User-Agent": DEFAULT_USER_AGENT,
+}
+
+_T = TypeVar("_T")
 
 
 class DreamcatcherError(Exception):
@@ -39,6 +68,14 @@ class DreamcatcherApiError(DreamcatcherError):
     pass
 
 
+class DreamcatcherTransientError(DreamcatcherApiError):
+    """Connection error, timeout, 5xx or 429: worth retrying later."""
+
+
+class DreamcatcherCircuitOpenError(DreamcatcherApiError):
+    """Endpoint failed repeatedly; calls are rejected without a request for now."""
+
+
 @dataclass
 class LoginResult:
     token: str
@@ -58,66 +95,331 @@ class ZoneResult:
 
 
 class DreamcatcherApiClient:
-    def __init__(self, session: aiohttp.ClientSession, logger: logging.Logger) -> None:
-        self._session = session
+    """DreamCatcher REST client.
+
+    All endpoints go through _request (headers, timeout, logging, status and
+    JSON handling, per-endpoint stats). Without a session the client builds
+    one with session_factory (HA's async_create_clientsession: keep-alive
+    connector with DNS cache, closed by HA), passing trace hooks that count
+    new vs. reused connections. Concurrent requests are capped in total and
+    per host, so bursts against the am/dm hosts reuse warm TLS connections.
+
+    Transient failures are retried per endpoint policy within a client-wide
+    retry budget, guarded by a per-endpoint circuit breaker (resilience.py).
+    Read endpoints are coalesced: identical concurrent calls share one request
+    and a result is reused for REST_READ_CACHE_SECONDS.
+    """
+
+    def __init__(
+        self,
+        session: aiohttp.ClientSession | None,
+        logger: logging.Logger,
+        *,
+        session_factory: Callable[..., aiohttp.ClientSession] | None = None,
+    ) -> None:
+        """Pass either a session or a session_factory that accepts ClientSession kwargs."""
         self._log = logger
-
-    async def get_zone(
-            self,
-            region: str,
-    ) -> ZoneResult:
-        url = f"{ZONE_API_BASE}{ZONE_PATH}"
-
-        params = {
-            "region": region
-        }
-
-        headers = {
-            "Appversion": DEFAULT_APP_VER,
-            "Platform": DEFAULT_OS,
-            "Lang": DEFAULT_LANG,
-            "Brand": DEFAULT_BRAND_HEADER,
-            "User-Agent": DEFAULT_USER_AGENT,
+        self._stats: dict[str, EndpointStats] = {}
+        self._breakers: dict[str, CircuitBreaker] = {}
+        self._recent_latency: dict[str, LatencyWindow] = {}
+        self._retry_budget = RetryBudget()
+        self._inflight: dict[tuple[Hashable, ...], asyncio.Task] = {}
+        self._read_cache: dict[tuple[Hashable, ...], tuple[float, Any]] = {}
+        self._request_slots = asyncio.Semaphore(REST_CONNECTION_LIMIT)
+        self._host_slots: dict[str, asyncio.Semaphore] = {}
+        self._session = session if session is not None else session_factory(trace_configs=[self._trace_config()])
+
+    # ---------- transport ----------
+
+    def _slots_for_host(self, url: str) -> asyncio.Semaphore:
+        host = urlsplit(url).netloc
+        slots = self._host_slots.get(host)
+        if slots is None:
+            slots = self._host_slots[host] = asyncio.Semaphore(REST_CONNECTION_LIMIT_PER_HOST)
+        return slots
+
+    def _endpoint_stats(self, endpoint: str) -> EndpointStats:
+        stats = self._stats.get(endpoint)
+        if stats is None:
+            stats = self._stats[endpoint] = EndpointStats()
+        return stats
+
+    def _breaker(self, endpoint: str) -> CircuitBreaker:
+        breaker = self._breakers.get(endpoint)
+        if breaker is None:
+            breaker = self._breakers[endpoint] = CircuitBreaker()
+        return breaker
+
+    def _latency_window(self, endpoint: str) -> LatencyWindow:
+        window = self._recent_latency.get(endpoint)
+        if window is None:
+            window = self._recent_latency[endpoint] = LatencyWindow()
+        return window
+
+    def _timeout(self, endpoint: str) -> float:
+        return adaptive_timeout(
+            self._latency_window(endpoint),
+            default=REST_TIMEOUT_SECONDS,
+            minimum=REST_MIN_TIMEOUT_SECONDS,
+        )
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "endpoints": {
+                endpoint: {**stats.as_dict(), "timeout_s": round(self._timeout(endpoint), 1)}
+                for endpoint, stats in self._stats.items()
+            },
+            "breakers": {endpoint: breaker.as_dict() for endpoint, breaker in self._breakers.items()},
+            "retry_budget": self._retry_budget.as_dict(),
         }
 
-        if self._log.isEnabledFor(logging.DEBUG):
-            self._log.debug(
-                "HTTP REQUEST %s %s\nparams=%s\nheaders=%s",
-                "GET",
-                url,
-                pretty_json(redact_mapping(params)),
-                pretty_json(redact_headers(headers)),
-            )
+    def _trace_config(self) -> aiohttp.TraceConfig:
+        """Connection-level hooks; the endpoint name travels in trace_request_ctx."""
+        trace = aiohttp.TraceConfig()
+
+        def _stats(ctx: SimpleNamespace) -> EndpointStats | None:
+            req_ctx = ctx.trace_request_ctx
+            endpoint = req_ctx.get("endpoint") if isinstance(req_ctx, dict) else None
+            return self._endpoint_stats(endpoint) if endpoint else None
+
+        async def _on_connection_create_start(_session: Any, ctx: SimpleNamespace, _params: Any) -> None:
+            ctx.connect_start = time.perf_counter()
+
+        async def _on_connection_create_end(_session: Any, ctx: SimpleNamespace, _params: Any) -> None:
+            stats = _stats(ctx)
+            if stats is not None:
+                stats.connections_new += 1
+                stats.connect_ms += (time.perf_counter() - ctx.connect_start) * 1000
+
+        async def _on_connection_reuseconn(_session: Any, ctx: SimpleNamespace, _params: Any) -> None:
+            stats = _stats(ctx)
+            if stats is not None:
+                stats.connections_reused += 1
+
+        async def _on_dns_cache_hit(_session: Any, ctx: SimpleNamespace, _params: Any) -> None:
+            stats = _stats(ctx)
+            if stats is not None:
+                stats.dns_cache_hits += 1
+
+        async def _on_dns_cache_miss(_session: Any, ctx: SimpleNamespace, _params: Any) -> None:
+            stats = _stats(ctx)
+            if stats is not None:
+                stats.dns_cache_misses += 1
+
+        trace.on_connection_create_start.append(_on_connection_create_start)
+        trace.on_connection_create_end.append(_on_connection_create_end)
+        trace.on_connection_reuseconn.append(_on_connection_reuseconn)
+        trace.on_dns_cache_hit.append(_on_dns_cache_hit)
+        trace.on_dns_cache_miss.append(_on_dns_cache_miss)
+        return trace
+
+    async def _request(
+        self,
+        endpoint: str,
+        label: str,
+        method: str,
+        url: str,
+        *,
+        params: dict[str, Any] | None = None,
+        json_body: dict[str, Any] | None = None,
+        check_auth: bool = True,
+    ) -> Any:
+        """Send a request (retrying transient failures) and return the decoded JSON body.
+
+        label prefixes error messages (e.g. "Alarm history"); 401/403 raise
+        DreamcatcherAuthError unless check_auth is False.
+        """
+        policy = RETRY_POLICIES.get(endpoint, DEFAULT_RETRY_POLICY)
+        breaker = self._breaker(endpoint)
+        self._retry_budget.record_request()
+        attempt = 0
+        while True:
+            if not breaker.allow():
+                raise DreamcatcherCircuitOpenError(
+                    f"{label} temporarily unavailable (retry in {breaker.retry_after():.0f}s)"
+                )
+            try:
+                data = await self._send(
+                    endpoint, label, method, url, params=params, json_body=json_body, check_auth=check_auth
+                )
+            except DreamcatcherTransientError as err:
+                breaker.record_failure()
+                if attempt >= policy.max_retries or not self._retry_budget.try_spend():
+                    raise
+                delay = policy.backoff(attempt)
+                attempt += 1
+                self._log.debug("%s failed (%s); retry %s in %.1fs", label, err, attempt, delay)
+                await asyncio.sleep(delay)
+                continue
+            except DreamcatcherError:
+                # the server answered (auth/4xx/bad body): not a sign of an outage
+                breaker.release()
+                raise
+            except BaseException:
+                breaker.release()
+                raise
+            breaker.record_success()
+            return data
+
+    async def _send(
+        self,
+        endpoint: str,
+        label: str,
+        method: str,
+        url: str,
+        *,
+        params: dict[str, Any] | None,
+        json_body: dict[str, Any] | None,
+        check_auth: bool,
+    ) -> Any:
+        """One attempt; connection errors, timeouts, 5xx and 429 raise DreamcatcherTransientError."""
+        headers = dict(_BASE_HEADERS)
+        if json_body is not None:
+            headers["Content-Type"] = "application/json"
+
+        debug = self._log.isEnabledFor(logging.DEBUG)
+        if debug:
+            if json_body is not None:
+                self._log.debug(
+                    "HTTP REQUEST %s %s\nparams=%s\nbody=%s\nheaders=%s",
+                    method,
+                    url,
+                    pretty_json(redact_mapping(params)),
+                    pretty_json(json_body),
+                    pretty_json(redact_headers(headers)),
+                )
+            else:
+                self._log.debug(
+                    "HTTP REQUEST %s %s\nparams=%s\nheaders=%s",
+                    method,
+                    url,
+                    pretty_json(redact_mapping(params)),
+                    pretty_json(redact_headers(headers)),
+                )
 
+        stats = self._endpoint_stats(endpoint)
+        stats.calls += 1
+        recent = self._latency_window(endpoint)
+        timeout = self._timeout(endpoint)
         try:
-            async with asyncio.timeout(20):
-                resp = await self._session.get(url, params=params, headers=headers)
-        except (aiohttp.ClientError, TimeoutError) as err:
-            raise DreamcatcherApiError(f"Zone connection error: {err}") from err
-
-        async with resp:
-            body_bytes = await resp.read()
-            body_text = body_bytes.decode("utf-8", errors="replace")
-
-            if self._log.isEnabledFor(logging.DEBUG):
+            try:
+                # waiting for a slot is not part of the request latency or timeout
+                async with self._request_slots, self._slots_for_host(url):
+                    start = time.perf_counter()
+                    async with asyncio.timeout(timeout):
+                        async with self._session.request(
+                            method,
+                            url,
+                            params=params,
+                            json=json_body,
+                            headers=headers,
+                            trace_request_ctx={"endpoint": endpoint},
+                        ) as resp:
+                            body = await resp.read()
+                            status = resp.status
+                            resp_url = str(resp.url)
+                            resp_headers = dict(resp.headers)
+            except (aiohttp.ClientError, TimeoutError) as err:
+                if isinstance(err, TimeoutError):
+                    # counts as a sample at the applied timeout, so a slower cloud raises p95
+                    stats.latency.record_timeout()
+                    recent.observe(timeout * 1000)
+                raise DreamcatcherTransientError(f"{label} connection error: {err!r}") from err
+
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            stats.latency.observe(elapsed_ms)
+            recent.observe(elapsed_ms)
+            stats.bytes_in += len(body)
+            stats.last_status = status
+
+            if debug:
                 self._log.debug(
                     "HTTP RESPONSE %s %s\nstatus=%s\nresp_headers=%s\nbody=%s",
-                    "GET",
-                    str(resp.url),
-                    resp.status,
-                    pretty_json(redact_headers(dict(resp.headers))),
-                    truncate(body_text),
+                    method,
+                    resp_url,
+                    status,
+                    pretty_json(redact_headers(resp_headers)),
+                    truncate(body.decode("utf-8", errors="replace")),
                 )
 
-            if resp.status != 200:
-                raise DreamcatcherApiError(f"Zone HTTP {resp.status}: {truncate(body_text, 300)}")
+            if check_auth and status in (401, 403):
+                raise DreamcatcherAuthError(
+                    f"{label} auth failed ({status}): {truncate(body.decode('utf-8', errors='replace'), 300)}"
+                )
+            if status != 200:
+                error_cls = DreamcatcherTransientError if status >= 500 or status == 429 else DreamcatcherApiError
+                raise error_cls(
+                    f"{label} HTTP {status}: {truncate(body.decode('utf-8', errors='replace'), 300)}"
+                )
 
             try:
-                data = json.loads(body_text)
-            except Exception as err:
+                # json.loads detects the encoding of bytes itself (no str copy of the body)
+                return json.loads(body)
+            except ValueError as err:
                 raise DreamcatcherApiError(
-                    f"Zone invalid JSON: {err} | body={truncate(body_text, 300)}"
+                    f"{label} invalid JSON: {err} | body={truncate(body.decode('utf-8', errors='replace'), 300)}"
                 ) from err
+        except DreamcatcherError:
+            stats.errors += 1
+            raise
+
+    async def _read(
+        self, endpoint: str, token: str, key: tuple[Hashable, ...], fetch: Callable[[], Awaitable[_T]]
+    ) -> _T:
+        """Run a read request once for all identical concurrent callers.
+
+        Reads are shared per token: a caller holding a renewed token must not be
+        handed the AuthError (or data) of a read made with an expired one.
+        Failures are not cached.
+        """
+        stats = self._endpoint_stats(endpoint)
+        cache_key = (endpoint, token, *key)
+        now = time.monotonic()
+
+        cached = self._read_cache.get(cache_key)
+        if cached is not None:
+            if cached[0] > now:
+                stats.cache_hits += 1
+                return cached[1]
+            del self._read_cache[cache_key]
+
+        task = self._inflight.get(cache_key)
+        if task is not None:
+            stats.coalesced += 1
+        else:
+            task = asyncio.get_running_loop().create_task(fetch())
+            self._inflight[cache_key] = task
+
+            def _done(done: asyncio.Task) -> None:
+                self._inflight.pop(cache_key, None)
+                if done.cancelled() or done.exception() is not None:
+                    return
+                done_at = time.monotonic()
+                for stale in [k for k, (exp, _) in self._read_cache.items() if exp <= done_at]:
+                    del self._read_cache[stale]
+                self._read_cache[cache_key] = (done_at + REST_READ_CACHE_SECONDS, done.result())
+
+            task.add_done_callback(_done)
+
+        # shielded: one caller giving up must not cancel the request for the others
+        return await asyncio.shield(task)
+
+    # ---------- endpoints ----------
+
+    async def get_zone(
+            self,
+            region: str,
+    ) -> ZoneResult:
+        data = await self._request(
+            "zone",
+            "Zone",
+            "GET",
+            f"{ZONE_API_BASE}{ZONE_PATH}",
+            params={"region": region},
+            check_auth=False,
+        )
+        if not isinstance(data, dict):
+            raise DreamcatcherApiError(f"Unexpected zone response shape: {truncate(pretty_json(data), 800)}")
 
         am = data.get("am") or {}
         mqtt = data.get("mqtt") or {}
@@ -145,8 +447,6 @@ class DreamcatcherApiClient:
         password_md5: str,
         uuid: str,
     ) -> LoginResult:
-        url = f"https://{am_domain}:{am_port}{LOGIN_PATH}"
-
         params = {
             "countryCode": country_code,
             "name": email,
@@ -159,54 +459,11 @@ class DreamcatcherApiClient:
             "phoneBrand": DEFAULT_PHONE_BRAND,
             "lang": DEFAULT_LANG,
         }
-
-        headers = {
-            "Appversion": DEFAULT_APP_VER,
-            "Platform": DEFAULT_OS,
-            "Lang": DEFAULT_LANG,
-            "Brand": DEFAULT_BRAND_HEADER,
-            "User-Agent": DEFAULT_USER_AGENT,
-        }
-
-        if self._log.isEnabledFor(logging.DEBUG):
-            self._log.debug(
-                "HTTP REQUEST %s %s\nparams=%s\nheaders=%s",
-                "GET",
-                url,
-                pretty_json(redact_mapping(params)),
-                pretty_json(redact_headers(headers)),
-            )
-
-        try:
-            async with asyncio.timeout(20):
-                resp = await self._session.get(url, params=params, headers=headers)
-        except (aiohttp.ClientError, TimeoutError) as err:
-            raise DreamcatcherApiError(f"Connection error: {err}") from err
-
-        async with resp:
-            body_bytes = await resp.read()
-            body_text = body_bytes.decode("utf-8", errors="replace")
-
-            if self._log.isEnabledFor(logging.DEBUG):
-                self._log.debug(
-                    "HTTP RESPONSE %s %s\nstatus=%s\nresp_headers=%s\nbody=%s",
-                    "GET",
-                    str(resp.url),
-                    resp.status,
-                    pretty_json(redact_headers(dict(resp.headers))),
-                    truncate(body_text),
-                )
-
-            if resp.status in (401, 403):
-                raise DreamcatcherAuthError(f"Auth failed ({resp.status}): {truncate(body_text, 300)}")
-
-            if resp.status != 200:
-                raise DreamcatcherApiError(f"HTTP {resp.status}: {truncate(body_text, 300)}")
-
-            try:
-                data = json.loads(body_text)
-            except Exception as err:
-                raise DreamcatcherApiError(f"Invalid JSON: {err} | body={truncate(body_text, 300)}") from err
+        data = await self._request(
+            "login", "Login", "GET", f"https://{am_domain}:{am_port}{LOGIN_PATH}", params=params
+        )
+        if not isinstance(data, dict):
+            raise DreamcatcherApiError(f"Unexpected login response shape: {truncate(pretty_json(data), 500)}")
 
         token = data.get("token")
         expire_at = data.get("expireAt")
@@ -224,58 +481,18 @@ class DreamcatcherApiClient:
             am_port: int,
             token: str
     ) -> list[dict[str, Any]]:
-        url = f"https://{am_domain}:{am_port}{SHARED_DEVICES_PATH}"
-        params = {
-            "token": token
-        }
-
-        headers = {
-            "Appversion": DEFAULT_APP_VER,
-            "Platform": DEFAULT_OS,
-            "Lang": DEFAULT_LANG,
-            "Brand": DEFAULT_BRAND_HEADER,
-            "User-Agent": DEFAULT_USER_AGENT,
-        }
-
-        if self._log.isEnabledFor(logging.DEBUG):
-            self._log.debug(
-                "HTTP REQUEST %s %s\nparams=%s\nheaders=%s",
+        data = await self._read(
+            "shared_devices",
+            token,
+            (am_domain, am_port),
+            lambda: self._request(
+                "shared_devices",
+                "Shared devices",
                 "GET",
-                url,
-                pretty_json(redact_mapping(params)),
-                pretty_json(redact_headers(headers)),
-            )
-
-        try:
-            async with asyncio.timeout(20):
-                resp = await self._session.get(url, params=params, headers=headers)
-        except (aiohttp.ClientError, TimeoutError) as err:
-            raise DreamcatcherApiError(f"Connection error: {err}") from err
-
-        async with resp:
-            body_bytes = await resp.read()
-            body_text = body_bytes.decode("utf-8", errors="replace")
-
-            if self._log.isEnabledFor(logging.DEBUG):
-                self._log.debug(
-                    "HTTP RESPONSE %s %s\nstatus=%s\nresp_headers=%s\nbody=%s",
-                    "GET",
-                    str(resp.url),
-                    resp.status,
-                    pretty_json(redact_headers(dict(resp.headers))),
-                    truncate(body_text),
-                )
-
-            if resp.status in (401, 403):
-                raise DreamcatcherAuthError(f"Auth failed ({resp.status}): {truncate(body_text, 300)}")
-            
-            if resp.status != 200:
-                raise DreamcatcherApiError(f"HTTP {resp.status}: {truncate(body_text, 300)}")
-
-            try:
-                data = json.loads(body_text)
-            except Exception as err:
-                raise DreamcatcherApiError(f"Invalid JSON: {err} | body={truncate(body_text, 300)}") from err
+                f"https://{am_domain}:{am_port}{SHARED_DEVICES_PATH}",
+                params={"token": token},
+            ),
+        )
 
         # Some accounts (or server variants) return an empty object instead of {"list": []}.
         # Treat that as "no shared devices" so the config flow can show a helpful message.
@@ -367,70 +584,29 @@ class DreamcatcherApiClient:
         page_size: int = 50,
     ) -> dict[str, Any]:
         """Fetch alarm event history for a device via REST API (POST)."""
-        url = f"{base_url}{ALARM_HISTORY_PATH}"
-        params = {"token": token}
         body = {
             "devIdInt": dev_id_int,
             "offset": offset,
             "pageSize": page_size,
             "random": 0,
         }
-
-        headers = {
-            "Content-Type": "application/json",
-            "Appversion": DEFAULT_APP_VER,
-            "Platform": DEFAULT_OS,
-            "Lang": DEFAULT_LANG,
-            "Brand": DEFAULT_BRAND_HEADER,
-            "User-Agent": DEFAULT_USER_AGENT,
-        }
-
-        if self._log.isEnabledFor(logging.DEBUG):
-            self._log.debug(
-                "HTTP REQUEST %s %s\nparams=%s\nbody=%s\nheaders=%s",
+        data = await self._read(
+            "alarm_history",
+            token,
+            (base_url, dev_id_int, offset, page_size),
+            lambda: self._request(
+                "alarm_history",
+                "Alarm history",
                 "POST",
-                url,
-                pretty_json(redact_mapping(params)),
-                pretty_json(body),
-                pretty_json(redact_headers(headers)),
-            )
-
-        try:
-            async with asyncio.timeout(20):
-                resp = await self._session.post(url, params=params, json=body, headers=headers)
-        except (aiohttp.ClientError, TimeoutError) as err:
-            raise DreamcatcherApiError(f"Alarm history connection error: {err}") from err
-
-        async with resp:
-            body_bytes = await resp.read()
-            body_text = body_bytes.decode("utf-8", errors="replace")
-
-            if self._log.isEnabledFor(logging.DEBUG):
-                self._log.debug(
-                    "HTTP RESPONSE %s %s\nstatus=%s\nresp_headers=%s\nbody=%s",
-                    "POST",
-                    str(resp.url),
-                    resp.status,
-                    pretty_json(redact_headers(dict(resp.headers))),
-                    truncate(body_text),
-                )
-
-            if resp.status in (401, 403):
-                raise DreamcatcherAuthError(f"Auth failed ({resp.status}): {truncate(body_text, 300)}")
-
-            if resp.status != 200:
-                raise DreamcatcherApiError(f"HTTP {resp.status}: {truncate(body_text, 300)}")
-
-            try:
-                data = json.loads(body_text)
-            except Exception as err:
-                raise DreamcatcherApiError(
-                    f"Invalid JSON: {err} | body={truncate(body_text, 300)}"
-                ) from err
+                f"{base_url}{ALARM_HISTORY_PATH}",
+                params={"token": token},
+                json_body=body,
+            ),
+        )
 
         if not isinstance(data, dict):
             raise DreamcatcherApiError(
-                f"Unexpected alarm history response: {truncate(body_text, 300)}"
+                f"Unexpected alarm history response: {truncate(pretty_json(data), 300)}"
             )
 
         return data
@@ -452,7 +628,6 @@ class DreamcatcherApiClient:
 
         Returns the raw JSON dict with keys: code, fwCount, force, appForce, fwList.
         """
-        url = f"{base_url}{FWINFO_PATH}"
         params: dict[str, str] = {
             "token": token,
             "deviceID": str(device_id_int),
@@ -461,60 +636,18 @@ class DreamcatcherApiClient:
             "g_v": gsm_version or "",
             "g_m": gsm_model or "",
         }
-
-        headers = {
-            "Appversion": DEFAULT_APP_VER,
-            "Platform": DEFAULT_OS,
-            "Lang": DEFAULT_LANG,
-            "Brand": DEFAULT_BRAND_HEADER,
-            "User-Agent": DEFAULT_USER_AGENT,
-        }
-
-        if self._log.isEnabledFor(logging.DEBUG):
-            self._log.debug(
-                "HTTP REQUEST %s %s\nparams=%s\nheaders=%s",
-                "GET",
-                url,
-                pretty_json(redact_mapping(params)),
-                pretty_json(redact_headers(headers)),
-            )
-
-        try:
-            async with asyncio.timeout(20):
-                resp = await self._session.get(url, params=params, headers=headers)
-        except (aiohttp.ClientError, TimeoutError) as err:
-            raise DreamcatcherApiError(f"Firmware info connection error: {err}") from err
-
-        async with resp:
-            body_bytes = await resp.read()
-            body_text = body_bytes.decode("utf-8", errors="replace")
-
-            if self._log.isEnabledFor(logging.DEBUG):
-                self._log.debug(
-                    "HTTP RESPONSE %s %s\nstatus=%s\nresp_headers=%s\nbody=%s",
-                    "GET",
-                    str(resp.url),
-                    resp.status,
-                    pretty_json(redact_headers(dict(resp.headers))),
-                    truncate(body_text),
-                )
-
-            if resp.status in (401, 403):
-                raise DreamcatcherAuthError(f"Auth failed ({resp.status}): {truncate(body_text, 300)}")
-
-            if resp.status != 200:
-                raise DreamcatcherApiError(f"HTTP {resp.status}: {truncate(body_text, 300)}")
-
-            try:
-                data = json.loads(body_text)
-            except Exception as err:
-                raise DreamcatcherApiError(
-                    f"Invalid JSON: {err} | body={truncate(body_text, 300)}"
-                ) from err
+        data = await self._read(
+            "firmware_info",
+            token,
+            (base_url, device_id_int, wifi_version, mcu_version, gsm_version, gsm_model),
+            lambda: self._request(
+                "firmware_info", "Firmware info", "GET", f"{base_url}{FWINFO_PATH}", params=params
+            ),
+        )
 
         if not isinstance(data, dict):
             raise DreamcatcherApiError(
-                f"Unexpected fwinfo response: {truncate(body_text, 300)}"
+                f"Unexpected fwinfo response: {truncate(pretty_json(data), 300)}"
             )
 
         return data
@@ -0,0 +1,220 @@
+"""Full alarm history backfill over the offset-paged REST endpoint.
+
+The endpoint pages newest first (offset 0 = newest event), so offsets shift
+whenever a new event arrives. Pages are therefore addressed by chunk index
+counted from the oldest event: chunk c covers positions [c * size, (c + 1) * size)
+and is requested at offset total - (c + 1) * size, with total taken from the
+latest response. Completed chunks are persisted, so an interrupted backfill
+resumes with the missing ones and a later run only reads the chunks added
+since; overlapping re-reads are deduplicated by the event log.
+"""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+import logging
+import math
+import time
+from typing import Any
+
+from .event_log import AlarmEventLog
+
+# fetch(offset, page_size) -> alarm_history response ({"items": [...], "total": n})
+PageFetcher = Callable[[int, int], Awaitable[dict[str, Any]]]
+
+# Extra items read on both sides of a chunk: events arriving between reading
+# total and the request shift the window towards older items.
+_CHUNK_OVERLAP = 5
+
+
+def _to_ranges(values: set[int]) -> list[list[int]]:
+    ranges: list[list[int]] = []
+    for value in sorted(values):
+        if ranges and value == ranges[-1][1] + 1:
+            ranges[-1][1] = value
+        else:
+            ranges.append([value, value])
+    return ranges
+
+
+def _from_ranges(ranges: Any) -> set[int]:
+    values: set[int] = set()
+    for item in ranges if isinstance(ranges, list) else []:
+        try:
+            lo, hi = int(item[0]), int(item[1])
+        except (TypeError, ValueError, IndexError):
+            continue
+        values.update(range(lo, hi + 1))
+    return values
+
+
+@dataclass(slots=True)
+class BackfillProgress:
+    """Persisted state of one device's backfill."""
+
+    page_size: int
+    total: int = 0
+    done: set[int] = field(default_factory=set)
+    finished: bool = False
+    fetched: int = 0
+    added: int = 0
+    error: str | None = None
+
+    def as_json(self) -> dict[str, Any]:
+        return {
+            "page_size": self.page_size,
+            "total": self.total,
+            "done": _to_ranges(self.done),
+            "finished": self.finished,
+            "fetched": self.fetched,
+            "added": self.added,
+            "error": self.error,
+        }
+
+    @classmethod
+    def from_json(cls, data: dict[str, Any]) -> BackfillProgress:
+        return cls(
+            page_size=int(data.get("page_size") or 50),
+            total=int(data.get("total") or 0),
+            done=_from_ranges(data.get("done")),
+            finished=bool(data.get("finished")),
+            fetched=int(data.get("fetched") or 0),
+            added=int(data.get("added") or 0),
+            error=data.get("error"),
+        )
+
+    @property
+    def chunks(self) -> int:
+        return math.ceil(self.total / self.page_size)
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "total": self.total,
+            "chunks": self.chunks,
+            "chunks_done": len(self.done),
+            "finished": self.finished,
+            "fetched": self.fetched,
+            "added": self.added,
+            "error": self.error,
+        }
+
+
+class RateLimiter:
+    """Token bucket for history page requests.
+
+    The coordinator creates one per config entry; it is shared by the backfills
+    of all its devices and by cloud history exports.
+    """
+
+    def __init__(self, rate: float, burst: int = 1) -> None:
+        self._rate = rate
+        self._burst = burst
+        self._tokens = float(burst)
+        self._last = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self._burst, self._tokens + (now - self._last) * self._rate)
+                self._last = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self._rate)
+
+
+class HistoryBackfill:
+    """Walks all history chunks of a device with bounded concurrency."""
+
+    def __init__(
+        self,
+        *,
+        device_id: str,
+        fetch: PageFetcher,
+        event_log: AlarmEventLog,
+        progress: BackfillProgress,
+        on_progress: Callable[[], None],
+        concurrency: int,
+        limiter: RateLimiter,
+        logger: logging.Logger,
+    ) -> None:
+        self.device_id = device_id
+        self.progress = progress
+        self._fetch = fetch
+        self._event_log = event_log
+        self._on_progress = on_progress
+        self._concurrency = concurrency
+        self._limiter = limiter
+        self._log = logger
+        self._total = 0
+
+    async def _get(self, offset: int, size: int) -> list[dict[str, Any]]:
+        await self._limiter.acquire()
+        result = await self._fetch(offset, size)
+        try:
+            self._total = max(self._total, int(result.get("total") or 0))
+        except (TypeError, ValueError):
+            pass
+        items = [item for item in (result.get("items") or []) if isinstance(item, dict)]
+        self.progress.fetched += len(items)
+        self.progress.added += await self._event_log.async_append(self.device_id, items)
+        return items
+
+    async def run(self) -> BackfillProgress:
+        progress = self.progress
+        size = progress.page_size
+        progress.error = None
+        progress.finished = False
+
+        # Newest page first: gives the current total (and is the most useful page).
+        await self._get(0, size)
+        if self._total > progress.total and progress.total % size:
+            # the newest chunk of the previous run was only partially filled
+            progress.done.discard(progress.total // size)
+        progress.total = max(progress.total, self._total)
+        self._on_progress()
+
+        queue: asyncio.Queue[int] = asyncio.Queue()
+        # newest chunks first, so a partial backfill covers the recent past
+        for chunk in reversed(range(progress.chunks)):
+            if chunk not in progress.done:
+                queue.put_nowait(chunk)
+
+        async def _worker() -> None:
+            while True:
+                try:
+                    chunk = queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+                # chunk positions counted from the oldest event; clip the newest chunk at offset 0
+                offset = self._total - (chunk + 1) * size - _CHUNK_OVERLAP
+                count = size + 2 * _CHUNK_OVERLAP + min(0, offset)
+                await self._get(max(0, offset), count)
+                progress.done.add(chunk)
+                self._on_progress()
+
+        workers = [asyncio.create_task(_worker()) for _ in range(max(1, self._concurrency))]
+        try:
+            await asyncio.gather(*workers)
+        except BaseException as err:
+            for worker in workers:
+                worker.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+            if not isinstance(err, asyncio.CancelledError):
+                progress.error = str(err)
+                self._on_progress()
+            raise
+
+        progress.finished = True
+        self._on_progress()
+        self._log.debug(
+            "History backfill for %s finished: %d chunks, %d fetched, %d added",
+            self.device_id,
+            progress.chunks,
+            progress.fetched,
+            progress.added,
+        )
+        return progress
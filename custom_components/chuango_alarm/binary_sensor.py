@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+from collections.abc import Iterable
 from typing import Any
 
 from homeassistant.components.binary_sensor import (
@@ -9,63 +10,23 @@ from homeassistant.components.binary_sensor import (
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers import device_registry as dr
-from homeassistant.helpers import entity_platform
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entity import DeviceInfo, EntityCategory
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from .const import DOMAIN
 from .coordinator import DreamcatcherCoordinator
+from .parts import (
+    MTYPE_KEYFOB,
+    MTYPE_SENSOR,
+    ZONE_INTERIOR,
+    ZONE_PERIMETER,
+    PartRecord,
+    PartsChange,
+    part_t_label,
+)
 from .utils import part_md_label, part_zone_change_allowed, resolve_device_model
 
-# c-bitfield decoding (APK: partDataBean.PartsBean.setC)
-# - mtype   = c & 0x0F
-# - mstatus = c >> 7 (bit 7)
-MTYPE_SENSOR = 1
-MTYPE_KEYFOB = 2
-
-# Observed part `t` values in OV-300 payloads
-PART_T_LABELS: dict[int, str] = {
-    44: "Remote / Keyfob",
-    45: "Sensor (generic)",
-}
-
-# Zone mapping: z=1 -> perimeter (instant), z=2 -> interior (delay/PIR)
-ZONE_PERIMETER = 1
-ZONE_INTERIOR = 2
-
-
-def _infer_device_class(part: dict[str, Any]) -> BinarySensorDeviceClass:
-    """Infer device class from decoded part type + name/zone."""
-    name = (part.get("n") or "").lower()
-    zone = part.get("z")
-    mtype, _mstatus, _enabled = _decode_part_c(part)
-
-    # Key fob / remote
-    if mtype == MTYPE_KEYFOB:
-        return BinarySensorDeviceClass.PRESENCE
-
-    # PIR / motion sensors
-    if "pir" in name or zone == ZONE_INTERIOR:
-        return BinarySensorDeviceClass.MOTION
-
-    # Door sensors
-    if "tuer" in name or "tür" in name or "door" in name or "haustuer" in name or "haustür" in name:
-        return BinarySensorDeviceClass.DOOR
-
-    # Window sensors
-    if "fenster" in name or "window" in name:
-        return BinarySensorDeviceClass.WINDOW
-
-    # Terrace door (treat as door)
-    if "terasse" in name or "terrasse" in name or "terrace" in name:
-        return BinarySensorDeviceClass.DOOR
-
-    # Default for perimeter zone: opening
-    if zone == ZONE_PERIMETER:
-        return BinarySensorDeviceClass.OPENING
-
-    return BinarySensorDeviceClass.OPENING
-
 
 def _zone_label(zone: int | None) -> str:
     if zone == ZONE_PERIMETER:
@@ -75,45 +36,22 @@ def _zone_label(zone: int | None) -> str:
     return f"Zone {zone}" if zone is not None else "Unknown"
 
 
-def _model_from_part(part: dict[str, Any]) -> str:
-    """Derive a model string from decoded c-bitfield type and raw type t."""
-    c = part.get("c")
-    t = part.get("t")
-    mtype, _mstatus, _enabled = _decode_part_c(part)
-    if mtype == MTYPE_SENSOR:
-        return "Sensor"
-    if mtype == MTYPE_KEYFOB:
-        return "Key Fob"
-    t_label = _part_t_label(part.get("t"))
-    if t_label:
-        return t_label
-    return f"Accessory (c={c}, t={t})"
-
-
-def _decode_part_c(part: dict[str, Any]) -> tuple[int | None, int | None, bool | None]:
-    """Decode c bitfield into (mtype, mstatus, enabled).
-
-    mtype: lower 4 bits
-    mstatus: bit 7 (0/1)
-    enabled: derived from mstatus (1 => enabled)
-    """
-    c_raw = part.get("c")
-    try:
-        c_int = int(c_raw)
-    except (TypeError, ValueError):
-        return None, None, None
-
-    mtype = c_int & 0x0F
-    mstatus = (c_int >> 7) & 0x01
-    enabled = mstatus == 1
-    return mtype, mstatus, enabled
-
-
-def _part_t_label(value: Any) -> str | None:
-    try:
-        return PART_T_LABELS.get(int(value))
-    except (TypeError, ValueError):
-        return None
+def _part_attributes(part: PartRecord) -> dict[str, Any]:
+    return {
+        "part_id": part.id,
+        "sensor_index": part.si,
+        "category": part.c,
+        "mtype": part.mtype,
+        "mstatus": part.mstatus,
+        "enabled": part.enabled,
+        "type": part.t,
+        "type_label": part_t_label(part.t),
+        "zone": part.zone,
+        "zone_label": _zone_label(part.zone),
+        "mode": part.md,
+        "mode_label": part_md_label(part.md),
+        "zone_change_allowed": part_zone_change_allowed(part.md, part.zone),
+    }
 
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry, async_add_entities) -> None:
@@ -122,75 +60,39 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry, async_add_e
     if coordinator.data is None:
         await coordinator.async_config_entry_first_refresh()
 
-    known: set[str] = set()  # unique_id set
-
-    # Per-device power status sensors (created once)
-    power_entities: list[BinarySensorEntity] = []
-    for dev_id in coordinator.get_device_ids():
-        uid = f"{entry.entry_id}_{dev_id}_ac_power"
-        if uid not in known:
-            known.add(uid)
-            power_entities.append(ChuangoAcPowerSensor(coordinator, entry, dev_id))
-    if power_entities:
-        async_add_entities(power_entities)
-
-    def _build_entities() -> list[BinarySensorEntity]:
-        """Build entities for all known parts across all devices."""
+    def _part_entities(dev_id: str, parts: Iterable[PartRecord]) -> list[BinarySensorEntity]:
         entities: list[BinarySensorEntity] = []
-        mqtt_state = (coordinator.data or {}).get("mqtt_state") or {}
-        if not isinstance(mqtt_state, dict):
-            return entities
-
-        for dev_id in coordinator.get_device_ids():
-            dev_state = mqtt_state.get(dev_id) or {}
-            parts = dev_state.get("parts") or []
-            if not isinstance(parts, list):
-                continue
-
-            for part in parts:
-                if not isinstance(part, dict):
-                    continue
-                part_id = part.get("id")
-                if part_id is None:
-                    continue
-
-                uid = f"{entry.entry_id}_{dev_id}_part_{part_id}"
-                if uid in known:
-                    continue
-                known.add(uid)
-
-                mtype, _mstatus, _enabled = _decode_part_c(part)
-                if mtype == MTYPE_SENSOR:
-                    entities.append(
-                        ChuangoAccessorySensor(coordinator, entry, dev_id, part)
-                    )
-                elif mtype == MTYPE_KEYFOB:
-                    entities.append(
-                        ChuangoKeyfobSensor(coordinator, entry, dev_id, part)
-                    )
+        for part in parts:
+            if part.mtype == MTYPE_SENSOR:
+                entities.append(ChuangoAccessorySensor(coordinator, entry, dev_id, part))
+            elif part.mtype == MTYPE_KEYFOB:
+                entities.append(ChuangoKeyfobSensor(coordinator, entry, dev_id, part))
         return entities
 
-    # Initial entities from already-loaded parts (if any)
-    initial = _build_entities()
-    if initial:
-        async_add_entities(initial)
+    # Per-device power status sensors + accessories already known (if any)
+    entities: list[BinarySensorEntity] = []
+    for dev_id in coordinator.get_device_ids():
+        entities.append(ChuangoAcPowerSensor(coordinator, entry, dev_id))
+        entities.extend(_part_entities(dev_id, coordinator.get_parts(dev_id)))
+    if entities:
+        async_add_entities(entities)
 
-    platform = entity_platform.async_get_current_platform()
+    @callback
+    def _on_devices_added(device_ids: list[str]) -> None:
+        async_add_entities([ChuangoAcPowerSensor(coordinator, entry, dev_id) for dev_id in device_ids])
 
     @callback
-    def _on_update() -> None:
-        new_parts = _build_entities()
-        new_power: list[BinarySensorEntity] = []
-        for dev_id in coordinator.get_device_ids():
-            uid = f"{entry.entry_id}_{dev_id}_ac_power"
-            if uid not in known:
-                known.add(uid)
-                new_power.append(ChuangoAcPowerSensor(coordinator, entry, dev_id))
-        combined = new_parts + new_power
-        if combined:
-            hass.async_create_task(platform.async_add_entities(combined))
+    def _on_parts_changed(change: PartsChange) -> None:
+        new = _part_entities(change.device_id, change.added)
+        if new:
+            async_add_entities(new)
 
-    coordinator.async_add_listener(_on_update)
+    entry.async_on_unload(
+        async_dispatcher_connect(hass, coordinator.signal_devices_added, _on_devices_added)
+    )
+    entry.async_on_unload(
+        async_dispatcher_connect(hass, coordinator.signal_parts_changed, _on_parts_changed)
+    )
 
 
 class ChuangoAccessorySensor(CoordinatorEntity[DreamcatcherCoordinator], BinarySensorEntity):
@@ -207,40 +109,33 @@ class ChuangoAccessorySensor(CoordinatorEntity[DreamcatcherCoordinator], BinaryS
         coordinator: DreamcatcherCoordinator,
         entry: ConfigEntry,
         device_id: str,
-        part: dict[str, Any],
+        part: PartRecord,
     ) -> None:
-        super().__init__(coordinator)
+        super().__init__(coordinator, context=device_id)
         self._entry = entry
         self._device_id = device_id
-        self._part_id = part.get("id")
-        self._part = dict(part)
+        self._part_id = part.id
+        self._part = part
 
         self._attr_unique_id = f"{entry.entry_id}_{device_id}_part_{self._part_id}"
-        self._attr_device_class = _infer_device_class(part)
+        self._attr_device_class = part.device_class
 
     @property
-    def _live_part(self) -> dict[str, Any]:
-        parts = self._st.get("parts") or []
-        if isinstance(parts, list):
-            for part in parts:
-                if not isinstance(part, dict):
-                    continue
-                if part.get("id") == self._part_id:
-                    return part
-        return self._part
+    def _live_part(self) -> PartRecord:
+        return self.coordinator.get_part(self._device_id, self._part_id) or self._part
 
     @property
     def name(self) -> str | None:
         part = self._live_part
-        return part.get("n") or f"Sensor {self._part_id}"
+        return part.name or f"Sensor {self._part_id}"
 
     @callback
     def _handle_coordinator_update(self) -> None:
         part = self._live_part
-        self._part = dict(part)
-        self._attr_device_class = _infer_device_class(part)
+        self._part = part
+        self._attr_device_class = part.device_class
 
-        new_name = part.get("n") or f"Sensor {self._part_id}"
+        new_name = part.name or f"Sensor {self._part_id}"
         device_registry = dr.async_get(self.hass)
         device = device_registry.async_get_device(
             identifiers={(DOMAIN, f"{self._device_id}_part_{self._part_id}")}
@@ -257,9 +152,9 @@ class ChuangoAccessorySensor(CoordinatorEntity[DreamcatcherCoordinator], BinaryS
 
         return DeviceInfo(
             identifiers={(DOMAIN, f"{self._device_id}_part_{self._part_id}")},
-            name=part.get("n") or f"Sensor {self._part_id}",
+            name=part.name or f"Sensor {self._part_id}",
             manufacturer="Chuango",
-            model=_model_from_part(part),
+            model=part.model,
             via_device=(DOMAIN, self._device_id),
         )
 
@@ -283,33 +178,9 @@ class ChuangoAccessorySensor(CoordinatorEntity[DreamcatcherCoordinator], BinaryS
 
     @property
     def extra_state_attributes(self) -> dict[str, Any]:
-        part = self._live_part
-        mtype, mstatus, enabled = _decode_part_c(part)
-        t_raw = part.get("t")
-        md_raw = part.get("md")
-        z_raw = part.get("z")
-        try:
-            md = int(md_raw) if md_raw is not None else None
-        except (TypeError, ValueError):
-            md = None
-        try:
-            zone = int(z_raw) if z_raw is not None else None
-        except (TypeError, ValueError):
-            zone = None
         return {
-            "part_id": part.get("id"),
-            "sensor_index": part.get("si"),
-            "category": part.get("c"),
-            "mtype": mtype,
-            "mstatus": mstatus,
-            "enabled": enabled,
-            "type": t_raw,
-            "type_label": _part_t_label(t_raw),
-            "zone": z_raw,
-            "zone_label": _zone_label(zone),
-            "mode": md_raw,
-            "mode_label": part_md_label(md),
-            "zone_change_allowed": part_zone_change_allowed(md, zone),
+            **_part_attributes(self._live_part),
+            "restored": self.coordinator.is_parts_restored(self._device_id),
         }
 
 
@@ -327,38 +198,31 @@ class ChuangoKeyfobSensor(CoordinatorEntity[DreamcatcherCoordinator], BinarySens
         coordinator: DreamcatcherCoordinator,
         entry: ConfigEntry,
         device_id: str,
-        part: dict[str, Any],
+        part: PartRecord,
     ) -> None:
-        super().__init__(coordinator)
+        super().__init__(coordinator, context=device_id)
         self._entry = entry
         self._device_id = device_id
-        self._part_id = part.get("id")
-        self._part = dict(part)
+        self._part_id = part.id
+        self._part = part
 
         self._attr_unique_id = f"{entry.entry_id}_{device_id}_part_{self._part_id}"
 
     @property
-    def _live_part(self) -> dict[str, Any]:
-        parts = self._st.get("parts") or []
-        if isinstance(parts, list):
-            for part in parts:
-                if not isinstance(part, dict):
-                    continue
-                if part.get("id") == self._part_id:
-                    return part
-        return self._part
+    def _live_part(self) -> PartRecord:
+        return self.coordinator.get_part(self._device_id, self._part_id) or self._part
 
     @property
     def name(self) -> str | None:
         part = self._live_part
-        return part.get("n") or f"Key Fob {self._part_id}"
+        return part.name or f"Key Fob {self._part_id}"
 
     @callback
     def _handle_coordinator_update(self) -> None:
         part = self._live_part
-        self._part = dict(part)
+        self._part = part
 
-        new_name = part.get("n") or f"Key Fob {self._part_id}"
+        new_name = part.name or f"Key Fob {self._part_id}"
         device_registry = dr.async_get(self.hass)
         device = device_registry.async_get_device(
             identifiers={(DOMAIN, f"{self._device_id}_part_{self._part_id}")}
@@ -374,9 +238,9 @@ class ChuangoKeyfobSensor(CoordinatorEntity[DreamcatcherCoordinator], BinarySens
         part = self._live_part
         return DeviceInfo(
             identifiers={(DOMAIN, f"{self._device_id}_part_{self._part_id}")},
-            name=part.get("n") or f"Key Fob {self._part_id}",
+            name=part.name or f"Key Fob {self._part_id}",
             manufacturer="Chuango",
-            model=_model_from_part(part),
+            model=part.model,
             via_device=(DOMAIN, self._device_id),
         )
 
@@ -396,44 +260,18 @@ class ChuangoKeyfobSensor(CoordinatorEntity[DreamcatcherCoordinator], BinarySens
     @property
     def is_on(self) -> bool | None:
         """Key fob presence: ss=0 means active/present."""
-        ss = self._live_part.get("ss")
+        ss = self._live_part.ss
         if ss is None:
             return None
-        try:
-            return int(ss) == 0
-        except (ValueError, TypeError):
-            return None
+        return ss == 0
 
     @property
     def extra_state_attributes(self) -> dict[str, Any]:
         part = self._live_part
-        mtype, mstatus, enabled = _decode_part_c(part)
-        t_raw = part.get("t")
-        md_raw = part.get("md")
-        z_raw = part.get("z")
-        try:
-            md = int(md_raw) if md_raw is not None else None
-        except (TypeError, ValueError):
-            md = None
-        try:
-            zone = int(z_raw) if z_raw is not None else None
-        except (TypeError, ValueError):
-            zone = None
         return {
-            "part_id": part.get("id"),
-            "sensor_index": part.get("si"),
-            "category": part.get("c"),
-            "mtype": mtype,
-            "mstatus": mstatus,
-            "enabled": enabled,
-            "type": t_raw,
-            "type_label": _part_t_label(t_raw),
-            "status": part.get("ss"),
-            "mode": md_raw,
-            "mode_label": part_md_label(md),
-            "zone": z_raw,
-            "zone_label": _zone_label(zone),
-            "zone_change_allowed": part_zone_change_allowed(md, zone),
+            **_part_attributes(part),
+            "status": part.ss,
+            "restored": self.coordinator.is_parts_restored(self._device_id),
         }
 
 
@@ -449,7 +287,7 @@ class ChuangoAcPowerSensor(CoordinatorEntity[DreamcatcherCoordinator], BinarySen
     _attr_device_class = BinarySensorDeviceClass.PLUG
 
     def __init__(self, coordinator: DreamcatcherCoordinator, entry: ConfigEntry, device_id: str) -> None:
-        super().__init__(coordinator)
+        super().__init__(coordinator, context=device_id)
         self._entry = entry
         self._device_id = device_id
         self._attr_unique_id = f"{entry.entry_id}_{device_id}_ac_power"
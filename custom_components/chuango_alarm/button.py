@@ -5,7 +5,7 @@ from typing import Any
 from homeassistant.components.button import ButtonEntity
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant, callback
-from homeassistant.helpers import entity_platform
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entity import DeviceInfo
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
@@ -20,36 +20,21 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry, async_add_e
     if coordinator.data is None:
         await coordinator.async_config_entry_first_refresh()
 
-    known: set[str] = set()
-    entities: list[ButtonEntity] = []
+    def _device_entities(dev_id: str) -> list[ButtonEntity]:
+        return [
+            RefreshAccessoriesButton(coordinator, entry, dev_id),
+            SosAlarmButton(coordinator, entry, dev_id),
+        ]
 
-    for dev_id in coordinator.get_device_ids():
-        known.add(f"{dev_id}_refresh")
-        known.add(f"{dev_id}_sos")
-        entities.append(RefreshAccessoriesButton(coordinator, entry, dev_id))
-        entities.append(SosAlarmButton(coordinator, entry, dev_id))
-
-    async_add_entities(entities)
-
-    platform = entity_platform.async_get_current_platform()
+    async_add_entities([e for dev_id in coordinator.get_device_ids() for e in _device_entities(dev_id)])
 
     @callback
-    def _on_update() -> None:
-        now_ids = set(coordinator.get_device_ids())
-        new: list[ButtonEntity] = []
-        for dev_id in now_ids:
-            refresh_key = f"{dev_id}_refresh"
-            sos_key = f"{dev_id}_sos"
-            if refresh_key not in known:
-                known.add(refresh_key)
-                new.append(RefreshAccessoriesButton(coordinator, entry, dev_id))
-            if sos_key not in known:
-                known.add(sos_key)
-                new.append(SosAlarmButton(coordinator, entry, dev_id))
-        if new:
-            hass.async_create_task(platform.async_add_entities(new))
-
-    coordinator.async_add_listener(_on_update)
+    def _on_devices_added(device_ids: list[str]) -> None:
+        async_add_entities([e for dev_id in device_ids for e in _device_entities(dev_id)])
+
+    entry.async_on_unload(
+        async_dispatcher_connect(hass, coordinator.signal_devices_added, _on_devices_added)
+    )
 
 
 class RefreshAccessoriesButton(CoordinatorEntity[DreamcatcherCoordinator], ButtonEntity):
@@ -60,7 +45,7 @@ class RefreshAccessoriesButton(CoordinatorEntity[DreamcatcherCoordinator], Butto
     _attr_icon = "mdi:refresh"
 
     def __init__(self, coordinator: DreamcatcherCoordinator, entry: ConfigEntry, device_id: str) -> None:
-        super().__init__(coordinator)
+        super().__init__(coordinator, context=device_id)
         self._entry = entry
         self.device_id = device_id
         self._attr_unique_id = f"{entry.entry_id}_{device_id}_refresh_parts"
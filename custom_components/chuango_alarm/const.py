@@ -49,4 +49,83 @@ DEFAULT_USER_AGENT = (
 # Debounce window for parts_list refresh after modify_parts ACK.
 PARTS_SYNC_COOLDOWN_SECONDS = 4.0
 
+# parts_list pagination: per-page response timeout and re-requests before giving up.
+PARTS_PAGE_TIMEOUT_SECONDS = 10.0
+PARTS_PAGE_MAX_RETRIES = 3
+
+# Micro-batching window for MQTT push updates: state changes within this window
+# are coalesced into one notification per dirty device.
+PUSH_UPDATE_WINDOW_SECONDS = 0.2
+
+# Outbound MQTT: settings commands (host_conf / modify_parts) with the same key
+# are merged while they wait this long in the per-device queue.
+OUTBOUND_COALESCE_SECONDS = 0.3
+
+# Commands without a matching dout response within this time resolve as "timeout".
+COMMAND_ACK_TIMEOUT_SECONDS = 15.0
+
+# Max parts per modify_parts request; larger batches are split into several
+# messages (conservative, the app itself only edits one part at a time).
+MODIFY_PARTS_BATCH_SIZE = 10
+
+# chuango_alarm.set_mode_all: max hubs published to concurrently.
+SET_MODE_ALL_CONCURRENCY = 4
+
+# Command types (din request action) with round-trip latency tracking.
+COMMAND_LATENCY_ACTIONS: tuple[str, ...] = ("host_stat", "host_conf", "modify_parts")
+
+# Persisted last good shared_devices payload (HA Store, per config entry).
+DEVICES_STORAGE_VERSION = 1
+DEVICES_STORAGE_KEY = f"{DOMAIN}.devices"
+
+# Failed device list refreshes are retried after this long instead of the
+# regular 6h interval (entities keep running from the last good/stored list).
+REFRESH_RETRY_SECONDS = 300
+
+# Persisted snapshot of per-device runtime state (MQTT state + parts), written
+# at most once per RUNTIME_SNAPSHOT_SAVE_DELAY seconds and on HA stop.
+RUNTIME_SNAPSHOT_STORAGE_VERSION = 1
+RUNTIME_SNAPSHOT_STORAGE_KEY = f"{DOMAIN}.runtime"
+RUNTIME_SNAPSHOT_SAVE_DELAY = 60
+
+# Firmware checks (fwinfo REST): run in the background with at most this many
+# requests in flight; results are cached per (devIdInt, installed version).
+FIRMWARE_CHECK_CONCURRENCY = 2
+FIRMWARE_INFO_TTL_SECONDS = 12 * 60 * 60
+FIRMWARE_CACHE_STORAGE_VERSION = 1
+FIRMWARE_CACHE_STORAGE_KEY = f"{DOMAIN}.fwinfo"
+
+# A failed proactive token refresh (ahead of expireAt) is retried after this long.
+TOKEN_REFRESH_RETRY_SECONDS = 300
+
+# REST transport: concurrent requests in total / per host (the am/dm hosts see
+# bursts of history + fwinfo requests per hub) and per-request timeout.
+REST_CONNECTION_LIMIT = 20
+REST_CONNECTION_LIMIT_PER_HOST = 4
+REST_TIMEOUT_SECONDS = 20
+# Lower bound of the latency-derived (adaptive) request timeout.
+REST_MIN_TIMEOUT_SECONDS = 5
+# Identical read requests (shared_devices / alarm_history / fwinfo) made with the
+# same token share one in-flight request; its result also answers repeats for this long.
+REST_READ_CACHE_SECONDS = 5
+
+# Incremental alarm history sync: pages fetched per sync until known items
+# are reached (gap fills after a jump in the live sN sequence page until the
+# newest item known before the gap instead).
+HISTORY_SYNC_MAX_PAGES = 5
+
+# Full alarm history backfill into the local event log: parallel page
+# requests per device, overall request rate (per second, all devices of an
+# entry) and page size. Progress is persisted so a backfill resumes after restarts.
+HISTORY_BACKFILL_CONCURRENCY = 3
+HISTORY_BACKFILL_RATE = 2.0
+HISTORY_BACKFILL_PAGE_SIZE = 50
+HISTORY_BACKFILL_STORAGE_VERSION = 1
+HISTORY_BACKFILL_STORAGE_KEY = f"{DOMAIN}.backfill"
+
+# chuango_alarm.export_history: target directory (below the config dir) and the
+# bus event reporting the progress of a running export.
+HISTORY_EXPORT_DIR = "chuango_alarm_exports"
+EVENT_HISTORY_EXPORT = f"{DOMAIN}_history_export"
+
 PLATFORMS = [Platform.SENSOR, Platform.ALARM_CONTROL_PANEL, Platform.SELECT, Platform.SWITCH, Platform.NUMBER, Platform.BINARY_SENSOR, Platform.BUTTON, Platform.EVENT, Platform.UPDATE]
@@ -1,17 +1,20 @@
 from __future__ import annotations
 
 import asyncio
-import json
 import logging
 import secrets
 import time
+from collections.abc import AsyncIterator, Awaitable, Callable
 from datetime import timedelta
-from typing import Any
+from functools import partial
+from typing import Any, TypeVar
 
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant, callback
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
 from homeassistant.exceptions import ConfigEntryError, HomeAssistantError
 from homeassistant.helpers.dispatcher import async_dispatcher_send
+from homeassistant.helpers.event import async_call_later
+from homeassistant.helpers.storage import Store
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
 from homeassistant.util import dt as dt_util
 
@@ -29,15 +32,105 @@ from .const import (
     CONF_USER_INFO,
     DOMAIN,
     DOCS_URL,
+    COMMAND_ACK_TIMEOUT_SECONDS,
+    DEVICES_STORAGE_KEY,
+    DEVICES_STORAGE_VERSION,
+    FIRMWARE_CACHE_STORAGE_KEY,
+    FIRMWARE_CACHE_STORAGE_VERSION,
+    FIRMWARE_CHECK_CONCURRENCY,
+    FIRMWARE_INFO_TTL_SECONDS,
+    HISTORY_BACKFILL_CONCURRENCY,
+    HISTORY_BACKFILL_PAGE_SIZE,
+    HISTORY_BACKFILL_RATE,
+    HISTORY_BACKFILL_STORAGE_KEY,
+    HISTORY_BACKFILL_STORAGE_VERSION,
+    HISTORY_SYNC_MAX_PAGES,
+    MODIFY_PARTS_BATCH_SIZE,
+    OUTBOUND_COALESCE_SECONDS,
+    PARTS_PAGE_MAX_RETRIES,
+    PARTS_PAGE_TIMEOUT_SECONDS,
     PARTS_SYNC_COOLDOWN_SECONDS,
+    PUSH_UPDATE_WINDOW_SECONDS,
+    RUNTIME_SNAPSHOT_SAVE_DELAY,
+    RUNTIME_SNAPSHOT_STORAGE_KEY,
+    RUNTIME_SNAPSHOT_STORAGE_VERSION,
+    REFRESH_RETRY_SECONDS,
+    TOKEN_REFRESH_RETRY_SECONDS,
+)
+from .backfill import BackfillProgress, HistoryBackfill, PageFetcher, RateLimiter
+from .event_log import AlarmEventLog
+from .history_query import HistoryQuery, run_history_query
+from .metrics import LatencyHistogram
+from .outbound import CommandResult, Lane, OutboundScheduler, PendingAck
+from .parts import PartRecord, PartsChange
+from .router import DoutHandler, DoutRouter
+from .utils import (
+    TRIGGER_EVENT_CODES,
+    LazyPayloadPreview,
+    alarm_source_type_label,
+    derive_alarm_origin,
+    format_history_item,
+    history_item_key,
+    history_item_time,
+    history_items_match,
+    merge_alarm_history,
+    parse_json_payload,
 )
-from .utils import alarm_source_type_label, derive_alarm_origin
 
 _REFRESH_BEFORE_SECONDS = 12 * 60 * 60  # 12h
+_TOKEN_REFRESH_MIN_DELAY = 60
+_UPDATE_INTERVAL = timedelta(hours=6)
 _DIN_DUP_WINDOW_SECONDS = 0.5
 _DIN_ECHO_WINDOW_SECONDS = 2.0
 _EXT_MODIFY_GRACE_SECONDS = 2.0
-_MAX_IN_MEMORY_ALARM_HISTORY = 100
+_MAX_IN_MEMORY_ALARM_HISTORY = 100  # newest items for the entities; the full history is in the event log
+_FIRMWARE_CACHE_SAVE_DELAY = 10
+
+# dev_state keys refreshed by every message; changes to them alone do not notify entities
+# ("time" is the hub clock echoed in each host_stat).
+_BOOKKEEPING_STATE_KEYS = frozenset({"last_seen", "last_topic", "time"})
+
+# dev_state keys not written to the runtime snapshot: bookkeeping and liveness
+# (a restored "online" would claim a connection that does not exist yet).
+_SNAPSHOT_SKIP_KEYS = _BOOKKEEPING_STATE_KEYS | {"online", "online_msg"}
+
+_T = TypeVar("_T")
+
+
+def _visible_state_changed(old: dict[str, Any], new: dict[str, Any]) -> bool:
+    """Return True if new differs from old in any non-bookkeeping key."""
+    for key, value in new.items():
+        if key in _BOOKKEEPING_STATE_KEYS:
+            continue
+        if key not in old or old[key] != value:
+            return True
+    return any(key not in new for key in old if key not in _BOOKKEEPING_STATE_KEYS)
+
+
+def _devices_store(hass: HomeAssistant, entry_id: str) -> Store[dict[str, Any]]:
+    # contains MQTT tokens -> private (0600)
+    return Store(hass, DEVICES_STORAGE_VERSION, f"{DEVICES_STORAGE_KEY}.{entry_id}", private=True)
+
+
+def _snapshot_store(hass: HomeAssistant, entry_id: str) -> Store[dict[str, Any]]:
+    return Store(hass, RUNTIME_SNAPSHOT_STORAGE_VERSION, f"{RUNTIME_SNAPSHOT_STORAGE_KEY}.{entry_id}")
+
+
+def _firmware_cache_store(hass: HomeAssistant, entry_id: str) -> Store[dict[str, Any]]:
+    return Store(hass, FIRMWARE_CACHE_STORAGE_VERSION, f"{FIRMWARE_CACHE_STORAGE_KEY}.{entry_id}")
+
+
+def _backfill_store(hass: HomeAssistant, entry_id: str) -> Store[dict[str, Any]]:
+    return Store(hass, HISTORY_BACKFILL_STORAGE_VERSION, f"{HISTORY_BACKFILL_STORAGE_KEY}.{entry_id}")
+
+
+async def async_remove_entry_storage(hass: HomeAssistant, entry_id: str) -> None:
+    """Delete all persisted data (device list, runtime snapshot, fwinfo cache, history) of a removed config entry."""
+    await _devices_store(hass, entry_id).async_remove()
+    await _snapshot_store(hass, entry_id).async_remove()
+    await _firmware_cache_store(hass, entry_id).async_remove()
+    await _backfill_store(hass, entry_id).async_remove()
+    await AlarmEventLog(hass, entry_id).async_remove()
 
 
 class DreamcatcherCoordinator(DataUpdateCoordinator[dict[str, Any]]):
@@ -47,12 +140,16 @@ class DreamcatcherCoordinator(DataUpdateCoordinator[dict[str, Any]]):
         api: DreamcatcherApiClient,
         entry: ConfigEntry,
         logger: logging.Logger,
+        push_window: float = PUSH_UPDATE_WINDOW_SECONDS,
+        outbound_window: float = OUTBOUND_COALESCE_SECONDS,
     ) -> None:
         super().__init__(
             hass,
             logger,
             name=DOMAIN,
-            update_interval=timedelta(hours=6),
+            update_interval=_UPDATE_INTERVAL,
+            # listeners (MQTT manager, discovery) only run when a refresh changed something
+            always_update=False,
         )
         self.api = api
         self.entry = entry
@@ -65,15 +162,66 @@ class DreamcatcherCoordinator(DataUpdateCoordinator[dict[str, Any]]):
         ui = entry.data.get(CONF_USER_INFO)
         self.user_info: dict[str, Any] = ui if isinstance(ui, dict) else {}
 
+        # runtime: single in-flight login shared by all callers + proactive refresh timer
+        self._login_task: asyncio.Task | None = None
+        self._unsub_token_refresh: CALLBACK_TYPE | None = None
+        self._auth_stats: dict[str, int] = {"logins": 0, "joined": 0, "auth_retries": 0}
+
+        # persisted: last good shared_devices payload (stale-while-revalidate startup)
+        self._devices_store = _devices_store(hass, entry.entry_id)
+        self._stored_devices: dict[str, dict[str, Any]] | None = None
+        # runtime: device list refreshes answered from the last known list (see _async_update_data)
+        self._refresh_stats: dict[str, Any] = {
+            "failures": 0,
+            "consecutive_failures": 0,
+            "last_error": None,
+            "last_failure": None,
+            "last_success": None,
+        }
+
+        # persisted: debounced snapshot of _mqtt_state + _parts; devices/parts restored
+        # from it stay flagged until a live dout message / full parts_list confirms them
+        self._snapshot_store = _snapshot_store(hass, entry.entry_id)
+        self._snapshot_scheduled = False
+        self._restored_state: set[str] = set()
+        self._restored_parts: set[str] = set()
+
         # runtime: stable MQTT client_id per device for this HA run
         self._mqtt_client_ids: dict[str, str] = {}
 
         # runtime: last seen MQTT messages (kept in memory; can be exposed as diagnostics)
         self._mqtt_state: dict[str, dict[str, Any]] = {}
 
+        # runtime: part registry per device, keyed by part id (parts_list order preserved)
+        self._parts: dict[str, dict[int, PartRecord]] = {}
+
         # runtime: firmware update info per device (populated by REST fwinfo call)
         self._firmware_info: dict[str, dict[str, Any]] = {}
 
+        # runtime: background fwinfo checks (one per device at a time, bounded overall)
+        # persisted: fwinfo results keyed "<devIdInt>:<installed version>" with check time
+        self._fw_cache_store = _firmware_cache_store(hass, entry.entry_id)
+        self._fw_cache: dict[str, dict[str, Any]] | None = None
+        self._fw_semaphore = asyncio.Semaphore(FIRMWARE_CHECK_CONCURRENCY)
+        self._fw_check_tasks: dict[str, asyncio.Task] = {}
+        self._fw_check_rerun: set[str] = set()
+        self._fw_stats: dict[str, int] = {"requests": 0, "cache_hits": 0, "errors": 0}
+
+        # runtime: running alarm history fetch per device (shared by concurrent callers)
+        self._history_tasks: dict[str, asyncio.Task] = {}
+        # runtime: newest history item known before a jump in the live sN sequence (gap fill)
+        self._history_gap_anchor: dict[str, dict[str, Any]] = {}
+
+        # persisted: complete alarm history per device (live events, REST syncs, backfill)
+        self._event_log = AlarmEventLog(hass, entry.entry_id)
+
+        # runtime: full history backfill per device into the event log
+        # persisted: backfill progress per device (completed chunks), resumed on startup
+        self._backfill_store = _backfill_store(hass, entry.entry_id)
+        self._backfill_progress: dict[str, BackfillProgress] | None = None
+        self._backfill_tasks: dict[str, asyncio.Task] = {}
+        self._backfill_limiter = RateLimiter(HISTORY_BACKFILL_RATE)
+
         # runtime: dedupe tracker for echoed/redelivered din logs (QoS1 can duplicate)
         self._last_din_rx: dict[str, tuple[str, int, float]] = {}
 
@@ -86,6 +234,35 @@ class DreamcatcherCoordinator(DataUpdateCoordinator[dict[str, Any]]):
         # runtime: debounced parts sync tasks (per device)
         self._parts_sync_tasks: dict[str, asyncio.Task] = {}
 
+        # runtime: entity discovery (ids already announced to the platforms)
+        self.signal_devices_added = f"{DOMAIN}_devices_added_{entry.entry_id}"
+        self.signal_parts_changed = f"{DOMAIN}_parts_changed_{entry.entry_id}"
+        self._announced_devices: set[str] = set()
+        self._announced_parts: dict[str, set[int]] = {}
+
+        # runtime: parts_list pages collected until finish == 1 (per device)
+        self._parts_staging: dict[str, dict[int, list[Any]]] = {}
+        self._parts_page_timers: dict[str, CALLBACK_TYPE] = {}
+        self._parts_page_retries: dict[str, int] = {}
+
+        # runtime: micro-batched push updates (devices changed since the last flush)
+        self._push_window = push_window
+        self._dirty_devices: set[str] = set()
+        self._unsub_push_flush: CALLBACK_TYPE | None = None
+        self._push_stats: dict[str, int] = {"notified": 0, "suppressed": 0}
+
+        # runtime: per-device outbound command queues (see outbound.py)
+        self._outbound_window = outbound_window
+        self._outbound: dict[str, OutboundScheduler] = {}
+
+        # runtime: commands waiting for their dout response, keyed by (device, action)
+        self._pending_acks: dict[tuple[str, str], list[PendingAck]] = {}
+        self._command_latency: dict[str, dict[str, LatencyHistogram]] = {}
+
+        # runtime: dout message routing by (topic kind, action)
+        self._dout_router = DoutRouter()
+        self._register_builtin_dout_handlers()
+
     # ---------- token / persistence ----------
 
     def _token_is_valid(self) -> bool:
@@ -117,9 +294,26 @@ class DreamcatcherCoordinator(DataUpdateCoordinator[dict[str, Any]]):
         self.hass.config_entries.async_update_entry(self.entry, data=data)
 
     async def _ensure_login(self, force: bool = False) -> None:
+        """Make sure a usable token exists.
+
+        Concurrent callers (refresh, history fetches, firmware checks) share one
+        login request instead of each logging in on their own.
+        """
         if not force and self._token_is_valid():
+            self._schedule_token_refresh()
             return
 
+        task = self._login_task
+        if task is None or task.done():
+            task = self._login_task = self.hass.async_create_background_task(
+                self._async_login(), f"{DOMAIN}_login"
+            )
+        else:
+            self._auth_stats["joined"] += 1
+        # shielded: a cancelled caller must not abort the login the others wait for
+        await asyncio.shield(task)
+
+    async def _async_login(self) -> None:
         d = self.entry.data
         res = await self.api.login(
             am_domain=d[CONF_AM_DOMAIN],
@@ -134,46 +328,124 @@ class DreamcatcherCoordinator(DataUpdateCoordinator[dict[str, Any]]):
         self.expire_at = res.expire_at
         self.user_info = res.user_info if isinstance(res.user_info, dict) else {}
         self.last_login = dt_util.utcnow().isoformat()
+        self._auth_stats["logins"] += 1
 
         await self._persist_auth()
 
-    # ---------- coordinator update ----------
+        if self._unsub_token_refresh is not None:
+            self._unsub_token_refresh()
+            self._unsub_token_refresh = None
+        self._schedule_token_refresh()
 
-    async def _async_update_data(self) -> dict[str, Any]:
+    @callback
+    def _schedule_token_refresh(self) -> None:
+        """Arm a timer that logs in again when the token enters its refresh window."""
+        if self._unsub_token_refresh is not None or not self.expire_at:
+            return
+        now = dt_util.utcnow().timestamp()
+        delay = max(_TOKEN_REFRESH_MIN_DELAY, int(self.expire_at) - _REFRESH_BEFORE_SECONDS - now)
+        self._unsub_token_refresh = async_call_later(self.hass, delay, self._on_token_refresh_due)
+
+    @callback
+    def _on_token_refresh_due(self, _now: Any = None) -> None:
+        self._unsub_token_refresh = None
+        self.entry.async_create_background_task(
+            self.hass, self._async_proactive_login(), f"{DOMAIN}_token_refresh"
+        )
+
+    async def _async_proactive_login(self) -> None:
         try:
-            await self._ensure_login(force=False)
-        except DreamcatcherAuthError as err:
-            raise UpdateFailed(f"Authentication failed: {err}") from err
+            await self._ensure_login()
         except DreamcatcherError as err:
-            raise UpdateFailed(f"Update failed: {err}") from err
-
-        if not self.token:
-            raise UpdateFailed("No token available")
+            self.logger.warning(
+                "Token refresh failed, retrying in %ss: %s", TOKEN_REFRESH_RETRY_SECONDS, err
+            )
+            if self._unsub_token_refresh is None:
+                self._unsub_token_refresh = async_call_later(
+                    self.hass, TOKEN_REFRESH_RETRY_SECONDS, self._on_token_refresh_due
+                )
 
-        d = self.entry.data
+    async def _async_call_authed(self, request: Callable[[str], Awaitable[_T]]) -> _T:
+        """Run a REST request with the current token.
 
+        After a 401/403 the token is renewed (unless another caller already did)
+        and the request is retried once.
+        """
+        await self._ensure_login()
+        token = self.token
+        if not token:
+            raise DreamcatcherAuthError("No token available")
         try:
-            devices = await self.api.shared_devices(
-                am_domain=d[CONF_AM_DOMAIN],
-                am_port=int(d[CONF_AM_PORT]),
-                token=self.token,
-            )
+            return await request(token)
         except DreamcatcherAuthError:
-            # server-side invalidation -> refresh once + retry
-            try:
+            self._auth_stats["auth_retries"] += 1
+            if self.token == token:
                 await self._ensure_login(force=True)
-                if not self.token:
-                    raise UpdateFailed("No token available after forced login")
+            if not self.token:
+                raise
+            return await request(self.token)
+
+    def auth_stats(self) -> dict[str, Any]:
+        return {**self._auth_stats, "login_in_flight": self._login_task is not None and not self._login_task.done()}
+
+    # ---------- coordinator update ----------
 
-                devices = await self.api.shared_devices(
+    async def _async_update_data(self) -> dict[str, Any]:
+        try:
+            devices_by_id = await self._async_fetch_shared_devices()
+        except UpdateFailed as err:
+            # Retry sooner than the regular interval (the REST client already
+            # retried transient errors; this covers longer outages).
+            self.update_interval = timedelta(seconds=REFRESH_RETRY_SECONDS)
+            if self.data is None:
+                raise
+            # Deliberately reported as a successful update: the device list only
+            # changes when hubs are added or removed, while the entities are driven
+            # by MQTT, which keeps working during a REST outage. Raising would mark
+            # every entity unavailable for up to REFRESH_RETRY_SECONDS; the failure
+            # is tracked in refresh_stats() (diagnostics) instead.
+            self._refresh_stats["failures"] += 1
+            self._refresh_stats["consecutive_failures"] += 1
+            self._refresh_stats["last_error"] = str(err)
+            self._refresh_stats["last_failure"] = dt_util.utcnow().isoformat()
+            self.logger.warning("Device list refresh failed, keeping the last known one: %s", err)
+            return self.data
+
+        self.update_interval = _UPDATE_INTERVAL
+        self._refresh_stats["consecutive_failures"] = 0
+        self._refresh_stats["last_success"] = dt_util.utcnow().isoformat()
+
+        self._prepare_devices(devices_by_id)
+        if not devices_by_id:
+            raise ConfigEntryError(
+                "No shared devices found for this account. "
+                f"Please follow the integration documentation: {DOCS_URL}"
+            )
+        await self._async_store_devices(devices_by_id)
+
+        # Firmware checks run in the background and never delay the refresh
+        for dev_id, dev in devices_by_id.items():
+            self._schedule_firmware_check(dev_id, dev)
+
+        return self._build_data(devices_by_id)
+
+    def refresh_stats(self) -> dict[str, Any]:
+        return {**self._refresh_stats, "serving_last_known": bool(self._refresh_stats["consecutive_failures"])}
+
+    async def _async_fetch_shared_devices(self) -> dict[str, dict[str, Any]]:
+        """Log in if needed and return the shared devices keyed by device id."""
+        d = self.entry.data
+
+        try:
+            devices = await self._async_call_authed(
+                lambda token: self.api.shared_devices(
                     am_domain=d[CONF_AM_DOMAIN],
                     am_port=int(d[CONF_AM_PORT]),
-                    token=self.token,
+                    token=token,
                 )
-            except DreamcatcherAuthError as err:
-                raise UpdateFailed(f"Authentication failed: {err}") from err
-            except DreamcatcherError as err:
-                raise UpdateFailed(f"Shared devices request failed: {err}") from err
+            )
+        except DreamcatcherAuthError as err:
+            raise UpdateFailed(f"Authentication failed: {err}") from err
         except DreamcatcherError as err:
             raise UpdateFailed(f"Shared devices request failed: {err}") from err
 
@@ -193,20 +465,14 @@ class DreamcatcherCoordinator(DataUpdateCoordinator[dict[str, Any]]):
                     continue
                 devices_by_id[str(dev_id)] = dev
 
+        return devices_by_id
+
+    def _prepare_devices(self, devices_by_id: dict[str, dict[str, Any]]) -> None:
         for dev_id, dev in devices_by_id.items():
             dev.setdefault("ID", dev_id)
             dev.setdefault("mqtt_calc", self._build_mqtt_calc(dev_id, dev))
 
-        if not devices_by_id:
-            raise ConfigEntryError(
-                "No shared devices found for this account. "
-                f"Please follow the integration documentation: {DOCS_URL}"
-            )
-
-        # Check for firmware updates for each device
-        for dev_id, dev in devices_by_id.items():
-            await self._fetch_firmware_info(dev_id, dev)
-
+    def _build_data(self, devices_by_id: dict[str, dict[str, Any]]) -> dict[str, Any]:
         return {
             "userInfo": self.user_info or {},
             "expireAt": self.expire_at,
@@ -216,51 +482,306 @@ class DreamcatcherCoordinator(DataUpdateCoordinator[dict[str, Any]]):
             "firmware_info": self._firmware_info,
         }
 
+    # ---------- persisted device list ----------
+
+    async def async_load_stored_devices(self) -> bool:
+        """Publish the last stored device list as coordinator data.
+
+        Returns False if nothing usable is stored; the caller then has to wait
+        for a regular first refresh.
+        """
+        stored = await self._devices_store.async_load()
+        devices = stored.get("shared_devices") if isinstance(stored, dict) else None
+        if not isinstance(devices, dict) or not devices:
+            return False
+
+        self._stored_devices = devices
+        devices_by_id = {dev_id: dict(dev) for dev_id, dev in devices.items() if isinstance(dev, dict)}
+        self._prepare_devices(devices_by_id)
+        self.async_set_updated_data(self._build_data(devices_by_id))
+        self.logger.debug("Loaded %d device(s) from storage", len(devices_by_id))
+        return True
+
+    async def _async_store_devices(self, devices_by_id: dict[str, dict[str, Any]]) -> None:
+        # mqtt_calc is derived at runtime and not persisted
+        devices = {
+            dev_id: {k: v for k, v in dev.items() if k != "mqtt_calc"}
+            for dev_id, dev in devices_by_id.items()
+        }
+        if devices == self._stored_devices:
+            return
+        self._stored_devices = devices
+        await self._devices_store.async_save({"shared_devices": devices})
+
+    # ---------- runtime snapshot ----------
+
+    async def async_restore_runtime_snapshot(self) -> None:
+        """Seed _mqtt_state and the part registry from the last snapshot.
+
+        Must run after the device list is known and before the platforms are set
+        up, so entities (incl. accessories) are created with restored values.
+        """
+        stored = await self._snapshot_store.async_load()
+        devices = stored.get("devices") if isinstance(stored, dict) else None
+        if not isinstance(devices, dict):
+            return
+
+        known = set(self.get_device_ids())
+        for device_id, snap in devices.items():
+            if device_id not in known or not isinstance(snap, dict):
+                continue
+
+            state = snap.get("state")
+            if isinstance(state, dict) and device_id not in self._mqtt_state:
+                self._mqtt_state[device_id] = dict(state)
+                self._restored_state.add(device_id)
+
+            parts = snap.get("parts")
+            if isinstance(parts, list) and parts and device_id not in self._parts:
+                self._commit_parts(device_id, {1: parts})
+                self._restored_parts.add(device_id)
+
+        self.logger.debug(
+            "Restored runtime snapshot: state=%s parts=%s",
+            sorted(self._restored_state),
+            sorted(self._restored_parts),
+        )
+
+    def is_state_restored(self, device_id: str) -> bool:
+        """True while a device's state comes from the snapshot (no live dout yet)."""
+        return device_id in self._restored_state
+
+    def is_parts_restored(self, device_id: str) -> bool:
+        """True while a device's parts come from the snapshot (no full parts_list yet)."""
+        return device_id in self._restored_parts
+
+    @callback
+    def _schedule_runtime_snapshot(self) -> None:
+        # Not rescheduled on every change: the first change since the last write
+        # starts the timer, so a steady stream of updates cannot postpone it.
+        if self._snapshot_scheduled:
+            return
+        self._snapshot_scheduled = True
+        self._snapshot_store.async_delay_save(self._runtime_snapshot, RUNTIME_SNAPSHOT_SAVE_DELAY)
+
+    @callback
+    def _runtime_snapshot(self) -> dict[str, Any]:
+        self._snapshot_scheduled = False
+        devices: dict[str, dict[str, Any]] = {}
+        for device_id in self.get_device_ids():
+            state = self._mqtt_state.get(device_id) or {}
+            devices[device_id] = {
+                "state": {k: v for k, v in state.items() if k not in _SNAPSHOT_SKIP_KEYS},
+                "parts": [record.as_payload() for record in self.get_parts(device_id)],
+            }
+        return {"devices": devices}
+
     # ---------- firmware update check ----------
 
+    @callback
+    def _schedule_firmware_check(self, device_id: str, dev: dict[str, Any] | None = None) -> None:
+        """Start a background fwinfo check; while one runs for the device, queue a rerun."""
+        if dev is None:
+            dev = ((self.data or {}).get("shared_devices") or {}).get(device_id)
+            if not isinstance(dev, dict):
+                return
+
+        task = self._fw_check_tasks.get(device_id)
+        if task is not None and not task.done():
+            # e.g. dev_conf reported a new w_v while the previous version is checked
+            self._fw_check_rerun.add(device_id)
+            return
+        self._fw_check_tasks[device_id] = self.entry.async_create_background_task(
+            self.hass,
+            self._async_firmware_check(device_id, dev),
+            f"{DOMAIN}_fwinfo_{device_id}",
+            # dout handlers schedule before dev_state is stored; read "fw" afterwards
+            eager_start=False,
+        )
+
+    async def _async_firmware_check(self, device_id: str, dev: dict[str, Any]) -> None:
+        try:
+            while True:
+                self._fw_check_rerun.discard(device_id)
+                await self._fetch_firmware_info(device_id, dev)
+                if device_id not in self._fw_check_rerun:
+                    return
+        finally:
+            self._fw_check_tasks.pop(device_id, None)
+
+    async def _async_load_fw_cache(self) -> dict[str, dict[str, Any]]:
+        if self._fw_cache is None:
+            stored = await self._fw_cache_store.async_load()
+            entries = stored.get("entries") if isinstance(stored, dict) else None
+            # another check may have loaded it while we waited
+            if self._fw_cache is None:
+                self._fw_cache = entries if isinstance(entries, dict) else {}
+        return self._fw_cache
+
+    @callback
+    def _fw_cache_data(self) -> dict[str, Any]:
+        now = dt_util.utcnow().timestamp()
+        entries = {
+            key: item
+            for key, item in (self._fw_cache or {}).items()
+            if now - item.get("checked_at", 0) < FIRMWARE_INFO_TTL_SECONDS
+        }
+        return {"entries": entries}
+
+    def firmware_check_stats(self) -> dict[str, Any]:
+        return {**self._fw_stats, "running": len(self._fw_check_tasks)}
+
     async def _fetch_firmware_info(self, device_id: str, dev: dict[str, Any]) -> None:
-        """Check the fwinfo REST endpoint for available firmware updates."""
+        """Check the fwinfo REST endpoint for available firmware updates (TTL-cached)."""
         dev_id_int = dev.get("devIdInt")
         if not dev_id_int:
             return
 
-        # Get the dm endpoint for this device
-        dm = dev.get("dm") or {}
-        dm_domain = dm.get("domain")
-        dm_port = dm.get("port")
-        if dm_domain and dm_port:
-            base_url = f"https://{dm_domain}:{dm_port}"
-        else:
-            d = self.entry.data
-            base_url = f"https://{d[CONF_AM_DOMAIN]}:{d[CONF_AM_PORT]}"
+        base_url = self._dm_base_url(dev)
 
         # Use current installed fw version from MQTT state (if available)
         dev_state = self._mqtt_state.get(device_id) or {}
         installed_fw = dev_state.get("fw") or ""
 
-        try:
-            result = await self.api.firmware_info(
-                base_url=base_url,
-                token=self.token,
-                device_id_int=int(dev_id_int),
-                wifi_version=installed_fw,
+        cache = await self._async_load_fw_cache()
+        cache_key = f"{dev_id_int}:{installed_fw}"
+        now = dt_util.utcnow().timestamp()
+        cached = cache.get(cache_key)
+        if isinstance(cached, dict) and now - cached.get("checked_at", 0) < FIRMWARE_INFO_TTL_SECONDS:
+            self._fw_stats["cache_hits"] += 1
+            info = {**cached["info"], "installed_version": installed_fw or None}
+        else:
+            try:
+                async with self._fw_semaphore:
+                    result = await self._async_call_authed(
+                        lambda token: self.api.firmware_info(
+                            base_url=base_url,
+                            token=token,
+                            device_id_int=int(dev_id_int),
+                            wifi_version=installed_fw,
+                        )
+                    )
+            except Exception as err:
+                self._fw_stats["errors"] += 1
+                self.logger.debug("Firmware info check failed for %s: %s", device_id, err)
+                return
+            self._fw_stats["requests"] += 1
+
+            fw_list = result.get("fwList") or []
+            if not isinstance(fw_list, list):
+                fw_list = []
+
+            info = {
+                "code": result.get("code"),
+                "fwCount": result.get("fwCount", 0),
+                "force": result.get("force", 0),
+                "appForce": result.get("appForce", 0),
+                "fwList": fw_list,
+                "installed_version": installed_fw or None,
+            }
+            cache[cache_key] = {"checked_at": now, "info": info}
+            self._fw_cache_store.async_delay_save(self._fw_cache_data, _FIRMWARE_CACHE_SAVE_DELAY)
+
+        if self._firmware_info.get(device_id) != info:
+            # firmware_info is shared with coordinator.data, so a refresh alone
+            # would not see this as a change (always_update=False)
+            self._firmware_info[device_id] = info
+            self.async_mark_device_dirty(device_id)
+
+    # ---------- push updates ----------
+
+    @callback
+    def async_mark_device_dirty(self, device_id: str) -> None:
+        """Schedule a push update for a device.
+
+        MQTT pushes mutate the runtime state in place (coordinator.data references
+        _mqtt_state / _firmware_info), so instead of async_set_updated_data() we only
+        collect dirty devices and notify their listeners once per push window.
+        """
+        self._dirty_devices.add(device_id)
+        if self._unsub_push_flush is None:
+            self._unsub_push_flush = async_call_later(
+                self.hass, self._push_window, self._async_flush_push_updates
             )
-        except Exception as err:
-            self.logger.debug("Firmware info check failed for %s: %s", device_id, err)
+
+    @callback
+    def _async_flush_push_updates(self, _now: Any = None) -> None:
+        self._unsub_push_flush = None
+        dirty = self._dirty_devices
+        if not dirty:
             return
+        self._dirty_devices = set()
+        self._schedule_runtime_snapshot()
+
+        # Entities register with context=device_id; context-less listeners
+        # (platform discovery, MQTT manager) are always notified.
+        for update_callback, context in list(self._listeners.values()):
+            if context is None or context in dirty:
+                update_callback()
+
+    async def async_shutdown(self) -> None:
+        backfills = [task for task in self._backfill_tasks.values() if not task.done()]
+        for task in backfills:
+            task.cancel()
+        await asyncio.gather(*backfills, return_exceptions=True)
+        if self._backfill_progress is not None:
+            await self._backfill_store.async_save(self._backfill_data())
+        await self._event_log.async_close()
+        if self._unsub_token_refresh is not None:
+            self._unsub_token_refresh()
+            self._unsub_token_refresh = None
+        if self._unsub_push_flush is not None:
+            self._unsub_push_flush()
+            self._unsub_push_flush = None
+        self._dirty_devices.clear()
+        for device_id in list(self._parts_page_timers):
+            self._cancel_parts_page_timer(device_id)
+        self._parts_staging.clear()
+        for scheduler in self._outbound.values():
+            await scheduler.async_close()
+        self._outbound.clear()
+        for acks in list(self._pending_acks.values()):
+            for ack in list(acks):
+                self._finish_ack(ack, None)
+        await super().async_shutdown()
+
+    # ---------- entity discovery ----------
 
-        fw_list = result.get("fwList") or []
-        if not isinstance(fw_list, list):
-            fw_list = []
-
-        self._firmware_info[device_id] = {
-            "code": result.get("code"),
-            "fwCount": result.get("fwCount", 0),
-            "force": result.get("force", 0),
-            "appForce": result.get("appForce", 0),
-            "fwList": fw_list,
-            "installed_version": installed_fw or None,
-        }
+    @callback
+    def async_update_listeners(self) -> None:
+        super().async_update_listeners()
+        self._async_discover_devices()
+
+    @callback
+    def _async_discover_devices(self) -> None:
+        """Announce hubs that appeared in shared_devices since the last refresh."""
+        added = [dev_id for dev_id in self.get_device_ids() if dev_id not in self._announced_devices]
+        if not added:
+            return
+        self._announced_devices.update(added)
+        async_dispatcher_send(self.hass, self.signal_devices_added, added)
+
+    @callback
+    def _async_discover_parts(self, device_id: str, previous: dict[int, PartRecord]) -> None:
+        """Diff a committed part set against what the platforms already know.
+
+        A part is announced as added only once per run, so entities of a part that
+        disappears and comes back are reused (they report unavailable meanwhile).
+        """
+        current = self._parts.get(device_id) or {}
+        announced = self._announced_parts.setdefault(device_id, set())
+
+        added = tuple(record for part_id, record in current.items() if part_id not in announced)
+        removed = tuple(part_id for part_id in previous if part_id not in current)
+        if not added and not removed:
+            return
+
+        announced.update(record.id for record in added)
+        async_dispatcher_send(
+            self.hass,
+            self.signal_parts_changed,
+            PartsChange(device_id=device_id, added=added, removed=removed),
+        )
 
     # ---------- device + mqtt helpers ----------
 
@@ -270,17 +791,157 @@ class DreamcatcherCoordinator(DataUpdateCoordinator[dict[str, Any]]):
             return []
         return list(devs.keys())
 
+    def _dm_base_url(self, dev: dict[str, Any]) -> str:
+        """Per-device dm endpoint, falling back to the am endpoint from the config entry."""
+        dm = dev.get("dm") or {}
+        dm_domain = dm.get("domain")
+        dm_port = dm.get("port")
+        if dm_domain and dm_port:
+            return f"https://{dm_domain}:{dm_port}"
+        d = self.entry.data
+        return f"https://{d[CONF_AM_DOMAIN]}:{d[CONF_AM_PORT]}"
+
+    # ---------- part registry ----------
+
     @staticmethod
-    def _safe_json(payload: str | bytes) -> Any | None:
+    def _part_key(part_id: Any) -> int | None:
         try:
-            if isinstance(payload, (bytes, bytearray)):
-                text = bytes(payload).decode("utf-8", errors="replace")
-            else:
-                text = str(payload)
-            return json.loads(text)
-        except Exception:
+            return int(part_id)
+        except (TypeError, ValueError):
+            return None
+
+    def get_part(self, device_id: str, part_id: Any) -> PartRecord | None:
+        """Return the current PartRecord for (device_id, part_id) in O(1)."""
+        key = self._part_key(part_id)
+        if key is None:
             return None
-        
+        return (self._parts.get(device_id) or {}).get(key)
+
+    def get_parts(self, device_id: str) -> list[PartRecord]:
+        """Return all known parts of a device in parts_list order."""
+        return list((self._parts.get(device_id) or {}).values())
+
+    def _commit_parts(self, device_id: str, pages: dict[int, list[Any]]) -> bool:
+        """Atomically replace a device's registry with a fully received parts_list.
+
+        Returns True if the part set or any part payload changed.
+        """
+        index: dict[int, PartRecord] = {}
+        for page in sorted(pages):
+            for part in pages[page]:
+                if not isinstance(part, dict):
+                    continue
+                record = PartRecord.from_payload(part)
+                if record is not None:
+                    index[record.id] = record
+
+        previous = self._parts.get(device_id)
+        # a live parts_list confirms restored parts even if nothing changed
+        confirmed = device_id in self._restored_parts
+        self._restored_parts.discard(device_id)
+        if index == previous:
+            return confirmed
+        self._parts[device_id] = index
+        self._async_discover_parts(device_id, previous or {})
+        return True
+
+    @callback
+    def _handle_parts_list_page(self, device_id: str, res: dict[str, Any]) -> None:
+        """Stage one parts_list page; swap into the registry once finish == 1."""
+        try:
+            page = int(res.get("page", 1) or 1)
+        except (TypeError, ValueError):
+            page = 1
+        finish = res.get("finish", 1)
+        parts = res.get("parts")
+        if not isinstance(parts, list):
+            parts = []
+
+        if page == 1:
+            staging: dict[int, list[Any]] = {}
+            self._parts_staging[device_id] = staging
+        else:
+            staging = self._parts_staging.get(device_id)
+            if staging is None or page in staging:
+                # Stray page without page 1, or QoS1 redelivery of a page we already have.
+                return
+
+        staging[page] = parts
+        self._cancel_parts_page_timer(device_id)
+        self._parts_page_retries.pop(device_id, None)
+
+        if finish == 0:
+            self.hass.async_create_task(
+                self.async_request_parts_list(device_id, page=page + 1)
+            )
+            return
+
+        self._parts_staging.pop(device_id, None)
+        if self._commit_parts(device_id, staging):
+            self.async_mark_device_dirty(device_id)
+
+    @callback
+    def _arm_parts_page_timer(self, device_id: str, page: int) -> None:
+        self._cancel_parts_page_timer(device_id)
+        self._parts_page_timers[device_id] = async_call_later(
+            self.hass,
+            PARTS_PAGE_TIMEOUT_SECONDS,
+            partial(self._on_parts_page_timeout, device_id, page),
+        )
+
+    @callback
+    def _cancel_parts_page_timer(self, device_id: str) -> None:
+        unsub = self._parts_page_timers.pop(device_id, None)
+        if unsub is not None:
+            unsub()
+
+    @callback
+    def _on_parts_page_timeout(self, device_id: str, page: int, _now: Any = None) -> None:
+        """Re-request a parts_list page that did not arrive in time."""
+        self._parts_page_timers.pop(device_id, None)
+
+        staging = self._parts_staging.get(device_id)
+        if staging is not None and page in staging:
+            return
+        if staging is None and page != 1:
+            return
+
+        retries = self._parts_page_retries.get(device_id, 0) + 1
+        if retries > PARTS_PAGE_MAX_RETRIES:
+            self._parts_page_retries.pop(device_id, None)
+            self._parts_staging.pop(device_id, None)
+            self.logger.warning(
+                "parts_list page %s for %s did not arrive after %s retries; keeping previous parts list",
+                page, device_id, PARTS_PAGE_MAX_RETRIES,
+            )
+            return
+
+        self._parts_page_retries[device_id] = retries
+        self.logger.debug("parts_list page %s for %s timed out; re-requesting (%s)", page, device_id, retries)
+        self.hass.async_create_task(self.async_request_parts_list(device_id, page=page))
+
+    def _apply_part_changes(self, device_id: str, changes: list[Any]) -> bool:
+        """Merge modify_parts entries into the registry; return True if any part changed."""
+        index = self._parts.get(device_id)
+        if not index:
+            return False
+
+        changed = False
+        for change in changes:
+            if not isinstance(change, dict):
+                continue
+            key = self._part_key(change.get("id"))
+            existing = index.get(key) if key is not None else None
+            if existing is None:
+                continue
+
+            updated = existing.with_changes(change)
+            if updated != existing:
+                index[key] = updated
+                changed = True
+
+        return changed
+
     def _get_device(self, device_id: str) -> dict[str, Any]:
         devs = (self.data or {}).get("shared_devices") or {}
         if not isinstance(devs, dict) or device_id not in devs:
@@ -412,308 +1073,519 @@ class DreamcatcherCoordinator(DataUpdateCoordinator[dict[str, Any]]):
             if task is not None and task.done():
                 self._parts_sync_tasks.pop(device_id, None)
 
+    def _process_din_message(
+        self, device_id: str, topic: str, payload: bytes, preview: LazyPayloadPreview
+    ) -> None:
+        """Classify din traffic as self-echo/external; only EXT modify_parts is parsed."""
+        now_mono = time.monotonic()
+        payload_hash = hash(payload)
+        last = self._last_din_rx.get(device_id)
+        if last is not None:
+            last_topic, last_hash, last_ts = last
+            if last_topic == topic and last_hash == payload_hash and (now_mono - last_ts) <= _DIN_DUP_WINDOW_SECONDS:
+                return
+        self._last_din_rx[device_id] = (topic, payload_hash, now_mono)
+
+        src = "EXT"
+        tx = self._last_din_tx.get(device_id)
+        if tx is not None:
+            tx_topic, tx_hash, tx_ts = tx
+            if tx_topic == topic and tx_hash == payload_hash and (now_mono - tx_ts) <= _DIN_ECHO_WINDOW_SECONDS:
+                src = "ECHO"
+
+        self.logger.debug("MQTT RX DIN %s dev=%s topic=%s payload=%s", src, device_id, topic, preview)
+
+        # If an external client modifies parts (e.g. app), update local parts state directly
+        # to avoid immediate parts_list polling bursts that can cause UI flicker.
+        if src != "EXT":
+            return
+        data = parse_json_payload(payload)
+        m = data.get("m") if isinstance(data, dict) else None
+        req = m.get("req") if isinstance(m, dict) else None
+        if isinstance(req, dict) and req.get("a") == "modify_parts":
+            self._last_ext_modify_parts_ts[device_id] = now_mono
+            req_parts = req.get("parts")
+            if isinstance(req_parts, list) and self._apply_part_changes(device_id, req_parts):
+                self.async_mark_device_dirty(device_id)
+
     @callback
     def async_process_mqtt_message(self, *, device_id: str, topic: str, payload: bytes) -> None:
-        """Parse a device dout message and update in-memory mqtt_state."""
+        """Parse a device dout message and update in-memory mqtt_state.
 
-        # Full payload for debug log
-        try:
-            preview = payload.decode("utf-8", errors="replace")
-        except Exception:
-            preview = repr(payload)
+        The payload bytes are parsed exactly once (see parse_json_payload) and the
+        resulting object is shared by all handlers; the log preview is rendered
+        lazily, i.e. only when DEBUG logging is actually enabled.
+        """
+        preview = LazyPayloadPreview(payload)
 
         # We also subscribe to din/config for debugging external clients.
         # Log it with a dedicated prefix and do not treat din traffic as state updates.
         if "/din/" in topic:
-            now_mono = time.monotonic()
-            payload_hash = hash(payload)
-            last = self._last_din_rx.get(device_id)
-            if last is not None:
-                last_topic, last_hash, last_ts = last
-                if last_topic == topic and last_hash == payload_hash and (now_mono - last_ts) <= _DIN_DUP_WINDOW_SECONDS:
-                    return
-            self._last_din_rx[device_id] = (topic, payload_hash, now_mono)
-
-            src = "EXT"
-            tx = self._last_din_tx.get(device_id)
-            if tx is not None:
-                tx_topic, tx_hash, tx_ts = tx
-                if tx_topic == topic and tx_hash == payload_hash and (now_mono - tx_ts) <= _DIN_ECHO_WINDOW_SECONDS:
-                    src = "ECHO"
-
-            self.logger.debug("MQTT RX DIN %s dev=%s topic=%s payload=%s", src, device_id, topic, preview)
-
-            # If an external client modifies parts (e.g. app), update local parts state directly
-            # to avoid immediate parts_list polling bursts that can cause UI flicker.
-            if src == "EXT":
-                data = self._safe_json(payload)
-                m = data.get("m") if isinstance(data, dict) else None
-                req = m.get("req") if isinstance(m, dict) else None
-                if isinstance(req, dict) and req.get("a") == "modify_parts":
-                    self._last_ext_modify_parts_ts[device_id] = now_mono
-                    req_parts = req.get("parts")
-                    if isinstance(req_parts, list):
-                        dev_state = dict(self._mqtt_state.get(device_id) or {})
-                        parts_state = list(dev_state.get("parts") or [])
-                        changed = False
-
-                        for req_part in req_parts:
-                            if not isinstance(req_part, dict):
-                                continue
-                            part_id = req_part.get("id")
-                            if part_id is None:
-                                continue
-
-                            for idx, existing_part in enumerate(parts_state):
-                                if not isinstance(existing_part, dict):
-                                    continue
-                                if existing_part.get("id") != part_id:
-                                    continue
-
-                                updated = dict(existing_part)
-                                for key, value in req_part.items():
-                                    if key == "id":
-                                        continue
-                                    updated[key] = value
-
-                                # Keep c bitfield status in sync if e was modified.
-                                if "e" in req_part and updated.get("c") is not None:
-                                    try:
-                                        c_int = int(updated.get("c"))
-                                        if int(req_part.get("e")) == 1:
-                                            c_int = c_int | 0x80
-                                        else:
-                                            c_int = c_int & 0x7F
-                                        updated["c"] = c_int
-                                    except (TypeError, ValueError):
-                                        pass
-
-                                parts_state[idx] = updated
-                                changed = True
-                                break
-
-                        if changed:
-                            dev_state["parts"] = parts_state
-                            self._mqtt_state[device_id] = dev_state
-                            cur = dict(self.data or {})
-                            cur["mqtt_state"] = dict(self._mqtt_state)
-                            cur["firmware_info"] = dict(self._firmware_info)
-                            self.async_set_updated_data(cur)
+            self._process_din_message(device_id, topic, payload, preview)
             return
 
         self.logger.debug("MQTT RX DOUT dev=%s topic=%s payload=%s", device_id, topic, preview)
 
-        data = self._safe_json(payload)
+        data = parse_json_payload(payload)
 
         # State pro Device in self._mqtt_state halten (damit HTTP-Refresh ihn nicht überschreibt)
-        dev_state = dict(self._mqtt_state.get(device_id) or {})
+        prev_state = self._mqtt_state.get(device_id) or {}
+        dev_state = dict(prev_state)
 
         dev_state["last_topic"] = topic
         dev_state["last_seen"] = dt_util.utcnow().isoformat()
 
-        # Online/Offline
-        if topic.endswith("/dout/online") and isinstance(data, dict):
-            param = str(data.get("param") or "")
-            dev_state["online"] = (param == "1" or param.lower() == "true")
-            dev_state["online_msg"] = data.get("msg")
-
-        # Config
-        if topic.endswith("/dout/config") and isinstance(data, dict):
-            m = data.get("m")
-            res = m.get("res") if isinstance(m, dict) else None
-            if isinstance(res, dict):
-                action = res.get("a")
-                if action == "host_stat" or action is None:
-                    dev_state["mode"] = res.get("mode")     # d/a/h/...
-                    dev_state["alarm"] = res.get("alarm")   # 0/1
-                    dev_state["trig"] = res.get("trig")
-                    dev_state["power"] = res.get("power")
-                    dev_state["test_mode"] = res.get("test")
-                    dev_state["time"] = res.get("time")
-                if action == "host_conf":
-                    is_conf = res.get("IS")
-                    if isinstance(is_conf, dict):
-                        dev_state["alarm_volume"] = is_conf.get("v")
-                        dev_state["arm_beep"] = is_conf.get("t")
-                        dev_state["alarm_duration"] = is_conf.get("tm")
-                    delay_conf = res.get("delay")
-                    if isinstance(delay_conf, dict):
-                        dev_state["exit_delay"] = delay_conf.get("o")
-                        dev_state["exit_delay_tone"] = delay_conf.get("ot")
-                        dev_state["entry_delay"] = delay_conf.get("i")
-                        dev_state["entry_delay_tone"] = delay_conf.get("it")
-
-        # Info
-        if topic.endswith("/dout/info") and isinstance(data, dict):
-            m = data.get("m")
-            res = m.get("res") if isinstance(m, dict) else None
-            if isinstance(res, dict):
-                action = res.get("a")
-                if action == "dev_conf" or action is None:
-                    dev_state["tz"] = res.get("tz")
-                    dev_state["fw"] = res.get("w_v")
-                    dev_state["ip_local"] = res.get("ip")
-                    dev_state["qs_d"] = res.get("qs_d")
-                    dev_state["qs_p"] = res.get("qs_p")
-                if action == "parts_list":
-                    parts = res.get("parts")
-                    page = res.get("page", 1)
-                    finish = res.get("finish", 1)
-                    if isinstance(parts, list):
-                        existing = dev_state.get("parts") or []
-                        if page == 1:
-                            existing = []
-                        existing = list(existing) + parts
-                        dev_state["parts"] = existing
-                    # Request next page if not finished
-                    if finish == 0:
-                        next_page = (page or 1) + 1
-                        self.hass.async_create_task(
-                            self.async_request_parts_list(device_id, page=next_page)
-                        )
-                if action == "modify_parts":
-                    # ACK only; state updates come from optimistic local update or DIN EXT processing.
-                    self._last_din_tx.pop(device_id, None)
-                    now_mono = time.monotonic()
-                    ext_ts = self._last_ext_modify_parts_ts.get(device_id, 0.0)
-                    if (now_mono - ext_ts) > _EXT_MODIFY_GRACE_SECONDS:
-                        self._schedule_parts_sync(device_id)
-                    pass
-
-        # Alarm events (who changed the mode) -> changed_by
-        if topic.endswith("/dout/alarm") and isinstance(data, dict):
-            nick = data.get("iN")          # "Home Assistant" / user alias
-            evt = data.get("iE")           # 12 disarm, 13 arm, 14 home arm
-            ts = data.get("tS")            # unix timestamp
-
-            # Persist raw event details for debugging / attributes
-            dev_state["alarm_evt_code"] = evt
-            dev_state["alarm_evt_nick"] = nick
-            dev_state["alarm_evt_ts"] = ts
-            dev_state["alarm_evt_sn"] = data.get("sN")
-
-            # Prepend live event to alarm_history so it appears in
-            # extra_state_attributes immediately (same format as REST items).
-            live_item = {
-                "itemEvent": evt,
-                "itemName": nick or "",
-                "time": ts,
-            }
-            history = list(dev_state.get("alarm_history") or [])
-            history.insert(0, live_item)
-            if len(history) > _MAX_IN_MEMORY_ALARM_HISTORY:
-                history = history[:_MAX_IN_MEMORY_ALARM_HISTORY]
-            dev_state["alarm_history"] = history
-            dev_state["alarm_history_total"] = dev_state.get("alarm_history_total", len(history)) + 1
-
-            # Only treat mode-changing events as "changed_by"
-            mode_map = {12: "d", 13: "a", 14: "h"}
-            try:
-                evt_i = int(evt)
-            except Exception:
-                evt_i = None
-
-            source_type = data.get("iT")
-            trigger_type = dev_state.get("trig")
-            alarm_origin = derive_alarm_origin(
-                event_code=evt_i,
-                trigger_type=trigger_type,
-                source_type=source_type,
-            )
-            dev_state["alarm_origin"] = alarm_origin
-
-            if evt_i in mode_map:
-                if isinstance(nick, str) and nick.strip():
-                    dev_state["changed_by"] = nick.strip()
-                dev_state["mode"] = mode_map[evt_i]
-
-            # Trigger events -> triggered_by
-            # iE=11: SOS (app/keyfob), iE=15: tamper, iE=26: sensor trigger
-            if evt_i in (11, 15, 26):
-                dev_state["triggered_by"] = nick.strip() if isinstance(nick, str) and nick.strip() else None
-                dev_state["triggered_by_id"] = data.get("iI")
-                dev_state["triggered_by_type"] = source_type
-                dev_state["triggered_by_type_label"] = alarm_source_type_label(source_type)
-                dev_state["triggered_at"] = ts
-
-            # Fire dispatcher signal immediately so event entities
-            # receive every alarm regardless of coordinator debouncing.
-            async_dispatcher_send(
-                self.hass,
-                f"{DOMAIN}_alarm_event_{device_id}",
-                {
-                    "evt_code": evt_i,
-                    "nick": nick,
-                    "ts": ts,
-                    "sn": data.get("sN"),
-                    "source_id": data.get("iI"),
-                    "source_type": source_type,
-                    "source_type_label": alarm_source_type_label(source_type),
-                    "alarm_origin": alarm_origin,
-                },
-            )
+        self._dout_router.dispatch(device_id, topic, data, dev_state)
 
         # Persist in runtime state
         self._mqtt_state[device_id] = dev_state
 
-        # Update coordinator.data sofort (Push-Update)
-        cur = dict(self.data or {})
-        cur["mqtt_state"] = dict(self._mqtt_state)
-        cur["firmware_info"] = dict(self._firmware_info)
+        # Push-Update (coalesced per device, see async_mark_device_dirty), but only
+        # if a user-visible field changed; periodic host_stat/host_conf/dev_conf
+        # repeats and QoS1 redeliveries only refresh the bookkeeping keys.
+        # The first live message after a restore always notifies (restored flag).
+        confirmed = device_id in self._restored_state
+        self._restored_state.discard(device_id)
+        if confirmed or _visible_state_changed(prev_state, dev_state):
+            self._push_stats["notified"] += 1
+            self.async_mark_device_dirty(device_id)
+        else:
+            self._push_stats["suppressed"] += 1
 
-        self.async_set_updated_data(cur)
+    # ---------- dout handlers ----------
 
-    async def async_request_parts_list(self, device_id: str, page: int = 1) -> None:
-        """Request the parts/accessories list via MQTT (paginated)."""
-        topic = self.get_mqtt_din_config_topic(device_id)
-        payload_obj = {"m": {"req": {"a": "parts_list", "type": "all", "page": page}}}
-        payload = json.dumps(payload_obj, separators=(",", ":"), ensure_ascii=False)
+    def register_dout_handler(
+        self,
+        kind: str,
+        action: str | None,
+        handler: DoutHandler,
+        *,
+        name: str | None = None,
+    ) -> Callable[[], None]:
+        """Route dout/<kind> messages with m.res.a == action to an extra handler.
 
-        runtime = (self.hass.data.get(DOMAIN) or {}).get(self.entry.entry_id) or {}
-        mqtt = runtime.get("mqtt")
-        if mqtt is None:
-            raise HomeAssistantError("MQTT manager not available")
+        Intended for hub models (e.g. LTE-400, G5-LTE) that publish additional
+        topics/actions. Handlers run in the event loop and mutate dev_state in
+        place. Returns a callable that removes the handler again.
+        """
+        return self._dout_router.register(kind, action, handler, name=name)
+
+    def _register_builtin_dout_handlers(self) -> None:
+        router = self._dout_router
+        router.register("online", None, self._on_dout_online)
+        router.register("config", "host_stat", self._on_dout_host_stat)
+        router.register("config", None, self._on_dout_host_stat, name="config:host_stat")
+        router.register("config", "host_conf", self._on_dout_host_conf)
+        router.register("info", "dev_conf", self._on_dout_dev_conf)
+        router.register("info", None, self._on_dout_dev_conf, name="info:dev_conf")
+        router.register("info", "parts_list", self._on_dout_parts_list)
+        router.register("info", "modify_parts", self._on_dout_modify_parts_ack)
+        router.register("alarm", None, self._on_dout_alarm)
+
+    def dout_handler_stats(self) -> dict[str, Any]:
+        return {**self._dout_router.stats(), "push_updates": dict(self._push_stats)}
+
+    def _on_dout_online(self, device_id: str, dev_state: dict[str, Any], data: dict[str, Any]) -> None:
+        param = str(data.get("param") or "")
+        dev_state["online"] = (param == "1" or param.lower() == "true")
+        dev_state["online_msg"] = data.get("msg")
+
+    def _on_dout_host_stat(self, device_id: str, dev_state: dict[str, Any], res: dict[str, Any]) -> None:
+        dev_state["mode"] = res.get("mode")     # d/a/h/...
+        dev_state["alarm"] = res.get("alarm")   # 0/1
+        dev_state["trig"] = res.get("trig")
+        dev_state["power"] = res.get("power")
+        dev_state["test_mode"] = res.get("test")
+        dev_state["time"] = res.get("time")
+        self._resolve_acks(device_id, "host_stat", res)
+
+    def _on_dout_host_conf(self, device_id: str, dev_state: dict[str, Any], res: dict[str, Any]) -> None:
+        is_conf = res.get("IS")
+        if isinstance(is_conf, dict):
+            dev_state["alarm_volume"] = is_conf.get("v")
+            dev_state["arm_beep"] = is_conf.get("t")
+            dev_state["alarm_duration"] = is_conf.get("tm")
+        delay_conf = res.get("delay")
+        if isinstance(delay_conf, dict):
+            dev_state["exit_delay"] = delay_conf.get("o")
+            dev_state["exit_delay_tone"] = delay_conf.get("ot")
+            dev_state["entry_delay"] = delay_conf.get("i")
+            dev_state["entry_delay_tone"] = delay_conf.get("it")
+        self._resolve_acks(device_id, "host_conf", res)
+
+    def _on_dout_dev_conf(self, device_id: str, dev_state: dict[str, Any], res: dict[str, Any]) -> None:
+        fw = res.get("w_v")
+        if fw and fw != dev_state.get("fw"):
+            # installed version changed (or first seen): fwinfo depends on it
+            self._schedule_firmware_check(device_id)
+        dev_state["tz"] = res.get("tz")
+        dev_state["fw"] = fw
+        dev_state["ip_local"] = res.get("ip")
+        dev_state["qs_d"] = res.get("qs_d")
+        dev_state["qs_p"] = res.get("qs_p")
+
+    def _on_dout_parts_list(self, device_id: str, dev_state: dict[str, Any], res: dict[str, Any]) -> None:
+        self._handle_parts_list_page(device_id, res)
+
+    def _on_dout_modify_parts_ack(self, device_id: str, dev_state: dict[str, Any], res: dict[str, Any]) -> None:
+        # ACK only; state updates come from optimistic local update or DIN EXT processing.
+        self._last_din_tx.pop(device_id, None)
+        self._resolve_acks(device_id, "modify_parts", res)
+        now_mono = time.monotonic()
+        ext_ts = self._last_ext_modify_parts_ts.get(device_id, 0.0)
+        if (now_mono - ext_ts) > _EXT_MODIFY_GRACE_SECONDS:
+            self._schedule_parts_sync(device_id)
+
+    def _on_dout_alarm(self, device_id: str, dev_state: dict[str, Any], data: dict[str, Any]) -> None:
+        """Alarm events (who changed the mode) -> changed_by / triggered_by."""
+        nick = data.get("iN")          # "Home Assistant" / user alias
+        evt = data.get("iE")           # 12 disarm, 13 arm, 14 home arm
+        ts = data.get("tS")            # unix timestamp
+
+        # A jump in the serial sequence means events were missed (e.g. while
+        # disconnected): let the incremental history sync fill the gap.
+        sn = data.get("sN")
+        try:
+            prev_sn = int(dev_state.get("alarm_evt_sn"))
+            gap = int(sn) > prev_sn + 1
+        except (TypeError, ValueError):
+            gap = False
+        if gap:
+            self.logger.debug("Alarm sN gap for %s (%s -> %s); syncing history", device_id, prev_sn, sn)
+            # REST items carry no serial: the gap is bounded by the newest item
+            # known before it (this live event is not merged yet)
+            known = [item for item in dev_state.get("alarm_history") or [] if isinstance(item, dict)]
+            if known:
+                anchor = max(known, key=history_item_time)
+                previous = self._history_gap_anchor.get(device_id)
+                if previous is None or history_item_time(anchor) < history_item_time(previous):
+                    self._history_gap_anchor[device_id] = anchor
+            self.hass.async_create_task(self.async_fetch_alarm_history(device_id))
+
+        # Persist raw event details for debugging / attributes
+        dev_state["alarm_evt_code"] = evt
+        dev_state["alarm_evt_nick"] = nick
+        dev_state["alarm_evt_ts"] = ts
+        dev_state["alarm_evt_sn"] = sn
+
+        # Prepend live event to alarm_history so it appears in
+        # extra_state_attributes immediately (same format as REST items, plus
+        # sN so the REST copy is recognised as the same event) and log it.
+        live_item = {
+            "itemEvent": evt,
+            "itemName": nick or "",
+            "time": ts,
+            "sN": sn,
+            "iI": data.get("iI"),
+            "iT": data.get("iT"),
+        }
+        history, added = merge_alarm_history(
+            dev_state.get("alarm_history") or [], [live_item], _MAX_IN_MEMORY_ALARM_HISTORY
+        )
+        dev_state["alarm_history"] = history
+        dev_state["alarm_history_total"] = dev_state.get("alarm_history_total", len(history)) + added
+        self.entry.async_create_background_task(
+            self.hass, self._async_log_events(device_id, [live_item]), f"{DOMAIN}_event_log_{device_id}"
+        )
 
-        self.logger.debug("MQTT TX dev=%s topic=%s payload=%s", device_id, topic, payload)
-        await mqtt.async_publish(device_id, topic, payload, qos=1, retain=False)
+        # Only treat mode-changing events as "changed_by"
+        mode_map = {12: "d", 13: "a", 14: "h"}
+        try:
+            evt_i = int(evt)
+        except Exception:
+            evt_i = None
+
+        source_type = data.get("iT")
+        trigger_type = dev_state.get("trig")
+        alarm_origin = derive_alarm_origin(
+            event_code=evt_i,
+            trigger_type=trigger_type,
+            source_type=source_type,
+        )
+        dev_state["alarm_origin"] = alarm_origin
+
+        if evt_i in mode_map:
+            if isinstance(nick, str) and nick.strip():
+                dev_state["changed_by"] = nick.strip()
+            dev_state["mode"] = mode_map[evt_i]
+
+        # Trigger events -> triggered_by
+        # iE=11: SOS (app/keyfob), iE=15: tamper, iE=26: sensor trigger
+        if evt_i in TRIGGER_EVENT_CODES:
+            dev_state["triggered_by"] = nick.strip() if isinstance(nick, str) and nick.strip() else None
+            dev_state["triggered_by_id"] = data.get("iI")
+            dev_state["triggered_by_type"] = source_type
+            dev_state["triggered_by_type_label"] = alarm_source_type_label(source_type)
+            dev_state["triggered_at"] = ts
+
+        # Fire dispatcher signal immediately so event entities
+        # receive every alarm regardless of coordinator debouncing.
+        async_dispatcher_send(
+            self.hass,
+            f"{DOMAIN}_alarm_event_{device_id}",
+            {
+                "evt_code": evt_i,
+                "nick": nick,
+                "ts": ts,
+                "sn": data.get("sN"),
+                "source_id": data.get("iI"),
+                "source_type": source_type,
+                "source_type_label": alarm_source_type_label(source_type),
+                "alarm_origin": alarm_origin,
+            },
+        )
 
-    async def async_request_host_conf(self, device_id: str) -> None:
-        """Request the current host configuration via MQTT."""
-        topic = self.get_mqtt_din_config_topic(device_id)
-        payload_obj = {"m": {"req": {"a": "host_conf"}}}
-        payload = json.dumps(payload_obj, separators=(",", ":"), ensure_ascii=False)
+    # ---------- outbound commands ----------
 
+    def _require_mqtt(self) -> Any:
         runtime = (self.hass.data.get(DOMAIN) or {}).get(self.entry.entry_id) or {}
         mqtt = runtime.get("mqtt")
         if mqtt is None:
             raise HomeAssistantError("MQTT manager not available")
+        return mqtt
 
+    async def _async_publish_din(self, device_id: str, payload: str) -> None:
+        """Publish one din/config payload (called by the device's OutboundScheduler)."""
+        mqtt = self._require_mqtt()
+        topic = self.get_mqtt_din_config_topic(device_id)
         self.logger.debug("MQTT TX dev=%s topic=%s payload=%s", device_id, topic, payload)
         await mqtt.async_publish(device_id, topic, payload, qos=1, retain=False)
 
-    async def async_send_host_conf(self, device_id: str, *, volume: int | None = None, arm_beep: int | None = None, alarm_duration: int | None = None) -> None:
-        """Send host configuration changes via MQTT."""
-        # Read current values from mqtt_state so we can send all IS fields
-        dev_state = (self._mqtt_state.get(device_id) or {})
-        cur_v = dev_state.get("alarm_volume", 1)
-        cur_t = dev_state.get("arm_beep", 1)
-        cur_tm = dev_state.get("alarm_duration", 1)
+    def _submit_command(
+        self,
+        device_id: str,
+        lane: Lane,
+        build: Callable[[dict[Any, Any]], dict[str, Any] | None],
+        *,
+        key: str | None = None,
+        changes: dict[Any, Any] | None = None,
+        baseline: dict[Any, Any] | None = None,
+        on_publish: Callable[[], None] | None = None,
+    ) -> asyncio.Future[bool]:
+        """Queue a din command on the device's scheduler and return its completion future."""
+        self._require_mqtt()
+        scheduler = self._outbound.get(device_id)
+        if scheduler is None:
+            scheduler = OutboundScheduler(
+                self.hass,
+                device_id,
+                partial(self._async_publish_din, device_id),
+                self.logger,
+                window=self._outbound_window,
+            )
+            self._outbound[device_id] = scheduler
+        return scheduler.submit(
+            lane, build, key=key, changes=changes, baseline=baseline, on_publish=on_publish
+        )
 
-        v = volume if volume is not None else cur_v
-        t = arm_beep if arm_beep is not None else cur_t
-        tm = alarm_duration if alarm_duration is not None else cur_tm
+    def _unacked_values(self, device_id: str, key: str) -> dict[Any, Any]:
+        """Values of published, not yet answered commands with this key (newer than the reported state)."""
+        scheduler = self._outbound.get(device_id)
+        return scheduler.unacked_values(key) if scheduler is not None else {}
 
-        topic = self.get_mqtt_din_config_topic(device_id)
-        payload_obj = {"m": {"req": {"a": "host_conf", "IS": {"v": v, "t": t, "tm": tm}}}}
-        payload = json.dumps(payload_obj, separators=(",", ":"), ensure_ascii=False)
+    def outbound_stats(self) -> dict[str, Any]:
+        return {device_id: scheduler.stats() for device_id, scheduler in self._outbound.items()}
 
-        runtime = (self.hass.data.get(DOMAIN) or {}).get(self.entry.entry_id) or {}
-        mqtt = runtime.get("mqtt")
-        if mqtt is None:
-            raise HomeAssistantError("MQTT manager not available")
+    async def _async_command(
+        self,
+        device_id: str,
+        lane: Lane,
+        build: Callable[[dict[Any, Any]], dict[str, Any] | None],
+        *,
+        action: str,
+        predicate: Callable[[dict[str, Any]], bool] | None = None,
+        rollback: Callable[[], None] | None = None,
+        key: str | None = None,
+        changes: dict[Any, Any] | None = None,
+        baseline: dict[Any, Any] | None = None,
+        on_queued: Callable[[], None] | None = None,
+    ) -> asyncio.Future[CommandResult]:
+        """Queue a din command and return a future for its dout response.
+
+        Returns once the command was published (publish errors are raised). The
+        returned future resolves with a CommandResult when the matching response
+        arrives, after COMMAND_ACK_TIMEOUT_SECONDS, or immediately when the
+        command was dropped as a no-op. rollback runs on timeout/publish error.
+        """
+        ack = PendingAck(
+            device_id=device_id,
+            action=action,
+            future=self.hass.loop.create_future(),
+            key=key,
+            predicate=predicate,
+            rollback=rollback,
+        )
+        self._pending_acks.setdefault((device_id, action), []).append(ack)
 
-        self.logger.debug("MQTT TX dev=%s topic=%s payload=%s", device_id, topic, payload)
-        await mqtt.async_publish(device_id, topic, payload, qos=1, retain=False)
+        try:
+            sent = self._submit_command(
+                device_id,
+                lane,
+                build,
+                key=key,
+                changes=changes,
+                baseline=baseline,
+                on_publish=partial(self._arm_ack, ack),
+            )
+        except BaseException:
+            # not queued (e.g. MQTT not connected): unregister the ack again
+            self._finish_ack(ack, None)
+            if rollback is not None:
+                rollback()
+            raise
+        if on_queued is not None:
+            on_queued()
+
+        try:
+            published = await sent
+        except BaseException:
+            self._finish_ack(ack, None)
+            if rollback is not None:
+                rollback()
+            raise
+
+        if not published:
+            self._finish_ack(ack, CommandResult(command=action, status="dropped"))
+        return ack.future
+
+    @callback
+    def _arm_ack(self, ack: PendingAck) -> None:
+        """Start the round-trip clock when the command actually goes out."""
+        ack.sent_at = time.monotonic()
+        ack.cancel_timeout = async_call_later(
+            self.hass, COMMAND_ACK_TIMEOUT_SECONDS, partial(self._on_ack_timeout, ack)
+        )
+
+    def _finish_ack(self, ack: PendingAck, result: CommandResult | None) -> None:
+        if ack.cancel_timeout is not None:
+            ack.cancel_timeout()
+            ack.cancel_timeout = None
+        acks = self._pending_acks.get((ack.device_id, ack.action))
+        if acks is not None and ack in acks:
+            acks.remove(ack)
+            if not acks:
+                self._pending_acks.pop((ack.device_id, ack.action), None)
+            if ack.key is not None and ack.sent_at is not None:
+                # answered or given up: the reported state is authoritative again
+                scheduler = self._outbound.get(ack.device_id)
+                if scheduler is not None:
+                    scheduler.settle(ack.key)
+        if ack.future.done():
+            return
+        if result is None:
+            ack.future.cancel()
+        else:
+            ack.future.set_result(result)
+
+    @callback
+    def _on_ack_timeout(self, ack: PendingAck, _now: Any) -> None:
+        ack.cancel_timeout = None
+        self.logger.debug("No %s response from %s within %ss", ack.action, ack.device_id, COMMAND_ACK_TIMEOUT_SECONDS)
+        self._latency_histogram(ack.device_id, ack.action).record_timeout()
+        if ack.rollback is not None:
+            ack.rollback()
+        self._finish_ack(ack, CommandResult(command=ack.action, status="timeout"))
+        self.async_mark_device_dirty(ack.device_id)
+
+    def _resolve_acks(self, device_id: str, action: str, res: dict[str, Any]) -> None:
+        """Resolve published commands answered by this dout response.
+
+        The protocol has no request ids, so every in-flight command of the same
+        action whose predicate accepts the response is resolved by it.
+        """
+        acks = self._pending_acks.get((device_id, action))
+        if not acks:
+            return
+        now = time.monotonic()
+        matched = [ack for ack in acks if ack.matches(res)]
+        for ack in matched:
+            latency = now - ack.sent_at
+            self._latency_histogram(device_id, action).observe(latency * 1000)
+            self._finish_ack(
+                ack,
+                CommandResult(command=action, status="acked", latency=latency, response=dict(res)),
+            )
+        if matched:
+            self.async_mark_device_dirty(device_id)
+
+    def _latency_histogram(self, device_id: str, action: str) -> LatencyHistogram:
+        per_device = self._command_latency.setdefault(device_id, {})
+        hist = per_device.get(action)
+        if hist is None:
+            hist = per_device[action] = LatencyHistogram()
+        return hist
+
+    def get_command_latency(self, device_id: str, action: str) -> LatencyHistogram | None:
+        return (self._command_latency.get(device_id) or {}).get(action)
+
+    def command_latency_stats(self) -> dict[str, Any]:
+        return {
+            device_id: {action: hist.as_dict() for action, hist in per_device.items()}
+            for device_id, per_device in self._command_latency.items()
+        }
+
+    async def async_request_parts_list(self, device_id: str, page: int = 1) -> None:
+        """Request the parts/accessories list via MQTT (paginated)."""
+        payload_obj = {"m": {"req": {"a": "parts_list", "type": "all", "page": page}}}
+
+        # Armed before queueing so a fast response can't race the timer.
+        self._arm_parts_page_timer(device_id, page)
+        try:
+            await self._submit_command(
+                device_id, Lane.BULK, lambda _changes: payload_obj, key=f"parts_list:{page}"
+            )
+        except Exception:
+            self._cancel_parts_page_timer(device_id)
+            raise
+
+    async def async_request_host_conf(self, device_id: str) -> None:
+        """Request the current host configuration via MQTT."""
+        payload_obj = {"m": {"req": {"a": "host_conf"}}}
+        await self._submit_command(device_id, Lane.BULK, lambda _changes: payload_obj, key="host_conf_request")
+
+    async def async_send_host_conf(self, device_id: str, *, volume: int | None = None, arm_beep: int | None = None, alarm_duration: int | None = None) -> asyncio.Future[CommandResult]:
+        """Send host configuration changes via MQTT.
+
+        Pending IS changes are merged; the command is dropped if every field
+        already has the requested value on the device. The returned future
+        resolves with the host_conf response (see _async_command).
+        """
+        dev_state = self._mqtt_state.get(device_id) or {}
+        changes = {
+            field: value
+            for field, value in (("v", volume), ("t", arm_beep), ("tm", alarm_duration))
+            if value is not None
+        }
+        baseline = {
+            "v": dev_state.get("alarm_volume"),
+            "t": dev_state.get("arm_beep"),
+            "tm": dev_state.get("alarm_duration"),
+        }
+
+        def _build(effective: dict[Any, Any]) -> dict[str, Any] | None:
+            if not effective:
+                return None
+            # The hub expects all IS fields: fill the unchanged ones from the latest state,
+            # or from an earlier command the hub has not confirmed yet.
+            cur = self._mqtt_state.get(device_id) or {}
+            is_conf = {
+                "v": cur.get("alarm_volume", 1),
+                "t": cur.get("arm_beep", 1),
+                "tm": cur.get("alarm_duration", 1),
+            }
+            is_conf.update(self._unacked_values(device_id, "host_conf.IS"))
+            is_conf.update(effective)
+            return {"m": {"req": {"a": "host_conf", "IS": is_conf}}}
+
+        return await self._async_command(
+            device_id,
+            Lane.NORMAL,
+            _build,
+            action="host_conf",
+            key="host_conf.IS",
+            changes=changes,
+            baseline={k: baseline[k] for k in changes},
+        )
 
     async def async_send_host_conf_delay(
         self,
@@ -723,7 +1595,7 @@ class DreamcatcherCoordinator(DataUpdateCoordinator[dict[str, Any]]):
         exit_delay_tone: int | None = None,
         entry_delay: int | None = None,
         entry_delay_tone: int | None = None,
-    ) -> None:
+    ) -> asyncio.Future[CommandResult]:
         """Send host_conf delay changes via MQTT.
 
         delay fields:
@@ -734,70 +1606,166 @@ class DreamcatcherCoordinator(DataUpdateCoordinator[dict[str, Any]]):
         """
         dev_state = self._mqtt_state.get(device_id) or {}
 
-        cur_o = dev_state.get("exit_delay", 0)
-        cur_ot = dev_state.get("exit_delay_tone", 1)
-        cur_i = dev_state.get("entry_delay", 0)
-        cur_it = dev_state.get("entry_delay_tone", 1)
-
+        changes: dict[str, int] = {}
         try:
-            o = int(exit_delay if exit_delay is not None else cur_o)
-            ot = int(exit_delay_tone if exit_delay_tone is not None else cur_ot)
-            i = int(entry_delay if entry_delay is not None else cur_i)
-            it = int(entry_delay_tone if entry_delay_tone is not None else cur_it)
+            if exit_delay is not None:
+                changes["o"] = max(0, min(300, int(exit_delay)))
+            if exit_delay_tone is not None:
+                changes["ot"] = 1 if int(exit_delay_tone) else 0
+            if entry_delay is not None:
+                changes["i"] = max(0, min(300, int(entry_delay)))
+            if entry_delay_tone is not None:
+                changes["it"] = 1 if int(entry_delay_tone) else 0
         except (TypeError, ValueError) as err:
             raise HomeAssistantError(f"Invalid delay payload: {err}") from err
 
-        o = max(0, min(300, o))
-        i = max(0, min(300, i))
-        ot = 1 if ot else 0
-        it = 1 if it else 0
-
-        topic = self.get_mqtt_din_config_topic(device_id)
-        payload_obj = {
-            "m": {
-                "req": {
-                    "a": "host_conf",
-                    "delay": {
-                        "o": o,
-                        "ot": ot,
-                        "i": i,
-                        "it": it,
-                    },
-                }
-            }
+        baseline = {
+            "o": dev_state.get("exit_delay"),
+            "ot": dev_state.get("exit_delay_tone"),
+            "i": dev_state.get("entry_delay"),
+            "it": dev_state.get("entry_delay_tone"),
         }
-        payload = json.dumps(payload_obj, separators=(",", ":"), ensure_ascii=False)
 
-        runtime = (self.hass.data.get(DOMAIN) or {}).get(self.entry.entry_id) or {}
-        mqtt = runtime.get("mqtt")
-        if mqtt is None:
-            raise HomeAssistantError("MQTT manager not available")
-
-        self.logger.debug("MQTT TX dev=%s topic=%s payload=%s", device_id, topic, payload)
-        await mqtt.async_publish(device_id, topic, payload, qos=1, retain=False)
+        def _build(effective: dict[Any, Any]) -> dict[str, Any] | None:
+            if not effective:
+                return None
+            # The hub expects all delay fields: fill the unchanged ones from the latest state,
+            # or from an earlier command the hub has not confirmed yet.
+            cur = self._mqtt_state.get(device_id) or {}
+            delay_conf = {
+                "o": cur.get("exit_delay", 0),
+                "ot": cur.get("exit_delay_tone", 1),
+                "i": cur.get("entry_delay", 0),
+                "it": cur.get("entry_delay_tone", 1),
+            }
+            delay_conf.update(self._unacked_values(device_id, "host_conf.delay"))
+            delay_conf.update(effective)
+            return {"m": {"req": {"a": "host_conf", "delay": delay_conf}}}
+
+        return await self._async_command(
+            device_id,
+            Lane.NORMAL,
+            _build,
+            action="host_conf",
+            key="host_conf.delay",
+            changes=changes,
+            baseline={k: baseline[k] for k in changes},
+        )
 
-    async def async_send_test_mode(self, device_id: str, enabled: bool) -> None:
+    async def async_send_test_mode(self, device_id: str, enabled: bool) -> asyncio.Future[CommandResult]:
         """Enable/disable accessories RF test mode via host_stat.test (1/0)."""
-        topic = self.get_mqtt_din_config_topic(device_id)
-        payload_obj = {
-            "m": {
-                "req": {
-                    "a": "host_stat",
-                    "test": 1 if enabled else 0,
-                }
-            }
-        }
-        payload = json.dumps(payload_obj, separators=(",", ":"), ensure_ascii=False)
+        dev_state = self._mqtt_state.get(device_id) or {}
+        test = 1 if enabled else 0
+
+        def _build(effective: dict[Any, Any]) -> dict[str, Any] | None:
+            if "test" not in effective:
+                return None
+            return {"m": {"req": {"a": "host_stat", "test": effective["test"]}}}
+
+        return await self._async_command(
+            device_id,
+            Lane.NORMAL,
+            _build,
+            action="host_stat",
+            predicate=lambda res: str(res.get("test")) == str(test),
+            key="host_stat.test",
+            changes={"test": test},
+            baseline={"test": dev_state.get("test_mode")},
+        )
 
-        runtime = (self.hass.data.get(DOMAIN) or {}).get(self.entry.entry_id) or {}
-        mqtt = runtime.get("mqtt")
-        if mqtt is None:
-            raise HomeAssistantError("MQTT manager not available")
+    @staticmethod
+    def _build_modify_parts(effective: dict[Any, Any]) -> list[dict[str, Any]] | None:
+        """Build modify_parts requests from merged {(part_id, field): value} changes.
 
-        self.logger.debug("MQTT TX dev=%s topic=%s payload=%s", device_id, topic, payload)
-        await mqtt.async_publish(device_id, topic, payload, qos=1, retain=False)
+        All parts go into as few requests as possible (MODIFY_PARTS_BATCH_SIZE each).
+        """
+        parts: dict[int, dict[str, Any]] = {}
+        for (part_id, field), value in effective.items():
+            parts.setdefault(part_id, {"id": part_id})[field] = value
+        if not parts:
+            return None
+        items = list(parts.values())
+        return [
+            {"m": {"req": {"a": "modify_parts", "parts": items[i:i + MODIFY_PARTS_BATCH_SIZE]}}}
+            for i in range(0, len(items), MODIFY_PARTS_BATCH_SIZE)
+        ]
+
+    def _normalize_part_changes(self, device_id: str, changes: list[dict[str, Any]]) -> dict[int, dict[str, int]]:
+        """Validate z/e/ss part changes and merge them per part id (later entries win)."""
+        merged: dict[int, dict[str, int]] = {}
+        for change in changes:
+            try:
+                part_id = int(change["id"])
+                fields = {field: int(change[field]) for field in ("z", "e", "ss") if change.get(field) is not None}
+            except (KeyError, TypeError, ValueError) as err:
+                raise HomeAssistantError(f"Invalid part change {change!r}: {err}") from err
+
+            if self.get_part(device_id, part_id) is None:
+                raise HomeAssistantError(f"Unknown part {part_id} on {device_id}")
+            if "z" in fields and fields["z"] not in (0, 1, 2, 3):
+                raise HomeAssistantError(f"Unsupported zone value: {fields['z']}")
+            for flag in ("e", "ss"):
+                if flag in fields and fields[flag] not in (0, 1):
+                    raise HomeAssistantError(f"Unsupported {flag} value: {fields[flag]}")
+            if not fields:
+                raise HomeAssistantError(f"No z/e/ss change given for part {part_id}")
+
+            merged.setdefault(part_id, {}).update(fields)
+        return merged
+
+    async def async_send_modify_parts(
+        self, device_id: str, changes: list[dict[str, Any]], *, rollback: bool = False
+    ) -> asyncio.Future[CommandResult]:
+        """Change z (zone), e (enabled) and/or ss (SOS) of any number of parts at once.
+
+        changes: [{"id": 3, "z": 2}, {"id": 5, "e": 0, "ss": 1}, ...]
+
+        The changes are applied optimistically as one state update and sent in as
+        few modify_parts requests as possible; the resulting ACKs trigger a single
+        (debounced) parts_list sync. With rollback=True the optimistic update is
+        reverted to the values the device reported if the ACK times out or
+        publishing fails. The future resolves on the first modify_parts ACK.
+        """
+        merged = self._normalize_part_changes(device_id, changes)
+        if not merged:
+            raise HomeAssistantError("No part changes given")
+
+        current: dict[int, dict[str, Any]] = {}
+        for part_id in merged:
+            part = self.get_part(device_id, part_id)
+            current[part_id] = part.as_payload() if part is not None else {}
+        previous = [
+            {"id": part_id, **{f: current[part_id][f] for f in fields if current[part_id].get(f) is not None}}
+            for part_id, fields in merged.items()
+        ]
+
+        @callback
+        def _optimistic_update() -> None:
+            # Optimistic local update so UI reflects the change immediately
+            if self._apply_part_changes(device_id, [{"id": pid, **fields} for pid, fields in merged.items()]):
+                self.async_mark_device_dirty(device_id)
+
+        @callback
+        def _rollback() -> None:
+            if self._apply_part_changes(device_id, previous):
+                self.async_mark_device_dirty(device_id)
+
+        # Baseline is taken before the optimistic update, i.e. what the device reported.
+        return await self._async_command(
+            device_id,
+            Lane.NORMAL,
+            self._build_modify_parts,
+            action="modify_parts",
+            rollback=_rollback if rollback else None,
+            key="modify_parts",
+            changes={(pid, f): v for pid, fields in merged.items() for f, v in fields.items()},
+            baseline={(pid, f): current[pid].get(f) for pid, fields in merged.items() for f in fields},
+            on_queued=_optimistic_update,
+        )
 
-    async def async_send_modify_part_zone(self, device_id: str, part_id: int, zone: int) -> None:
+    async def async_send_modify_part_zone(
+        self, device_id: str, part_id: int, zone: int, *, rollback: bool = False
+    ) -> asyncio.Future[CommandResult]:
         """Set a part/accessory zone via modify_parts.
 
         Zone values:
@@ -809,53 +1777,11 @@ class DreamcatcherCoordinator(DataUpdateCoordinator[dict[str, Any]]):
         if zone not in (0, 1, 2, 3):
             raise HomeAssistantError(f"Unsupported zone value: {zone}")
 
-        topic = self.get_mqtt_din_config_topic(device_id)
-        payload_obj = {
-            "m": {
-                "req": {
-                    "a": "modify_parts",
-                    "parts": [
-                        {
-                            "id": int(part_id),
-                            "z": int(zone),
-                        }
-                    ],
-                }
-            }
-        }
-        payload = json.dumps(payload_obj, separators=(",", ":"), ensure_ascii=False)
-
-        runtime = (self.hass.data.get(DOMAIN) or {}).get(self.entry.entry_id) or {}
-        mqtt = runtime.get("mqtt")
-        if mqtt is None:
-            raise HomeAssistantError("MQTT manager not available")
+        return await self.async_send_modify_parts(device_id, [{"id": part_id, "z": zone}], rollback=rollback)
 
-        # Optimistic local update so UI reflects the selection immediately
-        dev_state = dict(self._mqtt_state.get(device_id) or {})
-        parts = list(dev_state.get("parts") or [])
-        changed = False
-        for index, part in enumerate(parts):
-            if not isinstance(part, dict):
-                continue
-            if part.get("id") == part_id:
-                updated = dict(part)
-                updated["z"] = int(zone)
-                parts[index] = updated
-                changed = True
-                break
-
-        if changed:
-            dev_state["parts"] = parts
-            self._mqtt_state[device_id] = dev_state
-            cur = dict(self.data or {})
-            cur["mqtt_state"] = dict(self._mqtt_state)
-            cur["firmware_info"] = dict(self._firmware_info)
-            self.async_set_updated_data(cur)
-
-        self.logger.debug("MQTT TX dev=%s topic=%s payload=%s", device_id, topic, payload)
-        await mqtt.async_publish(device_id, topic, payload, qos=1, retain=False)
-
-    async def async_send_modify_part_enabled(self, device_id: str, part_id: int, enabled: bool) -> None:
+    async def async_send_modify_part_enabled(
+        self, device_id: str, part_id: int, enabled: bool, *, rollback: bool = False
+    ) -> asyncio.Future[CommandResult]:
         """Enable/disable a part/accessory via modify_parts.
 
         Important:
@@ -863,126 +1789,29 @@ class DreamcatcherCoordinator(DataUpdateCoordinator[dict[str, Any]]):
         - e=0 -> disabled (off)
         - e=1 -> enabled (on)
         """
-        e_value = 1 if enabled else 0
-
-        topic = self.get_mqtt_din_config_topic(device_id)
-        payload_obj = {
-            "m": {
-                "req": {
-                    "a": "modify_parts",
-                    "parts": [
-                        {
-                            "id": int(part_id),
-                            "e": int(e_value),
-                        }
-                    ],
-                }
-            }
-        }
-        payload = json.dumps(payload_obj, separators=(",", ":"), ensure_ascii=False)
-
-        runtime = (self.hass.data.get(DOMAIN) or {}).get(self.entry.entry_id) or {}
-        mqtt = runtime.get("mqtt")
-        if mqtt is None:
-            raise HomeAssistantError("MQTT manager not available")
-
-        # Optimistic local update so UI reflects the switch immediately
-        dev_state = dict(self._mqtt_state.get(device_id) or {})
-        parts = list(dev_state.get("parts") or [])
-        changed = False
-        for index, part in enumerate(parts):
-            if not isinstance(part, dict):
-                continue
-            if part.get("id") == part_id:
-                updated = dict(part)
-                updated["e"] = int(e_value)
-
-                # Keep c bitfield in sync when present (status bit is bit 7).
-                c_val = updated.get("c")
-                if c_val is not None:
-                    try:
-                        c_int = int(c_val)
-                        if enabled:
-                            c_int = c_int | 0x80
-                        else:
-                            c_int = c_int & 0x7F
-                        updated["c"] = c_int
-                    except (ValueError, TypeError):
-                        pass
-
-                parts[index] = updated
-                changed = True
-                break
-
-        if changed:
-            dev_state["parts"] = parts
-            self._mqtt_state[device_id] = dev_state
-            cur = dict(self.data or {})
-            cur["mqtt_state"] = dict(self._mqtt_state)
-            cur["firmware_info"] = dict(self._firmware_info)
-            self.async_set_updated_data(cur)
-
-        self.logger.debug("MQTT TX dev=%s topic=%s payload=%s", device_id, topic, payload)
-        await mqtt.async_publish(device_id, topic, payload, qos=1, retain=False)
+        return await self.async_send_modify_parts(
+            device_id, [{"id": part_id, "e": 1 if enabled else 0}], rollback=rollback
+        )
 
-    async def async_send_modify_part_sos(self, device_id: str, part_id: int, sos_enabled: bool) -> None:
+    async def async_send_modify_part_sos(
+        self, device_id: str, part_id: int, sos_enabled: bool, *, rollback: bool = False
+    ) -> asyncio.Future[CommandResult]:
         """Enable/disable SOS for a keyfob/remote via modify_parts.ss.
 
         Observed/expected mapping:
         - ss=0 -> SOS disabled
         - ss=1 -> SOS enabled
         """
-        ss_value = 1 if sos_enabled else 0
-
-        topic = self.get_mqtt_din_config_topic(device_id)
-        payload_obj = {
-            "m": {
-                "req": {
-                    "a": "modify_parts",
-                    "parts": [
-                        {
-                            "id": int(part_id),
-                            "ss": int(ss_value),
-                        }
-                    ],
-                }
-            }
-        }
-        payload = json.dumps(payload_obj, separators=(",", ":"), ensure_ascii=False)
-
-        runtime = (self.hass.data.get(DOMAIN) or {}).get(self.entry.entry_id) or {}
-        mqtt = runtime.get("mqtt")
-        if mqtt is None:
-            raise HomeAssistantError("MQTT manager not available")
-
-        # Optimistic local update so UI reflects the switch immediately
-        dev_state = dict(self._mqtt_state.get(device_id) or {})
-        parts = list(dev_state.get("parts") or [])
-        changed = False
-        for index, part in enumerate(parts):
-            if not isinstance(part, dict):
-                continue
-            if part.get("id") == part_id:
-                updated = dict(part)
-                updated["ss"] = int(ss_value)
-                parts[index] = updated
-                changed = True
-                break
-
-        if changed:
-            dev_state["parts"] = parts
-            self._mqtt_state[device_id] = dev_state
-            cur = dict(self.data or {})
-            cur["mqtt_state"] = dict(self._mqtt_state)
-            cur["firmware_info"] = dict(self._firmware_info)
-            self.async_set_updated_data(cur)
-
-        self.logger.debug("MQTT TX dev=%s topic=%s payload=%s", device_id, topic, payload)
-        await mqtt.async_publish(device_id, topic, payload, qos=1, retain=False)
+        return await self.async_send_modify_parts(
+            device_id, [{"id": part_id, "ss": 1 if sos_enabled else 0}], rollback=rollback
+        )
 
-    async def async_send_alarm_command(self, device_id: str, command: str, code: str | None = None) -> None:
+    async def async_send_alarm_command(self, device_id: str, command: str, code: str | None = None) -> asyncio.Future[CommandResult]:
         """Send alarm mode changes via MQTT using the existing per-device connection.
 
+        Returns once published; the returned future resolves when the hub
+        reports the new mode in a host_stat response (end-to-end arming time).
+
         Supported modes:
         - d: disarm
         - a: arm away
@@ -1010,62 +1839,299 @@ class DreamcatcherCoordinator(DataUpdateCoordinator[dict[str, Any]]):
         ts = int(dt_util.utcnow().timestamp())
         payload_obj = {"m":{"req":{"a":"host_stat","src":0,"uID":uid_int,"usr":usr,"mode":mode,"nick":nick,"time":ts}}}
 
-        topic = self.get_mqtt_din_config_topic(device_id)
-        payload = json.dumps(payload_obj, separators=(",", ":"), ensure_ascii=False)
-
-        runtime = (self.hass.data.get(DOMAIN) or {}).get(self.entry.entry_id) or {}
-        mqtt = runtime.get("mqtt")
-        if mqtt is None:
-            raise HomeAssistantError("MQTT manager not available")
-
-        self.logger.debug("MQTT TX dev=%s topic=%s payload=%s", device_id, topic, payload)
-        await mqtt.async_publish(device_id, topic, payload, qos=1, retain=False)
+        if mode == "s":
+            # SOS: accept the hub reporting an active alarm (mode itself may not change)
+            predicate = lambda res: str(res.get("alarm")) == "1" or res.get("mode") == "s"  # noqa: E731
+        else:
+            predicate = lambda res: res.get("mode") == mode  # noqa: E731
+
+        # Priority lane: never queued behind settings or parts_list refreshes, never coalesced.
+        return await self._async_command(
+            device_id,
+            Lane.PRIORITY,
+            lambda _changes: payload_obj,
+            action="host_stat",
+            predicate=predicate,
+        )
 
     async def async_fetch_alarm_history(self, device_id: str, page_size: int = 50) -> None:
-        """Fetch alarm history from REST API and store in mqtt_state."""
-        try:
-            await self._ensure_login()
-        except Exception:
-            self.logger.warning("Cannot fetch alarm history: login failed")
-            return
+        """Fetch alarm history from REST API and store in mqtt_state.
 
+        Calls for a device while a fetch is running (history button, event entity
+        setup, reconnect) wait for that fetch instead of starting another one.
+        """
+        task = self._history_tasks.get(device_id)
+        if task is None or task.done():
+            task = self._history_tasks[device_id] = self.hass.async_create_task(
+                self._async_fetch_alarm_history(device_id, page_size)
+            )
+        await asyncio.shield(task)
+
+    async def _async_fetch_alarm_history(self, device_id: str, page_size: int) -> None:
+        # A gap reported while a sync runs (its pages may predate the gap) triggers one more pass.
+        while True:
+            anchor = self._history_gap_anchor.pop(device_id, None)
+            await self._async_sync_alarm_history(device_id, page_size, anchor)
+            if device_id not in self._history_gap_anchor:
+                return
+
+    async def _async_sync_alarm_history(
+        self, device_id: str, page_size: int, gap_anchor: dict[str, Any] | None
+    ) -> None:
+        """Read history pages newest first until known items are reached and merge them.
+
+        Normally paging stops at the first known item or at one older than the
+        newest known item, so a regular sync costs one request and reads at most
+        HISTORY_SYNC_MAX_PAGES. For a gap fill (gap_anchor set: the newest item
+        known before the live serials jumped) items newer than the anchor are
+        not a stop signal, since post-gap live events are already known; paging
+        goes on until the anchor itself or an older item is reached.
+        """
         dev = self._get_device(device_id)
         dev_id_int = dev.get("devIdInt")
         if not dev_id_int:
             self.logger.warning("Cannot fetch alarm history: no devIdInt for %s", device_id)
             return
 
-        # Use per-device dm endpoint, fall back to am endpoint from config entry
-        dm = dev.get("dm") or {}
-        dm_domain = dm.get("domain")
-        dm_port = dm.get("port")
-        if dm_domain and dm_port:
-            base_url = f"https://{dm_domain}:{dm_port}"
-        else:
-            d = self.entry.data
-            base_url = f"https://{d[CONF_AM_DOMAIN]}:{d[CONF_AM_PORT]}"
+        base_url = self._dm_base_url(dev)
+
+        known = [item for item in (self._mqtt_state.get(device_id) or {}).get("alarm_history") or [] if isinstance(item, dict)]
+        known_keys = {history_item_key(item) for item in known}
+        watermark_time = max((history_item_time(item) for item in known), default=None)
+
+        def _reached(item: dict[str, Any]) -> bool:
+            if gap_anchor is not None:
+                return history_items_match(item, gap_anchor) or history_item_time(item) < history_item_time(gap_anchor)
+            if history_item_key(item) in known_keys:
+                return True
+            return watermark_time is not None and history_item_time(item) < watermark_time
+
+        max_pages = None if gap_anchor is not None else HISTORY_SYNC_MAX_PAGES
+        fetched: list[dict[str, Any]] = []
+        total: int | None = None
+        offset = 0
+        pages = 0
+        while max_pages is None or pages < max_pages:
+            pages += 1
+            try:
+                result = await self._async_call_authed(
+                    lambda token, offset=offset: self.api.alarm_history(
+                        base_url=base_url,
+                        token=token,
+                        dev_id_int=int(dev_id_int),
+                        offset=offset,
+                        page_size=page_size,
+                    )
+                )
+            except Exception as err:
+                self.logger.warning("Alarm history fetch failed for %s: %s", device_id, err)
+                break
 
-        try:
-            result = await self.api.alarm_history(
-                base_url=base_url,
-                token=self.token,
-                dev_id_int=int(dev_id_int),
-                page_size=page_size,
-            )
-        except Exception as err:
-            self.logger.warning("Alarm history fetch failed for %s: %s", device_id, err)
-            return
+            items = [item for item in (result.get("items") or []) if isinstance(item, dict)]
+            total = result.get("total", total)
+            fetched.extend(items)
+            offset += len(items)
 
-        items = result.get("items", [])
-        total = result.get("total", 0)
+            # the first sync (nothing known yet) reads a single page
+            if not known or any(_reached(item) for item in items) or len(items) < page_size:
+                break
+            if isinstance(total, int) and offset >= total:
+                break
+
+        if not fetched and total is None:
+            return
+        await self._async_log_events(device_id, fetched)
 
+        # Re-read: live events may have arrived while the pages were loading.
         dev_state = dict(self._mqtt_state.get(device_id) or {})
-        dev_state["alarm_history"] = items
-        dev_state["alarm_history_total"] = total
+        history, added = merge_alarm_history(
+            dev_state.get("alarm_history") or [], fetched, _MAX_IN_MEMORY_ALARM_HISTORY
+        )
+        self.logger.debug(
+            "Alarm history sync for %s: %d fetched, %d new (offset %d)", device_id, len(fetched), added, offset
+        )
+        if not added and total == dev_state.get("alarm_history_total"):
+            return
+
+        dev_state["alarm_history"] = history
+        if total is not None:
+            dev_state["alarm_history_total"] = total
         self._mqtt_state[device_id] = dev_state
 
         # Push update
-        cur = dict(self.data or {})
-        cur["mqtt_state"] = dict(self._mqtt_state)
-        cur["firmware_info"] = dict(self._firmware_info)
-        self.async_set_updated_data(cur)
+        self.async_mark_device_dirty(device_id)
+
+    # ---------- alarm event log ----------
+
+    async def _async_log_events(self, device_id: str, items: list[dict[str, Any]]) -> None:
+        try:
+            await self._event_log.async_append(device_id, items)
+        except OSError as err:
+            self.logger.warning("Cannot write alarm event log for %s: %s", device_id, err)
+
+    def async_iter_logged_history(
+        self, device_id: str, start: int | None = None, end: int | None = None
+    ) -> AsyncIterator[list[dict[str, Any]]]:
+        """Logged history items in [start, end], oldest first, page by page."""
+        self._get_device(device_id)
+        return self._event_log.async_iter_pages(device_id, start, end)
+
+    async def async_get_history(self, device_id: str, *, offset: int = 0, limit: int = 50) -> dict[str, Any]:
+        """A page of the alarm history, newest first (served on demand instead of as state attributes)."""
+        self._get_device(device_id)
+        items, total = await self._event_log.async_read_latest(device_id, offset, limit)
+        if not total:
+            # event log not written (yet): newest items kept in memory
+            history = (self._mqtt_state.get(device_id) or {}).get("alarm_history") or []
+            items, total = history[offset : offset + limit], len(history)
+        return {
+            "total": total,
+            "offset": offset,
+            "events": [format_history_item(item) for item in items],
+        }
+
+    async def async_query_history(self, device_id: str, query: HistoryQuery) -> dict[str, Any]:
+        """Filter and aggregate the logged alarm history of a device."""
+        self._get_device(device_id)
+        raw, names = await self._event_log.async_read_raw(device_id, query.start, query.end)
+        return await self.hass.async_add_executor_job(
+            run_history_query, raw, names, query, dt_util.get_default_time_zone()
+        )
+
+    # ---------- full history backfill ----------
+
+    async def _async_load_backfill_progress(self) -> dict[str, BackfillProgress]:
+        if self._backfill_progress is None:
+            stored = await self._backfill_store.async_load()
+            devices = stored.get("devices") if isinstance(stored, dict) else None
+            if self._backfill_progress is None:
+                self._backfill_progress = {
+                    device_id: BackfillProgress.from_json(item)
+                    for device_id, item in (devices if isinstance(devices, dict) else {}).items()
+                    if isinstance(item, dict)
+                }
+        return self._backfill_progress
+
+    @callback
+    def _backfill_data(self) -> dict[str, Any]:
+        return {"devices": {device_id: p.as_json() for device_id, p in (self._backfill_progress or {}).items()}}
+
+    @callback
+    def _save_backfill_progress(self) -> None:
+        self._backfill_store.async_delay_save(self._backfill_data, RUNTIME_SNAPSHOT_SAVE_DELAY)
+
+    async def async_start_history_backfill(self, device_id: str, *, restart: bool = False) -> dict[str, Any]:
+        """Start (or resume) copying the complete alarm history of a device into the history store.
+
+        Returns the current progress; a running backfill is left alone. After a
+        finished backfill only newer events are read; restart discards the
+        completed chunks and walks the whole history again.
+        """
+        self._get_device(device_id)
+        progress_by_device = await self._async_load_backfill_progress()
+        progress = progress_by_device.get(device_id)
+        task = self._backfill_tasks.get(device_id)
+        if task is not None and not task.done():
+            return {**progress.as_dict(), "running": True} if progress else {"running": True}
+
+        if progress is None or restart:
+            progress = progress_by_device[device_id] = BackfillProgress(page_size=HISTORY_BACKFILL_PAGE_SIZE)
+        self._backfill_tasks[device_id] = self.entry.async_create_background_task(
+            self.hass,
+            self._async_run_backfill(device_id, progress),
+            f"{DOMAIN}_history_backfill_{device_id}",
+        )
+        return {**progress.as_dict(), "running": True}
+
+    async def async_resume_history_backfills(self) -> None:
+        """Restart backfills that were interrupted by a restart or a failure."""
+        progress_by_device = await self._async_load_backfill_progress()
+        device_ids = set(self.get_device_ids())
+        for device_id, progress in progress_by_device.items():
+            if not progress.finished and device_id in device_ids:
+                await self.async_start_history_backfill(device_id)
+
+    async def _async_run_backfill(self, device_id: str, progress: BackfillProgress) -> None:
+        try:
+            await self._async_backfill(device_id, progress)
+        except asyncio.CancelledError:
+            raise
+        except Exception as err:
+            # completed chunks are kept; the next start (or HA restart) resumes from there
+            self.logger.warning("Alarm history backfill failed for %s: %s", device_id, err)
+        finally:
+            self._backfill_tasks.pop(device_id, None)
+
+    def _history_page_fetcher(self, device_id: str) -> PageFetcher | None:
+        """fetch(offset, page_size) for the REST alarm history of a device (None without devIdInt)."""
+        dev = self._get_device(device_id)
+        dev_id_int = dev.get("devIdInt")
+        if not dev_id_int:
+            return None
+        base_url = self._dm_base_url(dev)
+
+        async def _fetch(offset: int, page_size: int) -> dict[str, Any]:
+            return await self._async_call_authed(
+                lambda token: self.api.alarm_history(
+                    base_url=base_url,
+                    token=token,
+                    dev_id_int=int(dev_id_int),
+                    offset=offset,
+                    page_size=page_size,
+                )
+            )
+
+        return _fetch
+
+    async def _async_backfill(self, device_id: str, progress: BackfillProgress) -> None:
+        fetch = self._history_page_fetcher(device_id)
+        if fetch is None:
+            self.logger.warning("Cannot backfill alarm history: no devIdInt for %s", device_id)
+            return
+
+        backfill = HistoryBackfill(
+            device_id=device_id,
+            fetch=fetch,
+            event_log=self._event_log,
+            progress=progress,
+            on_progress=self._save_backfill_progress,
+            concurrency=HISTORY_BACKFILL_CONCURRENCY,
+            limiter=self._backfill_limiter,
+            logger=self.logger,
+        )
+        await backfill.run()
+
+    async def async_iter_cloud_history(
+        self, device_id: str, page_size: int = HISTORY_BACKFILL_PAGE_SIZE
+    ) -> AsyncIterator[list[dict[str, Any]]]:
+        """REST alarm history pages, newest first; pages are also written to the event log.
+
+        Requests share the backfill rate limit. Items repeated because new
+        events shifted the offsets are skipped.
+        """
+        fetch = self._history_page_fetcher(device_id)
+        if fetch is None:
+            raise HomeAssistantError(f"No devIdInt for {device_id}; cannot read alarm history")
+
+        offset = 0
+        previous: set[tuple[Any, ...]] = set()
+        while True:
+            await self._backfill_limiter.acquire()
+            result = await fetch(offset, page_size)
+            items = [item for item in (result.get("items") or []) if isinstance(item, dict)]
+            offset += len(items)
+            keys = {history_item_key(item) for item in items}
+            page = [item for item in items if history_item_key(item) not in previous]
+            previous = keys
+            if page:
+                await self._async_log_events(device_id, page)
+                yield page
+            total = result.get("total")
+            if len(items) < page_size or (isinstance(total, int) and offset >= total):
+                return
+
+    def history_backfill_stats(self) -> dict[str, Any]:
+        return {
+            device_id: {**progress.as_dict(), "running": device_id in self._backfill_tasks}
+            for device_id, progress in (self._backfill_progress or {}).items()
+        }
@@ -0,0 +1,29 @@
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .const import DOMAIN
+from .coordinator import DreamcatcherCoordinator
+
+
+async def async_get_config_entry_diagnostics(hass: HomeAssistant, entry: ConfigEntry) -> dict[str, Any]:
+    """Return runtime counters of the integration (no credentials or tokens)."""
+    runtime = (hass.data.get(DOMAIN) or {}).get(entry.entry_id) or {}
+    coordinator: DreamcatcherCoordinator | None = runtime.get("coordinator")
+    if coordinator is None:
+        return {}
+
+    return {
+        "devices": len(coordinator.get_device_ids()),
+        "auth": coordinator.auth_stats(),
+        "device_list_refresh": coordinator.refresh_stats(),
+        "rest": coordinator.api.stats(),
+        "dout_handlers": coordinator.dout_handler_stats(),
+        "outbound": coordinator.outbound_stats(),
+        "command_latency": coordinator.command_latency_stats(),
+        "firmware_checks": coordinator.firmware_check_stats(),
+        "history_backfill": coordinator.history_backfill_stats(),
+    }
@@ -6,81 +6,37 @@ from typing import Any
 from homeassistant.components.event import EventEntity
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant, callback
-from homeassistant.helpers import entity_platform
 from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entity import DeviceInfo
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from .const import DOMAIN
 from .coordinator import DreamcatcherCoordinator
-
-# itemEvent / iE code → event type string
-# Source: DreamCatcher Life APK – Config.EventEnum
-EVENT_CODE_MAP: dict[int, str] = {
-    10: "normal_alarm",
-    11: "sos",
-    12: "disarmed",
-    13: "armed",
-    14: "armed_home",
-    15: "tamper",
-    16: "low_battery",
-    17: "duress_alarm",
-    18: "offline",
-    19: "line_cut",
-    20: "ac_power_lost",
-    21: "ac_power_restored",
-    23: "above_limit",
-    24: "below_limit",
-    25: "deviation",
-    26: "sensor_triggered",
-    27: "schedule_alarm",
-    30: "door_open",
-    31: "door_closed",
-    40: "smoke_detected",
-    41: "alarm_test",
-    42: "system_fault",
-    43: "sensor_end_of_life",
-    53: "rf_interference",
-    54: "chime",
-    55: "door_unlocked",
-}
+from .utils import EVENT_CODE_MAP
 
 EVENT_TYPES: list[str] = list(EVENT_CODE_MAP.values())
 
 
-async def async_setup_entry(
-    hass: HomeAssistant, entry: ConfigEntry, async_add_entities
-) -> None:
+async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry, async_add_entities) -> None:
     coordinator: DreamcatcherCoordinator = hass.data[DOMAIN][entry.entry_id]["coordinator"]
 
     if coordinator.data is None:
         await coordinator.async_config_entry_first_refresh()
 
-    known: set[str] = set()
-    entities: list[ChuangoAlarmEvent] = []
-
-    for dev_id in coordinator.get_device_ids():
-        known.add(dev_id)
-        entities.append(ChuangoAlarmEvent(coordinator, entry, dev_id))
-
-    async_add_entities(entities)
+    def _device_entities(dev_id: str) -> list[ChuangoAlarmEvent]:
+        return [
+            ChuangoAlarmEvent(coordinator, entry, dev_id),
+        ]
 
-    platform = entity_platform.async_get_current_platform()
+    async_add_entities([e for dev_id in coordinator.get_device_ids() for e in _device_entities(dev_id)])
 
     @callback
-    def _on_update() -> None:
-        now_ids = set(coordinator.get_device_ids())
-        new = [
-            ChuangoAlarmEvent(coordinator, entry, d)
-            for d in now_ids
-            if d not in known
-        ]
-        for e in new:
-            known.add(e.device_id)
-        if new:
-            hass.async_create_task(platform.async_add_entities(new))
+    def _on_devices_added(device_ids: list[str]) -> None:
+        async_add_entities([e for dev_id in device_ids for e in _device_entities(dev_id)])
 
-    coordinator.async_add_listener(_on_update)
+    entry.async_on_unload(
+        async_dispatcher_connect(hass, coordinator.signal_devices_added, _on_devices_added)
+    )
 
 
 class ChuangoAlarmEvent(
@@ -92,6 +48,8 @@ class ChuangoAlarmEvent(
     _attr_translation_key = "alarm_event"
     _attr_icon = "mdi:history"
     _attr_event_types = EVENT_TYPES
+    # summary changes with every event; the events themselves are recorded as state
+    _unrecorded_attributes = frozenset({"history_total", "latest_event", "latest_event_time"})
 
     def __init__(
         self,
@@ -99,14 +57,12 @@ class ChuangoAlarmEvent(
         entry: ConfigEntry,
         device_id: str,
     ) -> None:
-        super().__init__(coordinator)
+        super().__init__(coordinator, context=device_id)
         self._entry = entry
         self.device_id = device_id
         self._attr_unique_id = f"{entry.entry_id}_{device_id}_alarm_event"
         self._last_sn: int | None = None
         self._history_initial_fired: bool = False
-        self._history_cache_key: tuple[int, int, Any, Any] | None = None
-        self._history_cache_value: dict[str, Any] | None = None
 
     # ---- device linkage ----
 
@@ -132,45 +88,28 @@ class ChuangoAlarmEvent(
             return st if isinstance(st, dict) else {}
         return {}
 
-    # ---- history as extra attributes ----
+    # ---- history summary as extra attributes ----
+    # The history itself is served on demand (chuango_alarm.get_history service,
+    # chuango_alarm/history websocket command); only a summary is kept here.
 
     @property
     def extra_state_attributes(self) -> dict[str, Any]:
         st = self._st
         history = st.get("alarm_history")
-        if not isinstance(history, list):
+        if not isinstance(history, list) or not history:
             return {"history_total": 0}
 
-        total = st.get("alarm_history_total", len(history))
-        first_item = history[0] if history else None
-        first_time = first_item.get("time") if isinstance(first_item, dict) else None
-        first_event = first_item.get("itemEvent") if isinstance(first_item, dict) else None
-        cache_key = (len(history), int(total) if isinstance(total, int) else len(history), first_time, first_event)
-        if self._history_cache_key == cache_key and self._history_cache_value is not None:
-            return self._history_cache_value
-
-        formatted: list[dict[str, Any]] = []
-        for item in history[:50]:
-            evt_code = item.get("itemEvent")
-            try:
-                evt_i = int(evt_code)
-            except (TypeError, ValueError):
-                evt_i = None
-            evt_type = EVENT_CODE_MAP.get(evt_i, f"unknown_{evt_code}")
-            formatted.append(
-                {
-                    "type": evt_type,
-                    "name": item.get("itemName", ""),
-                    "time": item.get("time"),
-                }
-            )
-        result = {
-            "history": formatted,
-            "history_total": total,
+        latest = history[0]
+        evt_code = latest.get("itemEvent")
+        try:
+            evt_i = int(evt_code)
+        except (TypeError, ValueError):
+            evt_i = None
+        return {
+            "history_total": st.get("alarm_history_total", len(history)),
+            "latest_event": EVENT_CODE_MAP.get(evt_i, f"unknown_{evt_code}"),
+            "latest_event_time": latest.get("time"),
         }
-        self._history_cache_key = cache_key
-        self._history_cache_value = result
-        return result
 
     # ---- lifecycle ----
 
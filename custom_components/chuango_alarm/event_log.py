@@ -0,0 +1,415 @@
+"""On-disk alarm event log per device (append-only, fixed-width binary records).
+
+Files in <config>/.storage/chuango_alarm/history/<entry_id>/<device_id>/:
+
+- active.log: the newest records in arrival order (at most SEGMENT_RECORDS)
+- NNNNNN.seg: sealed segments, sorted by time, written once when the active
+  log is full and read through mmap
+- names.jsonl: interned item names, one JSON string per line (id = line number)
+
+Every SPARSE_STRIDE-th time of a sealed segment is kept in memory, so a time
+range query bisects that index and reads only the matching records. Duplicates
+(live and REST copy of an event, overlapping backfill pages) are detected by
+looking up records with the same time and comparing code, serial, source and
+name (see EventRecord.same_event). All file IO runs in the executor, one job at
+a time per device.
+"""
+from __future__ import annotations
+
+import asyncio
+from bisect import bisect_left
+from collections.abc import AsyncIterator, Iterator
+import glob
+import heapq
+from itertools import dropwhile, islice, takewhile
+import json
+import mmap
+import os
+import shutil
+import struct
+from typing import Any, NamedTuple
+
+from homeassistant.core import HomeAssistant
+
+from .const import DOMAIN
+from .utils import history_item_sn, history_item_time
+
+SEGMENT_RECORDS = 8192
+SPARSE_STRIDE = 64
+
+# time, serial, source id, event code, source type, name id (-1 = unknown), padded to 32 bytes
+RECORD = struct.Struct("<qqihhi4x")
+_TIME = struct.Struct("<q")
+
+_ACTIVE_FILE = "active.log"
+_NAMES_FILE = "names.jsonl"
+
+class EventRecord(NamedTuple):
+    time: int
+    serial: int
+    source_id: int
+    event: int
+    source_type: int
+    name_id: int
+
+    def same_event(self, other: EventRecord) -> bool:
+        """Same time and code; serial, source and name have to match where both records know them.
+
+        A live event and its REST copy (no serial, no source) are the same event;
+        different sensors firing in the same second are not.
+        """
+        return (
+            self.time == other.time
+            and self.event == other.event
+            and all(
+                mine < 0 or theirs < 0 or mine == theirs
+                for mine, theirs in (
+                    (self.serial, other.serial),
+                    (self.source_id, other.source_id),
+                    (self.source_type, other.source_type),
+                    (self.name_id, other.name_id),
+                )
+            )
+        )
+
+    def as_item(self, names: list[str]) -> dict[str, Any]:
+        """History item in the REST/live format used throughout the integration."""
+        item: dict[str, Any] = {
+            "itemEvent": self.event if self.event >= 0 else None,
+            "itemName": names[self.name_id] if 0 <= self.name_id < len(names) else "",
+            "time": self.time,
+        }
+        if self.serial >= 0:
+            item["sN"] = self.serial
+        if self.source_id >= 0:
+            item["iI"] = self.source_id
+        if self.source_type >= 0:
+            item["iT"] = self.source_type
+        return item
+
+
+def _bounded_int(value: Any, bits: int) -> int:
+    """Non-negative int that fits the signed field, else -1."""
+    try:
+        number = int(value)
+    except (TypeError, ValueError):
+        return -1
+    return number if 0 <= number < 1 << (bits - 1) else -1
+
+
+class _Segment:
+    """A sealed, time-sorted segment read through mmap."""
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.count = os.path.getsize(path) // RECORD.size
+        self._mm: mmap.mmap | None = None
+        self.sparse: list[int] = []
+        self.min_time = self.max_time = 0
+        if self.count:
+            with open(path, "rb") as fh:
+                self._mm = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+            self.sparse = [self._time_at(i) for i in range(0, self.count, SPARSE_STRIDE)]
+            self.min_time = self.sparse[0]
+            self.max_time = self._time_at(self.count - 1)
+
+    def _time_at(self, index: int) -> int:
+        return _TIME.unpack_from(self._mm, index * RECORD.size)[0]
+
+    def _lower_bound(self, start: int) -> int:
+        # sparse[block - 1] < start, so the first match is within one stride from there
+        block = bisect_left(self.sparse, start)
+        pos = max(0, block - 1) * SPARSE_STRIDE
+        while pos < self.count and self._time_at(pos) < start:
+            pos += 1
+        return pos
+
+    def _bounds(self, start: int | None, end: int | None) -> tuple[int, int]:
+        if not self.count or (start is not None and start > self.max_time) or (end is not None and end < self.min_time):
+            return 0, 0
+        lo = 0 if start is None else self._lower_bound(start)
+        hi = self.count if end is None else self._lower_bound(end + 1)
+        return lo, hi
+
+    def iter_range(self, start: int | None, end: int | None, reverse: bool = False) -> Iterator[EventRecord]:
+        lo, hi = self._bounds(start, end)
+        for pos in range(hi - 1, lo - 1, -1) if reverse else range(lo, hi):
+            yield EventRecord._make(RECORD.unpack_from(self._mm, pos * RECORD.size))
+
+    def range_bytes(self, start: int | None, end: int | None) -> bytes:
+        lo, hi = self._bounds(start, end)
+        return self._mm[lo * RECORD.size : hi * RECORD.size] if hi > lo else b""
+
+    def close(self) -> None:
+        if self._mm is not None:
+            self._mm.close()
+            self._mm = None
+
+
+class _DeviceLog:
+    """Event log of one device; only used from the executor."""
+
+    def __init__(self, directory: str) -> None:
+        self._dir = directory
+        self._segments: list[_Segment] = []
+        self._active: list[EventRecord] = []
+        self._active_by_time: dict[int, list[EventRecord]] = {}
+        self.names: list[str] = []
+        self._name_ids: dict[str, int] = {}
+        self._pending_names: list[str] = []
+        self._load()
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self._dir, name)
+
+    def _load(self) -> None:
+        names_path = self._path(_NAMES_FILE)
+        if os.path.exists(names_path):
+            with open(names_path, "rb+") as fh:
+                data = fh.read()
+                complete = data.rfind(b"\n") + 1
+                if complete != len(data):
+                    fh.truncate(complete)  # torn last line after a crash
+            for line in data[:complete].decode("utf-8").splitlines():
+                self._name_ids.setdefault(name := json.loads(line), len(self.names))
+                self.names.append(name)
+
+        for path in sorted(glob.glob(self._path("*.seg"))):
+            self._segments.append(_Segment(path))
+
+        active_path = self._path(_ACTIVE_FILE)
+        if os.path.exists(active_path):
+            with open(active_path, "rb") as fh:
+                data = fh.read()
+            usable = len(data) - len(data) % RECORD.size
+            records = [EventRecord._make(fields) for fields in RECORD.iter_unpack(data[:usable])]
+            # records already sealed (crash between writing a segment and truncating the log) are dropped
+            for record in records:
+                if not self._contains(record):
+                    self._add_active(record)
+            if usable != len(data) or len(self._active) != len(records):
+                self._rewrite_active()
+
+    def _intern(self, name: Any) -> int:
+        if not isinstance(name, str) or not name:
+            return -1
+        name_id = self._name_ids.get(name)
+        if name_id is None:
+            name_id = self._name_ids[name] = len(self.names)
+            self.names.append(name)
+            self._pending_names.append(name)
+        return name_id
+
+    def _to_record(self, item: dict[str, Any]) -> EventRecord:
+        # serial and source are only known for live events (see utils.history_item_sn)
+        serial = history_item_sn(item)
+        return EventRecord(
+            time=int(history_item_time(item)),
+            serial=serial if serial is not None and serial >= 0 else -1,
+            source_id=_bounded_int(item.get("iI"), 32),
+            event=_bounded_int(item.get("itemEvent"), 16),
+            source_type=_bounded_int(item.get("iT"), 16),
+            name_id=self._intern(item.get("itemName")),
+        )
+
+    def _logged_at(self, time: int) -> list[EventRecord]:
+        return [
+            *self._active_by_time.get(time, ()),
+            *(other for segment in self._segments for other in segment.iter_range(time, time)),
+        ]
+
+    def _contains(self, record: EventRecord) -> bool:
+        return any(record.same_event(other) for other in self._logged_at(record.time))
+
+    def _add_active(self, record: EventRecord) -> None:
+        self._active.append(record)
+        self._active_by_time.setdefault(record.time, []).append(record)
+
+    def _rewrite_active(self) -> None:
+        with open(self._path(_ACTIVE_FILE), "wb") as fh:
+            fh.write(b"".join(RECORD.pack(*record) for record in self._active))
+
+    def _write(self, records: list[EventRecord]) -> None:
+        os.makedirs(self._dir, exist_ok=True)
+        # names first: a record must never reference a name that is not on disk
+        if self._pending_names:
+            with open(self._path(_NAMES_FILE), "a", encoding="utf-8") as fh:
+                fh.writelines(json.dumps(name, ensure_ascii=False) + "\n" for name in self._pending_names)
+            self._pending_names.clear()
+        if records:
+            with open(self._path(_ACTIVE_FILE), "ab") as fh:
+                fh.write(b"".join(RECORD.pack(*record) for record in records))
+
+    def _seal(self) -> None:
+        number = int(os.path.basename(self._segments[-1].path)[:6]) + 1 if self._segments else 0
+        path = self._path(f"{number:06d}.seg")
+        records = sorted(self._active)
+        with open(f"{path}.tmp", "wb") as fh:
+            fh.write(b"".join(RECORD.pack(*record) for record in records))
+        os.replace(f"{path}.tmp", path)
+        os.remove(self._path(_ACTIVE_FILE))
+        self._segments.append(_Segment(path))
+        self._active.clear()
+        self._active_by_time.clear()
+
+    def append(self, items: list[dict[str, Any]]) -> int:
+        # Items are only matched against records logged before this call, and each
+        # logged record absorbs at most one item: items of one batch are distinct
+        # events even when they look alike (same second, code and name).
+        new: list[EventRecord] = []
+        unclaimed: dict[int, list[EventRecord]] = {}
+        for item in items:
+            record = self._to_record(item)
+            candidates = unclaimed.get(record.time)
+            if candidates is None:
+                candidates = unclaimed[record.time] = self._logged_at(record.time)
+            match = next((other for other in candidates if other == record), None) or next(
+                (other for other in candidates if record.same_event(other)), None
+            )
+            if match is None:
+                new.append(record)
+            else:
+                candidates.remove(match)
+
+        pending: list[EventRecord] = []
+        for record in new:
+            self._add_active(record)
+            pending.append(record)
+            if len(self._active) >= SEGMENT_RECORDS:
+                self._write(pending)
+                pending.clear()
+                self._seal()
+        self._write(pending)
+        return len(new)
+
+    def count(self) -> int:
+        return sum(segment.count for segment in self._segments) + len(self._active)
+
+    def _active_range(self, start: int | None, end: int | None) -> list[EventRecord]:
+        return [r for r in self._active if (start is None or r.time >= start) and (end is None or r.time <= end)]
+
+    def _iter_sorted(self, start: int | None, end: int | None, reverse: bool = False) -> Iterator[EventRecord]:
+        # records order by their fields (time first); segments are sealed in that order
+        return heapq.merge(
+            *(segment.iter_range(start, end, reverse) for segment in self._segments),
+            sorted(self._active_range(start, end), reverse=reverse),
+            reverse=reverse,
+        )
+
+    def read_range(self, start: int | None, end: int | None) -> list[EventRecord]:
+        """Records with start <= time <= end (None = open), oldest first."""
+        return list(self._iter_sorted(start, end))
+
+    def read_page(
+        self, start: int | None, end: int | None, after: EventRecord | None, seen: int, limit: int
+    ) -> list[EventRecord]:
+        """Up to limit records of read_range() that follow `after` (the last record of the previous page).
+
+        Identical records can straddle a page boundary, so only the `seen` copies of `after`
+        that earlier pages returned are skipped.
+        """
+        if after is None:
+            return list(islice(self._iter_sorted(start, end), limit))
+        start = after.time if start is None else max(start, after.time)
+        records = dropwhile(lambda record: record < after, self._iter_sorted(start, end))
+        return list(islice(records, seen, seen + limit))
+
+    def read_latest(self, offset: int, limit: int) -> list[EventRecord]:
+        """Records offset .. offset + limit - 1 counted from the newest one."""
+        return list(islice(self._iter_sorted(None, None, reverse=True), offset, offset + limit))
+
+    def read_raw(self, start: int | None, end: int | None) -> bytes:
+        """Packed records with start <= time <= end, not in time order (sealed ranges are copied as is)."""
+        parts = [segment.range_bytes(start, end) for segment in self._segments]
+        parts.extend(RECORD.pack(*record) for record in self._active_range(start, end))
+        return b"".join(parts)
+
+    def close(self) -> None:
+        for segment in self._segments:
+            segment.close()
+
+
+class AlarmEventLog:
+    """Alarm event logs of all devices of a config entry."""
+
+    def __init__(self, hass: HomeAssistant, entry_id: str) -> None:
+        self.hass = hass
+        self._dir = hass.config.path(".storage", DOMAIN, "history", entry_id)
+        self._logs: dict[str, _DeviceLog] = {}
+        self._locks: dict[str, asyncio.Lock] = {}
+
+    def _lock(self, device_id: str) -> asyncio.Lock:
+        lock = self._locks.get(device_id)
+        if lock is None:
+            lock = self._locks[device_id] = asyncio.Lock()
+        return lock
+
+    async def _async_log(self, device_id: str) -> _DeviceLog:
+        log = self._logs.get(device_id)
+        if log is None:
+            log = self._logs[device_id] = await self.hass.async_add_executor_job(
+                _DeviceLog, os.path.join(self._dir, device_id)
+            )
+        return log
+
+    async def async_append(self, device_id: str, items: list[dict[str, Any]]) -> int:
+        """Append items not logged yet; return how many were added."""
+        items = [item for item in items if isinstance(item, dict)]
+        if not items:
+            return 0
+        async with self._lock(device_id):
+            log = await self._async_log(device_id)
+            return await self.hass.async_add_executor_job(log.append, items)
+
+    async def async_count(self, device_id: str) -> int:
+        async with self._lock(device_id):
+            return (await self._async_log(device_id)).count()
+
+    async def async_read_raw(
+        self, device_id: str, start: int | None = None, end: int | None = None
+    ) -> tuple[bytes, list[str]]:
+        """Packed RECORD data in [start, end] (unordered), with the name table."""
+        async with self._lock(device_id):
+            log = await self._async_log(device_id)
+            raw = await self.hass.async_add_executor_job(log.read_raw, start, end)
+            return raw, list(log.names)
+
+    async def async_iter_pages(
+        self, device_id: str, start: int | None = None, end: int | None = None, page_size: int = 1000
+    ) -> AsyncIterator[list[dict[str, Any]]]:
+        """History items in [start, end] oldest first, one page at a time."""
+        after: EventRecord | None = None
+        seen = 0  # copies of `after` returned so far
+        while True:
+            async with self._lock(device_id):
+                log = await self._async_log(device_id)
+                records = await self.hass.async_add_executor_job(log.read_page, start, end, after, seen, page_size)
+                names = log.names
+                page = [record.as_item(names) for record in records]
+            if page:
+                yield page
+            if len(records) < page_size:
+                return
+            copies = sum(1 for _ in takewhile(records[-1].__eq__, reversed(records)))
+            seen = seen + copies if copies == len(records) and records[-1] == after else copies
+            after = records[-1]
+
+    async def async_read_latest(
+        self, device_id: str, offset: int = 0, limit: int = 50
+    ) -> tuple[list[dict[str, Any]], int]:
+        """History items newest first (skipping `offset`), with the total number of logged records."""
+        async with self._lock(device_id):
+            log = await self._async_log(device_id)
+            records = await self.hass.async_add_executor_job(log.read_latest, offset, limit)
+            return [record.as_item(log.names) for record in records], log.count()
+
+    async def async_close(self) -> None:
+        for device_id, log in list(self._logs.items()):
+            async with self._lock(device_id):
+                log.close()
+                self._logs.pop(device_id, None)
+
+    async def async_remove(self) -> None:
+        """Delete the logs of all devices of this entry."""
+        await self.async_close()
+        await self.hass.async_add_executor_job(shutil.rmtree, self._dir, True)
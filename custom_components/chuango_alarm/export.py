@@ -0,0 +1,99 @@
+"""Streaming alarm history export to CSV or JSON Lines.
+
+Pages come from an async iterator (event log or REST) and each one is
+converted and written by an executor job, so memory use depends on the page
+size only, not on the length of the history. The file is written as
+<name>.part and renamed when complete.
+"""
+from __future__ import annotations
+
+from collections.abc import AsyncIterator, Callable
+import contextlib
+import csv
+import json
+import os
+from typing import Any
+
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+
+from .utils import format_history_item
+
+EXPORT_FORMATS = ("csv", "jsonl")
+
+_COLUMNS = (
+    "time",
+    "timestamp",
+    "type",
+    "event_code",
+    "name",
+    "sn",
+    "source_id",
+    "source_type",
+    "source_type_label",
+    "alarm_origin",
+)
+
+
+def history_row(item: dict[str, Any]) -> dict[str, Any]:
+    """Flat export row of a history item (REST, live or event log format)."""
+    row = format_history_item(item)
+    timestamp = row["time"]
+    return {
+        **row,
+        "time": dt_util.utc_from_timestamp(timestamp).isoformat() if timestamp else None,
+        "timestamp": timestamp,
+    }
+
+
+class _ExportWriter:
+    """Incremental file writer; only used from the executor."""
+
+    def __init__(self, path: str, fmt: str) -> None:
+        self._path = path
+        self._part = f"{path}.part"
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._fh = open(self._part, "w", encoding="utf-8", newline="")
+        self._csv: csv.DictWriter | None = None
+        if fmt == "csv":
+            self._csv = csv.DictWriter(self._fh, fieldnames=_COLUMNS)
+            self._csv.writeheader()
+
+    def write(self, items: list[dict[str, Any]]) -> int:
+        rows = [history_row(item) for item in items]
+        if self._csv is not None:
+            self._csv.writerows(rows)
+        else:
+            self._fh.writelines(json.dumps(row, ensure_ascii=False) + "\n" for row in rows)
+        return len(rows)
+
+    def finish(self) -> None:
+        self._fh.close()
+        os.replace(self._part, self._path)
+
+    def abort(self) -> None:
+        self._fh.close()
+        # keep the original error if the partial file is already gone
+        with contextlib.suppress(OSError):
+            os.remove(self._part)
+
+
+async def async_export_history(
+    hass: HomeAssistant,
+    pages: AsyncIterator[list[dict[str, Any]]],
+    path: str,
+    fmt: str,
+    on_progress: Callable[[int], None],
+) -> int:
+    """Write all pages to path; return the number of rows."""
+    writer = await hass.async_add_executor_job(_ExportWriter, path, fmt)
+    rows = 0
+    try:
+        async for page in pages:
+            rows += await hass.async_add_executor_job(writer.write, page)
+            on_progress(rows)
+    except BaseException:
+        await hass.async_add_executor_job(writer.abort)
+        raise
+    await hass.async_add_executor_job(writer.finish)
+    return rows
@@ -0,0 +1,187 @@
+"""Alarm history queries over the event log, computed with NumPy.
+
+The matching records are read as one buffer and viewed as a structured array
+(one column per record field), so filters and aggregates run vectorized; Python
+only loops over distinct values (event/source type pairs, buckets, sensors) and
+over the events returned.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime, timezone, tzinfo
+from typing import Any
+
+import numpy as np
+
+from .event_log import RECORD
+from .utils import EVENT_CODE_MAP, TRIGGER_EVENT_CODES, alarm_source_type_label, derive_alarm_origin
+
+# Column view of event_log.RECORD
+RECORD_DTYPE = np.dtype(
+    [
+        ("time", "<i8"),
+        ("serial", "<i8"),
+        ("source_id", "<i4"),
+        ("event", "<i2"),
+        ("source_type", "<i2"),
+        ("name_id", "<i4"),
+        ("_pad", "V4"),
+    ]
+)
+assert RECORD_DTYPE.itemsize == RECORD.size
+
+INTERVALS: dict[str, int] = {"hour": 3600, "day": 86400}
+_BUCKET_FORMATS: dict[str, str] = {"hour": "%Y-%m-%dT%H:00", "day": "%Y-%m-%d"}
+
+
+@dataclass(frozen=True, slots=True)
+class HistoryQuery:
+    """Filters (empty = any) and aggregation settings of a history query."""
+
+    start: int | None = None
+    end: int | None = None
+    event_codes: tuple[int, ...] = ()
+    source_ids: tuple[int, ...] = ()
+    alarm_origins: tuple[str, ...] = ()
+    interval: str = "day"
+    limit: int = 100
+
+
+def _event_type(code: int) -> str:
+    return EVENT_CODE_MAP.get(code, f"unknown_{code}")
+
+
+def _origins(events: np.ndarray, source_types: np.ndarray) -> np.ndarray:
+    """derive_alarm_origin per record, evaluated once per distinct (event, source type)."""
+    # both columns are int16 >= -1: one int64 key per pair
+    keys = events.astype(np.int64) << 16 | (source_types.astype(np.int64) + 1)
+    unique, inverse = np.unique(keys, return_inverse=True)
+    labels = np.array(
+        [
+            derive_alarm_origin(
+                event_code=evt if (evt := key >> 16) >= 0 else None,
+                trigger_type=None,  # not part of the logged record
+                source_type=src if (src := (key & 0xFFFF) - 1) >= 0 else None,
+            )
+            for key in unique.tolist()
+        ],
+        dtype=object,
+    )
+    return labels[inverse.reshape(-1)]
+
+
+def _utc_offset(timestamp: int, tz: tzinfo) -> int:
+    return int(datetime.fromtimestamp(timestamp, tz).utcoffset().total_seconds())
+
+
+def _local_times(times: np.ndarray, tz: tzinfo) -> np.ndarray:
+    """Shift UTC timestamps to local wall time (offsets looked up per distinct day)."""
+    days, inverse = np.unique(times // 86400, return_inverse=True)
+    inverse = inverse.reshape(-1)
+    first = np.array([_utc_offset(day * 86400, tz) for day in days.tolist()], dtype=np.int64)
+    last = np.array([_utc_offset(day * 86400 + 86399, tz) for day in days.tolist()], dtype=np.int64)
+    offsets = first[inverse]
+    # days with a DST change: offset per distinct hour
+    changed = (first != last)[inverse]
+    if changed.any():
+        hours, hour_inverse = np.unique(times[changed] // 3600, return_inverse=True)
+        hour_offsets = np.array([_utc_offset(hour * 3600, tz) for hour in hours.tolist()], dtype=np.int64)
+        offsets[changed] = hour_offsets[hour_inverse.reshape(-1)]
+    return times + offsets
+
+
+def _counts_per_bucket(local: np.ndarray, events: np.ndarray, interval: str) -> dict[str, dict[str, int]]:
+    size = INTERVALS[interval]
+    keys = (local // size) << 16 | (events.astype(np.int64) + 1)
+    unique, counts = np.unique(keys, return_counts=True)
+    result: dict[str, dict[str, int]] = {}
+    for key, count in zip(unique.tolist(), counts.tolist()):
+        bucket, code = key >> 16, (key & 0xFFFF) - 1
+        label = datetime.fromtimestamp(bucket * size, timezone.utc).strftime(_BUCKET_FORMATS[interval])
+        result.setdefault(label, {})[_event_type(code)] = count
+    return result
+
+
+def _trigger_stats(records: np.ndarray, names: list[str]) -> tuple[dict[str, dict[str, Any]], float | None]:
+    """Per-sensor trigger counts and mean time between triggers (overall and per sensor)."""
+    triggers = records[np.isin(records["event"], TRIGGER_EVENT_CODES)]
+    overall = None
+    if len(triggers) > 1:
+        overall = float(triggers["time"].max() - triggers["time"].min()) / (len(triggers) - 1)
+
+    triggers = triggers[triggers["source_id"] >= 0]
+    if not len(triggers):
+        return {}, overall
+    triggers = triggers[np.lexsort((triggers["time"], triggers["source_id"]))]
+    sources, times = triggers["source_id"], triggers["time"]
+    ids, first, counts = np.unique(sources, return_index=True, return_counts=True)
+
+    # consecutive triggers of the same sensor -> gaps summed per sensor
+    same = sources[1:] == sources[:-1]
+    gap_sum = np.bincount(
+        np.searchsorted(ids, sources[1:][same]),
+        weights=np.diff(times)[same].astype(np.float64),
+        minlength=len(ids),
+    )
+    mean_gap = np.divide(gap_sum, counts - 1, out=np.full(len(ids), np.nan), where=counts > 1)
+    last_name = triggers["name_id"][first + counts - 1]
+
+    sensors: dict[str, dict[str, Any]] = {}
+    for source_id, count, gap, name_id in zip(ids.tolist(), counts.tolist(), mean_gap.tolist(), last_name.tolist()):
+        sensors[str(source_id)] = {
+            "name": names[name_id] if 0 <= name_id < len(names) else "",
+            "triggers": count,
+            "mean_seconds_between": None if np.isnan(gap) else round(gap, 1),
+        }
+    return sensors, None if overall is None else round(overall, 1)
+
+
+def run_history_query(raw: bytes, names: list[str], query: HistoryQuery, tz: tzinfo) -> dict[str, Any]:
+    """Filter and aggregate packed event log records (runs in the executor)."""
+    records = np.frombuffer(raw, dtype=RECORD_DTYPE)
+    records = records[np.lexsort((records["serial"], records["time"]))]
+
+    mask = np.ones(len(records), dtype=bool)
+    if query.event_codes:
+        mask &= np.isin(records["event"], query.event_codes)
+    if query.source_ids:
+        mask &= np.isin(records["source_id"], query.source_ids)
+    if query.alarm_origins and len(records):
+        mask &= np.isin(_origins(records["event"], records["source_type"]), query.alarm_origins)
+    records = records[mask]
+
+    result: dict[str, Any] = {
+        "count": len(records),
+        "counts_by_type": {},
+        "counts_by_interval": {},
+        "sensors": {},
+        "mean_seconds_between_triggers": None,
+        "events": [],
+    }
+    if not len(records):
+        return result
+
+    codes, counts = np.unique(records["event"], return_counts=True)
+    result["counts_by_type"] = {_event_type(code): count for code, count in zip(codes.tolist(), counts.tolist())}
+    result["counts_by_interval"] = _counts_per_bucket(_local_times(records["time"], tz), records["event"], query.interval)
+    result["sensors"], result["mean_seconds_between_triggers"] = _trigger_stats(records, names)
+
+    newest = records[: -query.limit - 1 : -1]
+    origins = _origins(newest["event"], newest["source_type"]) if len(newest) else []
+    events: list[dict[str, Any]] = []
+    for record, origin in zip(newest.tolist(), origins):
+        event_time, serial, source_id, code, source_type, name_id, _pad = record
+        events.append(
+            {
+                "type": _event_type(code),
+                "name": names[name_id] if 0 <= name_id < len(names) else "",
+                "time": event_time,
+                "sn": serial if serial >= 0 else None,
+                "source_id": source_id if source_id >= 0 else None,
+                "source_type": source_type if source_type >= 0 else None,
+                "source_type_label": alarm_source_type_label(source_type if source_type >= 0 else None),
+                "alarm_origin": origin,
+            }
+        )
+    result["events"] = events
+    return result
@@ -0,0 +1,120 @@
+"""Lightweight runtime counters exposed through diagnostics."""
+from __future__ import annotations
+
+from bisect import bisect_left
+from dataclasses import dataclass, field
+from typing import Any
+
+# Upper bounds (ms) of the latency histogram buckets; one open-ended bucket follows.
+LATENCY_BUCKETS_MS: tuple[float, ...] = (100, 250, 500, 1000, 2000, 5000, 10000, 30000)
+
+
+@dataclass(slots=True)
+class HandlerStats:
+    """Call count and wall time of a single message handler."""
+
+    calls: int = 0
+    errors: int = 0
+    total_ns: int = 0
+    max_ns: int = 0
+
+    def record(self, elapsed_ns: int, *, failed: bool = False) -> None:
+        self.calls += 1
+        self.total_ns += elapsed_ns
+        if elapsed_ns > self.max_ns:
+            self.max_ns = elapsed_ns
+        if failed:
+            self.errors += 1
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "total_ms": round(self.total_ns / 1_000_000, 3),
+            "avg_us": round(self.total_ns / self.calls / 1_000, 1) if self.calls else None,
+            "max_us": round(self.max_ns / 1_000, 1),
+        }
+
+
+@dataclass(slots=True)
+class LatencyHistogram:
+    """Fixed-bucket round-trip latency histogram (milliseconds)."""
+
+    buckets: list[int] = field(default_factory=lambda: [0] * (len(LATENCY_BUCKETS_MS) + 1))
+    count: int = 0
+    total_ms: float = 0.0
+    min_ms: float | None = None
+    max_ms: float | None = None
+    last_ms: float | None = None
+    timeouts: int = 0
+
+    def observe(self, ms: float) -> None:
+        self.buckets[bisect_left(LATENCY_BUCKETS_MS, ms)] += 1
+        self.count += 1
+        self.total_ms += ms
+        self.last_ms = ms
+        self.min_ms = ms if self.min_ms is None else min(self.min_ms, ms)
+        self.max_ms = ms if self.max_ms is None else max(self.max_ms, ms)
+
+    def record_timeout(self) -> None:
+        self.timeouts += 1
+
+    def percentile(self, q: float) -> float | None:
+        """Approximate percentile: upper bound of the bucket holding it, capped at max."""
+        if not self.count or self.max_ms is None:
+            return None
+        rank = q * self.count
+        seen = 0
+        for idx, n in enumerate(self.buckets):
+            seen += n
+            if seen >= rank and n:
+                bound = LATENCY_BUCKETS_MS[idx] if idx < len(LATENCY_BUCKETS_MS) else self.max_ms
+                return round(min(bound, self.max_ms), 1)
+        return round(self.max_ms, 1)
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "count": self.count,
+            "timeouts": self.timeouts,
+            "avg_ms": round(self.total_ms / self.count, 1) if self.count else None,
+            "p50_ms": self.percentile(0.5),
+            "p95_ms": self.percentile(0.95),
+            "min_ms": round(self.min_ms, 1) if self.min_ms is not None else None,
+            "max_ms": round(self.max_ms, 1) if self.max_ms is not None else None,
+            "last_ms": round(self.last_ms, 1) if self.last_ms is not None else None,
+            "buckets": dict(zip([*map(str, LATENCY_BUCKETS_MS), "inf"], self.buckets)),
+        }
+
+
+@dataclass(slots=True)
+class EndpointStats:
+    """Request counters of one REST endpoint (latency covers request + body read)."""
+
+    calls: int = 0
+    errors: int = 0
+    bytes_in: int = 0
+    last_status: int | None = None
+    connections_new: int = 0
+    connections_reused: int = 0
+    connect_ms: float = 0.0
+    dns_cache_hits: int = 0
+    dns_cache_misses: int = 0
+    coalesced: int = 0
+    cache_hits: int = 0
+    latency: LatencyHistogram = field(default_factory=LatencyHistogram)
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "bytes_in": self.bytes_in,
+            "last_status": self.last_status,
+            "connections_new": self.connections_new,
+            "connections_reused": self.connections_reused,
+            "avg_connect_ms": round(self.connect_ms / self.connections_new, 1) if self.connections_new else None,
+            "dns_cache_hits": self.dns_cache_hits,
+            "dns_cache_misses": self.dns_cache_misses,
+            "coalesced": self.coalesced,
+            "cache_hits": self.cache_hits,
+            "latency": self.latency.as_dict(),
+        }
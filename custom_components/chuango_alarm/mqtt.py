@@ -24,11 +24,12 @@ class DreamcatcherMqttManager:
 
         self._stop = asyncio.Event()
         self._tasks: dict[str, asyncio.Task] = {}
+        # credentials each device loop last connected with (restart when they change)
+        self._task_creds: dict[str, dict[str, Any]] = {}
 
         # active per-device client (same connection used for subscribe + publish)
         self._clients: dict[str, aiomqtt.Client] = {}
         self._connected: dict[str, asyncio.Event] = {}
-        self._pub_locks: dict[str, asyncio.Lock] = {}
 
         self._tls: ssl.SSLContext | None = None
 
@@ -92,6 +93,7 @@ class DreamcatcherMqttManager:
         if tasks:
             await asyncio.gather(*tasks, return_exceptions=True)
         self._tasks.clear()
+        self._task_creds.clear()
 
         self._started = False
 
@@ -106,12 +108,27 @@ class DreamcatcherMqttManager:
             if dev_id not in device_ids:
                 self._tasks[dev_id].cancel()
                 self._tasks.pop(dev_id, None)
+                self._task_creds.pop(dev_id, None)
 
         for dev_id in device_ids:
             if dev_id in self._tasks:
-                continue
+                if not self._credentials_changed(dev_id):
+                    continue
+                # e.g. started from the stored device list, REST returned a new MQTT token
+                self._log.debug("MQTT credentials changed for %s; reconnecting", dev_id)
+                self._tasks.pop(dev_id).cancel()
+                self._task_creds.pop(dev_id, None)
             self._tasks[dev_id] = self.hass.async_create_task(self._device_loop(dev_id))
 
+    def _credentials_changed(self, device_id: str) -> bool:
+        used = self._task_creds.get(device_id)
+        if used is None:
+            return False
+        try:
+            return self.coordinator.get_mqtt_credentials(device_id) != used
+        except HomeAssistantError:
+            return False
+
     def _get_connected_event(self, device_id: str) -> asyncio.Event:
         ev = self._connected.get(device_id)
         if ev is None:
@@ -119,13 +136,6 @@ class DreamcatcherMqttManager:
             self._connected[device_id] = ev
         return ev
 
-    def _get_pub_lock(self, device_id: str) -> asyncio.Lock:
-        lock = self._pub_locks.get(device_id)
-        if lock is None:
-            lock = asyncio.Lock()
-            self._pub_locks[device_id] = lock
-        return lock
-
     def _clear_client(self, device_id: str) -> None:
         self._clients.pop(device_id, None)
         ev = self._connected.get(device_id)
@@ -142,7 +152,11 @@ class DreamcatcherMqttManager:
         retain: bool = False,
         timeout: float = 10.0,
     ) -> None:
-        """Publish on the existing per-device MQTT connection (same client_id)."""
+        """Publish on the existing per-device MQTT connection (same client_id).
+
+        Commands are serialized per device by the coordinator's OutboundScheduler,
+        which is the only caller, so no additional publish lock is taken here.
+        """
         ev = self._get_connected_event(device_id)
         if not ev.is_set():
             try:
@@ -154,10 +168,8 @@ class DreamcatcherMqttManager:
         if client is None:
             raise HomeAssistantError(f"MQTT client missing for {device_id}")
 
-        lock = self._get_pub_lock(device_id)
-        async with lock:
-            self.coordinator.mark_din_tx(device_id=device_id, topic=topic, payload=payload)
-            await client.publish(topic, payload, qos=qos, retain=retain)
+        self.coordinator.mark_din_tx(device_id=device_id, topic=topic, payload=payload)
+        await client.publish(topic, payload, qos=qos, retain=retain)
 
     async def _device_loop(self, device_id: str) -> None:
         interval = 5
@@ -166,6 +178,7 @@ class DreamcatcherMqttManager:
         while not self._stop.is_set():
             try:
                 creds = self.coordinator.get_mqtt_credentials(device_id)
+                self._task_creds[device_id] = creds
                 host = str(creds["host"])
                 port = int(creds["port"])
                 client_id = str(creds["client_id"])
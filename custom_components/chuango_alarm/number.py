@@ -5,7 +5,7 @@ from typing import Any
 from homeassistant.components.number import NumberEntity, NumberMode
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant, callback
-from homeassistant.helpers import entity_platform
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entity import DeviceInfo
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
@@ -20,34 +20,21 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry, async_add_e
     if coordinator.data is None:
         await coordinator.async_config_entry_first_refresh()
 
-    known: set[tuple[str, str]] = set()
-    entities: list[NumberEntity] = []
+    def _device_entities(dev_id: str) -> list[NumberEntity]:
+        return [
+            EntryDelayNumber(coordinator, entry, dev_id),
+            ExitDelayNumber(coordinator, entry, dev_id),
+        ]
 
-    for dev_id in coordinator.get_device_ids():
-        known.add((dev_id, "entry_delay"))
-        known.add((dev_id, "exit_delay"))
-        entities.append(EntryDelayNumber(coordinator, entry, dev_id))
-        entities.append(ExitDelayNumber(coordinator, entry, dev_id))
-
-    async_add_entities(entities)
-
-    platform = entity_platform.async_get_current_platform()
+    async_add_entities([e for dev_id in coordinator.get_device_ids() for e in _device_entities(dev_id)])
 
     @callback
-    def _on_update() -> None:
-        now_ids = set(coordinator.get_device_ids())
-        new: list[NumberEntity] = []
-        for dev_id in now_ids:
-            if (dev_id, "entry_delay") not in known:
-                known.add((dev_id, "entry_delay"))
-                new.append(EntryDelayNumber(coordinator, entry, dev_id))
-            if (dev_id, "exit_delay") not in known:
-                known.add((dev_id, "exit_delay"))
-                new.append(ExitDelayNumber(coordinator, entry, dev_id))
-        if new:
-            hass.async_create_task(platform.async_add_entities(new))
-
-    coordinator.async_add_listener(_on_update)
+    def _on_devices_added(device_ids: list[str]) -> None:
+        async_add_entities([e for dev_id in device_ids for e in _device_entities(dev_id)])
+
+    entry.async_on_unload(
+        async_dispatcher_connect(hass, coordinator.signal_devices_added, _on_devices_added)
+    )
 
 
 class _BaseDelayNumber(CoordinatorEntity[DreamcatcherCoordinator], NumberEntity):
@@ -59,7 +46,7 @@ class _BaseDelayNumber(CoordinatorEntity[DreamcatcherCoordinator], NumberEntity)
     _attr_mode = NumberMode.BOX
 
     def __init__(self, coordinator: DreamcatcherCoordinator, entry: ConfigEntry, device_id: str) -> None:
-        super().__init__(coordinator)
+        super().__init__(coordinator, context=device_id)
         self._entry = entry
         self.device_id = device_id
 
@@ -0,0 +1,283 @@
+"""Per-device outbound MQTT command scheduling.
+
+Each hub gets one OutboundScheduler that owns all din publishes for it:
+
+- lanes: PRIORITY (alarm mode / SOS) is always sent before NORMAL (settings)
+  and BULK (host_conf / parts_list requests), so a refresh can never delay
+  an arm/disarm command.
+- coalescing: NORMAL commands with the same key that are still pending are
+  merged (later field values win) during a short window, e.g. while dragging
+  a delay slider or toggling switches quickly.
+- no-op dropping: for every changed field the value the device had before the
+  first pending change is kept as baseline; fields that end up equal to it are
+  dropped, and a command without remaining changes is not sent at all. While
+  an earlier command with the same key is published but not yet answered
+  (see settle), its values replace the reported ones: the device state is
+  stale until the hub confirms.
+"""
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+from collections.abc import Awaitable, Callable, Hashable
+from dataclasses import dataclass, field
+from enum import IntEnum
+import json
+import logging
+import time
+from typing import Any
+
+from homeassistant.core import HomeAssistant
+
+_UNSET = object()
+
+
+class Lane(IntEnum):
+    PRIORITY = 0
+    NORMAL = 1
+    BULK = 2
+
+
+# build(changes) -> payload object (or several, published back to back), or None to drop.
+CommandBuilder = Callable[[dict[Hashable, Any]], dict[str, Any] | list[dict[str, Any]] | None]
+
+
+@dataclass(slots=True)
+class OutboundCommand:
+    """A pending din command; payload is built lazily when it is sent."""
+
+    lane: Lane
+    build: CommandBuilder
+    key: str | None = None
+    changes: dict[Hashable, Any] = field(default_factory=dict)
+    baseline: dict[Hashable, Any] = field(default_factory=dict)
+    ready_at: float = 0.0
+    waiters: list[asyncio.Future[bool]] = field(default_factory=list)
+    on_publish: list[Callable[[], None]] = field(default_factory=list)
+
+    def effective_changes(self, unacked: dict[Hashable, Any] | None = None) -> dict[Hashable, Any]:
+        """Changes that differ from the baseline (unacked values of the same key take precedence)."""
+        current = {**self.baseline, **(unacked or {})}
+        return {k: v for k, v in self.changes.items() if current.get(k, _UNSET) != v}
+
+
+@dataclass(frozen=True, slots=True)
+class CommandResult:
+    """Outcome of a din command once the hub answered (or did not).
+
+    status: "acked" (matching dout response), "timeout" (no response in time)
+    or "dropped" (no-op, nothing was sent). latency is publish -> response.
+    """
+
+    command: str
+    status: str
+    latency: float | None = None
+    response: dict[str, Any] | None = None
+
+    @property
+    def ok(self) -> bool:
+        return self.status != "timeout"
+
+
+@dataclass(slots=True)
+class PendingAck:
+    """A published command waiting for its dout response."""
+
+    device_id: str
+    action: str
+    future: asyncio.Future[CommandResult]
+    key: str | None = None
+    predicate: Callable[[dict[str, Any]], bool] | None = None
+    rollback: Callable[[], None] | None = None
+    sent_at: float | None = None
+    cancel_timeout: Callable[[], None] | None = None
+
+    def matches(self, res: dict[str, Any]) -> bool:
+        return self.sent_at is not None and (self.predicate is None or self.predicate(res))
+
+
+class OutboundScheduler:
+    """Serializes, prioritizes and coalesces din publishes of one device."""
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        device_id: str,
+        publish: Callable[[str], Awaitable[None]],
+        logger: logging.Logger,
+        *,
+        window: float,
+    ) -> None:
+        self.hass = hass
+        self.device_id = device_id
+        self._publish = publish
+        self._log = logger
+        self._window = window
+
+        self._lanes: dict[Lane, deque[OutboundCommand]] = {lane: deque() for lane in Lane}
+        self._pending: dict[str, OutboundCommand] = {}
+        # key -> [values published and not yet answered (newest win), outstanding responses]
+        self._unacked: dict[str, list[Any]] = {}
+        self._wake = asyncio.Event()
+        self._worker: asyncio.Task | None = None
+        self._stats: dict[str, int] = {"sent": 0, "coalesced": 0, "dropped": 0, "failed": 0}
+
+    def submit(
+        self,
+        lane: Lane,
+        build: CommandBuilder,
+        *,
+        key: str | None = None,
+        changes: dict[Hashable, Any] | None = None,
+        baseline: dict[Hashable, Any] | None = None,
+        on_publish: Callable[[], None] | None = None,
+    ) -> asyncio.Future[bool]:
+        """Queue a command; the future resolves True when published, False when dropped.
+
+        on_publish runs right before the (possibly merged) payload is handed to
+        the broker, e.g. to start a response timer.
+        """
+        fut: asyncio.Future[bool] = self.hass.loop.create_future()
+        changes = changes or {}
+        baseline = baseline or {}
+
+        cmd = self._pending.get(key) if key is not None else None
+        if cmd is not None:
+            # Merge into the still pending command; keep the oldest baseline per field.
+            cmd.changes.update(changes)
+            for k, v in baseline.items():
+                cmd.baseline.setdefault(k, v)
+            cmd.build = build
+            cmd.waiters.append(fut)
+            if on_publish is not None:
+                cmd.on_publish.append(on_publish)
+            self._stats["coalesced"] += 1
+            return fut
+
+        # Only settings wait for merges; requests and priority commands go out immediately.
+        delay = self._window if key is not None and lane is Lane.NORMAL else 0.0
+        cmd = OutboundCommand(
+            lane=lane,
+            build=build,
+            key=key,
+            changes=dict(changes),
+            baseline=dict(baseline),
+            ready_at=time.monotonic() + delay,
+            waiters=[fut],
+            on_publish=[on_publish] if on_publish is not None else [],
+        )
+        if key is not None:
+            self._pending[key] = cmd
+        self._lanes[lane].append(cmd)
+
+        self._wake.set()
+        if self._worker is None or self._worker.done():
+            self._worker = self.hass.async_create_task(self._run())
+        return fut
+
+    async def async_close(self) -> None:
+        worker, self._worker = self._worker, None
+        if worker is not None:
+            worker.cancel()
+            await asyncio.gather(worker, return_exceptions=True)
+        for lane in self._lanes.values():
+            while lane:
+                for fut in lane.popleft().waiters:
+                    if not fut.done():
+                        fut.cancel()
+        self._pending.clear()
+        self._unacked.clear()
+
+    def unacked_values(self, key: str) -> dict[Hashable, Any]:
+        """Field values of published commands with this key whose response is outstanding."""
+        entry = self._unacked.get(key)
+        return dict(entry[0]) if entry is not None else {}
+
+    def settle(self, key: str) -> None:
+        """One response for key arrived (or timed out); forget its values after the last one."""
+        entry = self._unacked.get(key)
+        if entry is None:
+            return
+        entry[1] -= 1
+        if entry[1] <= 0:
+            del self._unacked[key]
+
+    def stats(self) -> dict[str, int]:
+        return {**self._stats, "queued": sum(len(lane) for lane in self._lanes.values())}
+
+    def _pop_ready(self) -> tuple[OutboundCommand | None, float | None]:
+        """Return the next sendable command, else the delay until one becomes ready."""
+        now = time.monotonic()
+        wait: float | None = None
+        for lane in Lane:
+            queue = self._lanes[lane]
+            if not queue:
+                continue
+            head = queue[0]
+            if head.ready_at <= now:
+                queue.popleft()
+                if head.key is not None:
+                    self._pending.pop(head.key, None)
+                return head, None
+            remaining = head.ready_at - now
+            wait = remaining if wait is None else min(wait, remaining)
+        return None, wait
+
+    async def _run(self) -> None:
+        while True:
+            cmd, wait = self._pop_ready()
+            if cmd is None:
+                if wait is None:
+                    return
+                self._wake.clear()
+                try:
+                    await asyncio.wait_for(self._wake.wait(), timeout=wait)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            await self._send(cmd)
+
+    async def _send(self, cmd: OutboundCommand) -> None:
+        try:
+            effective = cmd.effective_changes(self.unacked_values(cmd.key) if cmd.key is not None else None)
+            built = cmd.build(effective)
+            if not built:
+                self._stats["dropped"] += 1
+                self._log.debug("MQTT TX dev=%s dropped no-op %s", self.device_id, cmd.key)
+                self._resolve(cmd, result=False)
+                return
+            payloads = [
+                json.dumps(obj, separators=(",", ":"), ensure_ascii=False)
+                for obj in (built if isinstance(built, list) else [built])
+            ]
+            for hook in cmd.on_publish:
+                hook()
+            if cmd.key is not None and cmd.on_publish:
+                # one settle() per on_publish hook (each starts a response wait)
+                entry = self._unacked.setdefault(cmd.key, [{}, 0])
+                entry[0].update(effective)
+                entry[1] += len(cmd.on_publish)
+            for payload in payloads:
+                await self._publish(payload)
+        except asyncio.CancelledError:
+            self._resolve(cmd, error=asyncio.CancelledError())
+            raise
+        except Exception as err:  # noqa: BLE001 - delivered to the callers
+            self._stats["failed"] += 1
+            self._resolve(cmd, error=err)
+            return
+
+        self._stats["sent"] += 1
+        self._resolve(cmd, result=True)
+
+    @staticmethod
+    def _resolve(cmd: OutboundCommand, *, result: bool = False, error: BaseException | None = None) -> None:
+        for fut in cmd.waiters:
+            if fut.done():
+                continue
+            if isinstance(error, asyncio.CancelledError):
+                fut.cancel()
+            elif error is not None:
+                fut.set_exception(error)
+            else:
+                fut.set_result(result)
@@ -0,0 +1,202 @@
+"""Typed accessory (part) records built once from parts_list / modify_parts payloads."""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any
+
+from homeassistant.components.binary_sensor import BinarySensorDeviceClass
+
+# c-bitfield decoding (APK: partDataBean.PartsBean.setC)
+# - mtype   = c & 0x0F
+# - mstatus = c >> 7 (bit 7)
+MTYPE_SENSOR = 1
+MTYPE_KEYFOB = 2
+
+# Observed part `t` values in OV-300 payloads
+PART_T_KEYFOB = 44
+PART_T_LABELS: dict[int, str] = {
+    44: "Remote / Keyfob",
+    45: "Sensor (generic)",
+}
+
+# Zone mapping: z=1 -> perimeter (instant), z=2 -> interior (delay/PIR)
+ZONE_PERIMETER = 1
+ZONE_INTERIOR = 2
+
+
+def _int_or_none(value: Any) -> int | None:
+    if value is None:
+        return None
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def decode_part_c(c_raw: Any) -> tuple[int | None, int | None, bool | None]:
+    """Decode c bitfield into (mtype, mstatus, enabled).
+
+    mtype: lower 4 bits
+    mstatus: bit 7 (0/1)
+    enabled: derived from mstatus (1 => enabled)
+    """
+    c_int = _int_or_none(c_raw)
+    if c_int is None:
+        return None, None, None
+
+    mtype = c_int & 0x0F
+    mstatus = (c_int >> 7) & 0x01
+    return mtype, mstatus, mstatus == 1
+
+
+def part_t_label(value: Any) -> str | None:
+    t_int = _int_or_none(value)
+    return PART_T_LABELS.get(t_int) if t_int is not None else None
+
+
+def infer_device_class(name: str | None, zone: int | None, mtype: int | None) -> BinarySensorDeviceClass:
+    """Infer device class from decoded part type + name/zone."""
+    name = (name or "").lower()
+
+    # Key fob / remote
+    if mtype == MTYPE_KEYFOB:
+        return BinarySensorDeviceClass.PRESENCE
+
+    # PIR / motion sensors
+    if "pir" in name or zone == ZONE_INTERIOR:
+        return BinarySensorDeviceClass.MOTION
+
+    # Door sensors
+    if "tuer" in name or "tür" in name or "door" in name or "haustuer" in name or "haustür" in name:
+        return BinarySensorDeviceClass.DOOR
+
+    # Window sensors
+    if "fenster" in name or "window" in name:
+        return BinarySensorDeviceClass.WINDOW
+
+    # Terrace door (treat as door)
+    if "terasse" in name or "terrasse" in name or "terrace" in name:
+        return BinarySensorDeviceClass.DOOR
+
+    # Default for perimeter zone: opening
+    if zone == ZONE_PERIMETER:
+        return BinarySensorDeviceClass.OPENING
+
+    return BinarySensorDeviceClass.OPENING
+
+
+def model_from_part(c: Any, t: Any, mtype: int | None) -> str:
+    """Derive a model string from decoded c-bitfield type and raw type t."""
+    if mtype == MTYPE_SENSOR:
+        return "Sensor"
+    if mtype == MTYPE_KEYFOB:
+        return "Key Fob"
+    t_label = part_t_label(t)
+    if t_label:
+        return t_label
+    return f"Accessory (c={c}, t={t})"
+
+
+@dataclass(frozen=True, slots=True)
+class PartRecord:
+    """One accessory of a hub with its c-bitfield and derived labels decoded once.
+
+    Raw payload keys: id, n (name), c (bitfield), t (type), md (mode),
+    z (zone), si (sensor index), ss (keyfob/SOS status), e (enabled flag).
+    """
+
+    id: int
+    name: str | None
+    c: int | None
+    t: Any
+    md: int | None
+    zone: int | None
+    si: Any
+    ss: int | None
+    e: int | None
+    mtype: int | None
+    mstatus: int | None
+    enabled: bool | None
+    is_keyfob: bool
+    device_class: BinarySensorDeviceClass
+    model: str
+
+    @classmethod
+    def from_payload(cls, part: dict[str, Any]) -> PartRecord | None:
+        part_id = _int_or_none(part.get("id"))
+        if part_id is None:
+            return None
+
+        name = part.get("n")
+        name = str(name) if name else None
+        c = _int_or_none(part.get("c"))
+        t = part.get("t")
+        zone = _int_or_none(part.get("z"))
+        e = _int_or_none(part.get("e"))
+        mtype, mstatus, c_enabled = decode_part_c(c)
+
+        # Explicit e flag wins (live logs: e=0 -> disabled, e=1 -> enabled),
+        # fallback is the c status bit (c=129 -> enabled, c=1 -> disabled).
+        enabled = (e == 1) if e is not None else c_enabled
+
+        if mtype is not None:
+            is_keyfob = mtype == MTYPE_KEYFOB
+        else:
+            is_keyfob = _int_or_none(t) == PART_T_KEYFOB
+
+        return cls(
+            id=part_id,
+            name=name,
+            c=c,
+            t=t,
+            md=_int_or_none(part.get("md")),
+            zone=zone,
+            si=part.get("si"),
+            ss=_int_or_none(part.get("ss")),
+            e=e,
+            mtype=mtype,
+            mstatus=mstatus,
+            enabled=enabled,
+            is_keyfob=is_keyfob,
+            device_class=infer_device_class(name, zone, mtype),
+            model=model_from_part(c, t, mtype),
+        )
+
+    def as_payload(self) -> dict[str, Any]:
+        """Return the record in parts_list payload form (None fields omitted)."""
+        payload = {
+            "id": self.id,
+            "n": self.name,
+            "c": self.c,
+            "t": self.t,
+            "md": self.md,
+            "z": self.zone,
+            "si": self.si,
+            "ss": self.ss,
+            "e": self.e,
+        }
+        return {k: v for k, v in payload.items() if v is not None}
+
+    def with_changes(self, change: dict[str, Any]) -> PartRecord:
+        """Return a new record with a modify_parts entry applied."""
+        payload = self.as_payload()
+        for field, value in change.items():
+            if field == "id":
+                continue
+            payload[field] = value
+
+        # Keep c bitfield status in sync if e was modified (status bit is bit 7).
+        e = _int_or_none(change.get("e"))
+        if e is not None and self.c is not None:
+            payload["c"] = (self.c | 0x80) if e == 1 else (self.c & 0x7F)
+
+        return PartRecord.from_payload(payload) or self
+
+
+@dataclass(frozen=True, slots=True)
+class PartsChange:
+    """Payload of the coordinator's parts-changed dispatcher signal."""
+
+    device_id: str
+    added: tuple[PartRecord, ...]
+    removed: tuple[int, ...]
@@ -0,0 +1,180 @@
+"""Failure handling for DreamCatcher REST calls.
+
+- RetryPolicy: per-endpoint retries of transient failures (connection errors,
+  timeouts, 5xx/429) with exponential backoff and full jitter.
+- RetryBudget: client-wide token bucket so retries stay a small fraction of
+  the traffic and cannot multiply load while the cloud is struggling.
+- CircuitBreaker: per endpoint; after repeated transient failures calls fail
+  fast until a cool-down has passed, then a single probe decides.
+- adaptive_timeout: request timeout derived from the latency percentile of
+  the recent requests (LatencyWindow) instead of a fixed value.
+"""
+from __future__ import annotations
+
+from collections import deque
+from dataclasses import dataclass
+import math
+import random
+import time
+from typing import Any
+
+
+@dataclass(frozen=True, slots=True)
+class RetryPolicy:
+    max_retries: int = 2
+    base_delay: float = 1.0
+    max_delay: float = 10.0
+
+    def backoff(self, attempt: int) -> float:
+        """Delay before retry number attempt + 1 (full jitter)."""
+        return random.uniform(0, min(self.max_delay, self.base_delay * (2**attempt)))
+
+
+DEFAULT_RETRY_POLICY = RetryPolicy()
+
+RETRY_POLICIES: dict[str, RetryPolicy] = {
+    "zone": RetryPolicy(max_retries=1),
+    "login": RetryPolicy(max_retries=2),
+    "shared_devices": RetryPolicy(max_retries=3, base_delay=1.0, max_delay=15.0),
+    "alarm_history": RetryPolicy(max_retries=2, base_delay=0.5, max_delay=5.0),
+    "firmware_info": RetryPolicy(max_retries=2, base_delay=1.0, max_delay=10.0),
+}
+
+
+class RetryBudget:
+    """Token bucket: every first attempt deposits `ratio` tokens, every retry costs one."""
+
+    def __init__(self, *, capacity: float = 10.0, ratio: float = 0.2) -> None:
+        self._capacity = capacity
+        self._ratio = ratio
+        self._tokens = capacity
+        self._denied = 0
+
+    def record_request(self) -> None:
+        self._tokens = min(self._capacity, self._tokens + self._ratio)
+
+    def try_spend(self) -> bool:
+        if self._tokens < 1:
+            self._denied += 1
+            return False
+        self._tokens -= 1
+        return True
+
+    def as_dict(self) -> dict[str, Any]:
+        return {"tokens": round(self._tokens, 2), "capacity": self._capacity, "denied": self._denied}
+
+
+class CircuitBreaker:
+    """closed -> open after `threshold` consecutive failures -> half_open after the cool-down.
+
+    In half_open exactly one call is let through; its outcome closes the breaker
+    or re-opens it with a doubled cool-down (capped).
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, *, threshold: int = 5, cooldown: float = 30.0, max_cooldown: float = 300.0) -> None:
+        self._threshold = threshold
+        self._base_cooldown = cooldown
+        self._max_cooldown = max_cooldown
+        self._cooldown = cooldown
+        self.state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self._rejected = 0
+        self._trips = 0
+
+    def allow(self) -> bool:
+        if self.state == self.OPEN:
+            if time.monotonic() - self._opened_at < self._cooldown:
+                self._rejected += 1
+                return False
+            self.state = self.HALF_OPEN
+        if self.state == self.HALF_OPEN:
+            if self._probe_in_flight:
+                self._rejected += 1
+                return False
+            self._probe_in_flight = True
+        return True
+
+    def record_success(self) -> None:
+        self.state = self.CLOSED
+        self._failures = 0
+        self._cooldown = self._base_cooldown
+        self._probe_in_flight = False
+
+    def record_failure(self) -> None:
+        if self.state == self.HALF_OPEN:
+            self._cooldown = min(self._max_cooldown, self._cooldown * 2)
+            self._trip()
+            return
+        self._failures += 1
+        if self.state == self.CLOSED and self._failures >= self._threshold:
+            self._trip()
+
+    def release(self) -> None:
+        """End a half-open probe that neither succeeded nor failed transiently."""
+        self._probe_in_flight = False
+
+    def retry_after(self) -> float:
+        if self.state != self.OPEN:
+            return 0.0
+        return max(0.0, self._cooldown - (time.monotonic() - self._opened_at))
+
+    def _trip(self) -> None:
+        self.state = self.OPEN
+        self._opened_at = time.monotonic()
+        self._probe_in_flight = False
+        self._trips += 1
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "state": self.state,
+            "consecutive_failures": self._failures,
+            "retry_after_s": round(self.retry_after(), 1),
+            "trips": self._trips,
+            "rejected": self._rejected,
+        }
+
+
+class LatencyWindow:
+    """Latencies (ms) of the last `size` requests of an endpoint.
+
+    Only recent samples count, so the timeout follows the cloud when it gets
+    slower; a timed out request is recorded at the timeout that was applied.
+    """
+
+    def __init__(self, size: int = 50) -> None:
+        self._samples: deque[float] = deque(maxlen=size)
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def observe(self, ms: float) -> None:
+        self._samples.append(ms)
+
+    def percentile(self, q: float) -> float | None:
+        if not self._samples:
+            return None
+        ordered = sorted(self._samples)
+        return ordered[min(len(ordered) - 1, max(0, math.ceil(q * len(ordered)) - 1))]
+
+
+def adaptive_timeout(
+    latency: LatencyWindow,
+    *,
+    default: float,
+    minimum: float,
+    factor: float = 4.0,
+    min_samples: int = 20,
+) -> float:
+    """Timeout in seconds: factor x recent p95, clamped to [minimum, default]."""
+    if len(latency) < min_samples:
+        return default
+    p95 = latency.percentile(0.95)
+    if p95 is None:
+        return default
+    return max(minimum, min(default, p95 / 1000 * factor))
@@ -0,0 +1,100 @@
+"""Dispatch of parsed dout messages to handlers keyed by (topic kind, action).
+
+Topic kind is the last segment after ``/dout/`` (online, config, info, alarm).
+Request/response style messages carry their action in ``m.res.a``; the handler
+then receives ``res``. Messages without an ``m`` envelope (online, alarm) are
+routed with action ``None`` and the handler receives the whole object.
+"""
+from __future__ import annotations
+
+from collections.abc import Callable
+import time
+from typing import Any
+
+from .metrics import HandlerStats
+
+# handler(device_id, dev_state, body) -> None; dev_state is mutated in place.
+DoutHandler = Callable[[str, dict[str, Any], dict[str, Any]], None]
+
+_DOUT_SEP = "/dout/"
+
+
+def dout_kind(topic: str) -> str | None:
+    """Return the dout topic kind (e.g. 'config' for '.../dout/config')."""
+    _, sep, kind = topic.rpartition(_DOUT_SEP)
+    return kind if sep and kind else None
+
+
+class DoutRouter:
+    """Precompiled (kind, action) -> handlers table with per-handler timing."""
+
+    def __init__(self) -> None:
+        self._routes: dict[tuple[str, str | None], tuple[tuple[DoutHandler, HandlerStats], ...]] = {}
+        self._stats: dict[str, HandlerStats] = {}
+        self._unrouted = 0
+
+    def register(
+        self,
+        kind: str,
+        action: str | None,
+        handler: DoutHandler,
+        *,
+        name: str | None = None,
+    ) -> Callable[[], None]:
+        """Add a handler for (kind, action) and return a callable removing it again.
+
+        Several handlers may share a key; they run in registration order.
+        """
+        key = (kind, action)
+        stats_name = name or (kind if action is None else f"{kind}:{action}")
+        stats = self._stats.setdefault(stats_name, HandlerStats())
+        entry = (handler, stats)
+        self._routes[key] = (*self._routes.get(key, ()), entry)
+
+        def _unregister() -> None:
+            remaining = tuple(e for e in self._routes.get(key, ()) if e is not entry)
+            if remaining:
+                self._routes[key] = remaining
+            else:
+                self._routes.pop(key, None)
+
+        return _unregister
+
+    def dispatch(self, device_id: str, topic: str, data: Any, dev_state: dict[str, Any]) -> bool:
+        """Run the handlers for a parsed message; return False if none matched."""
+        kind = dout_kind(topic)
+        if kind is None or not isinstance(data, dict):
+            self._unrouted += 1
+            return False
+
+        body: dict[str, Any] = data
+        action: str | None = None
+        if "m" in data:
+            m = data["m"]
+            res = m.get("res") if isinstance(m, dict) else None
+            if not isinstance(res, dict):
+                self._unrouted += 1
+                return False
+            body = res
+            action = res.get("a")
+
+        handlers = self._routes.get((kind, action))
+        if handlers is None:
+            self._unrouted += 1
+            return False
+
+        for handler, stats in handlers:
+            start = time.perf_counter_ns()
+            failed = True
+            try:
+                handler(device_id, dev_state, body)
+                failed = False
+            finally:
+                stats.record(time.perf_counter_ns() - start, failed=failed)
+        return True
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "handlers": {name: stats.as_dict() for name, stats in self._stats.items()},
+            "unrouted": self._unrouted,
+        }
@@ -1,17 +1,19 @@
 from __future__ import annotations
 
+from collections.abc import Iterable
 from typing import Any
 
 from homeassistant.components.select import SelectEntity
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.exceptions import HomeAssistantError
-from homeassistant.helpers import entity_platform
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entity import DeviceInfo
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from .const import DOMAIN
 from .coordinator import DreamcatcherCoordinator
+from .parts import PartRecord, PartsChange
 from .utils import part_md_label, part_zone_change_allowed, resolve_device_model
 
 # Alarm volume: 0=Mute, 1=Low, 2=Medium, 3=High
@@ -34,63 +36,42 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry, async_add_e
     if coordinator.data is None:
         await coordinator.async_config_entry_first_refresh()
 
-    known: set[tuple[str, str]] = set()
-    entities: list[SelectEntity] = []
+    def _device_entities(dev_id: str) -> list[SelectEntity]:
+        return [
+            AlarmVolumeSelect(coordinator, entry, dev_id),
+            AlarmDurationSelect(coordinator, entry, dev_id),
+        ]
+
+    def _part_entities(dev_id: str, parts: Iterable[PartRecord]) -> list[SelectEntity]:
+        return [
+            PartZoneSelect(coordinator, entry, dev_id, part.id)
+            for part in parts
+            if part.zone is not None
+        ]
 
+    entities: list[SelectEntity] = []
     for dev_id in coordinator.get_device_ids():
-        known.add((dev_id, "alarm_volume"))
-        known.add((dev_id, "alarm_duration"))
-        entities.append(AlarmVolumeSelect(coordinator, entry, dev_id))
-        entities.append(AlarmDurationSelect(coordinator, entry, dev_id))
-
-    def _build_part_zone_entities() -> list[SelectEntity]:
-        built: list[SelectEntity] = []
-        mqtt_state = (coordinator.data or {}).get("mqtt_state") or {}
-        if not isinstance(mqtt_state, dict):
-            return built
-
-        for dev_id in coordinator.get_device_ids():
-            dev_state = mqtt_state.get(dev_id) or {}
-            parts = dev_state.get("parts") or []
-            if not isinstance(parts, list):
-                continue
-            for part in parts:
-                if not isinstance(part, dict):
-                    continue
-                part_id = part.get("id")
-                if part_id is None:
-                    continue
-                if "z" not in part:
-                    continue
-                key = (dev_id, f"part_zone_{part_id}")
-                if key in known:
-                    continue
-                known.add(key)
-                built.append(PartZoneSelect(coordinator, entry, dev_id, int(part_id)))
-        return built
-
-    entities.extend(_build_part_zone_entities())
+        entities.extend(_device_entities(dev_id))
+        entities.extend(_part_entities(dev_id, coordinator.get_parts(dev_id)))
 
     async_add_entities(entities)
 
-    platform = entity_platform.async_get_current_platform()
+    @callback
+    def _on_devices_added(device_ids: list[str]) -> None:
+        async_add_entities([e for dev_id in device_ids for e in _device_entities(dev_id)])
 
     @callback
-    def _on_update() -> None:
-        now_ids = set(coordinator.get_device_ids())
-        new: list[SelectEntity] = []
-        for dev_id in now_ids:
-            if (dev_id, "alarm_volume") not in known:
-                known.add((dev_id, "alarm_volume"))
-                new.append(AlarmVolumeSelect(coordinator, entry, dev_id))
-            if (dev_id, "alarm_duration") not in known:
-                known.add((dev_id, "alarm_duration"))
-                new.append(AlarmDurationSelect(coordinator, entry, dev_id))
-        new.extend(_build_part_zone_entities())
+    def _on_parts_changed(change: PartsChange) -> None:
+        new = _part_entities(change.device_id, change.added)
         if new:
-            hass.async_create_task(platform.async_add_entities(new))
+            async_add_entities(new)
 
-    coordinator.async_add_listener(_on_update)
+    entry.async_on_unload(
+        async_dispatcher_connect(hass, coordinator.signal_devices_added, _on_devices_added)
+    )
+    entry.async_on_unload(
+        async_dispatcher_connect(hass, coordinator.signal_parts_changed, _on_parts_changed)
+    )
 
 
 class _BaseChuangoSelect(CoordinatorEntity[DreamcatcherCoordinator], SelectEntity):
@@ -99,7 +80,7 @@ class _BaseChuangoSelect(CoordinatorEntity[DreamcatcherCoordinator], SelectEntit
     _attr_has_entity_name = True
 
     def __init__(self, coordinator: DreamcatcherCoordinator, entry: ConfigEntry, device_id: str) -> None:
-        super().__init__(coordinator)
+        super().__init__(coordinator, context=device_id)
         self._entry = entry
         self.device_id = device_id
 
@@ -202,7 +183,7 @@ class PartZoneSelect(CoordinatorEntity[DreamcatcherCoordinator], SelectEntity):
     _attr_icon = "mdi:vector-square"
 
     def __init__(self, coordinator: DreamcatcherCoordinator, entry: ConfigEntry, device_id: str, part_id: int) -> None:
-        super().__init__(coordinator)
+        super().__init__(coordinator, context=device_id)
         self._entry = entry
         self._device_id = device_id
         self._part_id = part_id
@@ -217,16 +198,8 @@ class PartZoneSelect(CoordinatorEntity[DreamcatcherCoordinator], SelectEntity):
         return {}
 
     @property
-    def _part(self) -> dict[str, Any] | None:
-        parts = self._st.get("parts") or []
-        if not isinstance(parts, list):
-            return None
-        for part in parts:
-            if not isinstance(part, dict):
-                continue
-            if part.get("id") == self._part_id:
-                return part
-        return None
+    def _part(self) -> PartRecord | None:
+        return self.coordinator.get_part(self._device_id, self._part_id)
 
     @property
     def available(self) -> bool:
@@ -236,17 +209,14 @@ class PartZoneSelect(CoordinatorEntity[DreamcatcherCoordinator], SelectEntity):
 
     @property
     def device_info(self) -> DeviceInfo:
-        part = self._part or {}
-        part_name = part.get("n") or f"Part {self._part_id}"
-        category = part.get("c")
-        ptype = part.get("t")
-        model = "Sensor" if category == 129 else ("Key Fob" if category == 130 else f"Accessory (c={category}, t={ptype})")
+        part = self._part
+        part_name = (part.name if part else None) or f"Part {self._part_id}"
 
         return DeviceInfo(
             identifiers={(DOMAIN, f"{self._device_id}_part_{self._part_id}")},
             name=part_name,
             manufacturer="Chuango",
-            model=model,
+            model=part.model if part else None,
             via_device=(DOMAIN, self._device_id),
         )
 
@@ -255,34 +225,23 @@ class PartZoneSelect(CoordinatorEntity[DreamcatcherCoordinator], SelectEntity):
         part = self._part
         if not part:
             return None
-        z = part.get("z")
-        if z is None:
-            return None
-        try:
-            return ZONE_VALUE_TO_OPTION.get(int(z))
-        except (ValueError, TypeError):
+        if part.zone is None:
             return None
+        return ZONE_VALUE_TO_OPTION.get(part.zone)
 
     @property
     def extra_state_attributes(self) -> dict[str, Any]:
-        part = self._part or {}
-        md_raw = part.get("md")
-        zone_raw = part.get("z")
-        try:
-            md = int(md_raw) if md_raw is not None else None
-        except (TypeError, ValueError):
-            md = None
-        try:
-            zone = int(zone_raw) if zone_raw is not None else None
-        except (TypeError, ValueError):
-            zone = None
+        part = self._part
+        md = part.md if part else None
+        zone = part.zone if part else None
 
         return {
             "part_id": self._part_id,
-            "mode": md_raw,
+            "mode": md,
             "mode_label": part_md_label(md),
-            "zone": zone_raw,
+            "zone": zone,
             "zone_change_allowed": part_zone_change_allowed(md, zone),
+            "restored": self.coordinator.is_parts_restored(self._device_id),
         }
 
     async def async_select_option(self, option: str) -> None:
@@ -290,18 +249,7 @@ class PartZoneSelect(CoordinatorEntity[DreamcatcherCoordinator], SelectEntity):
         if not part:
             return
 
-        md_raw = part.get("md")
-        zone_raw = part.get("z")
-        try:
-            md = int(md_raw) if md_raw is not None else None
-        except (TypeError, ValueError):
-            md = None
-        try:
-            current_zone = int(zone_raw) if zone_raw is not None else None
-        except (TypeError, ValueError):
-            current_zone = None
-
-        if not part_zone_change_allowed(md, current_zone):
+        if not part_zone_change_allowed(part.md, part.zone):
             raise HomeAssistantError("Zone change is blocked for this accessory (md=0 in zone 0).")
 
         zone = ZONE_OPTION_TO_VALUE.get(option)
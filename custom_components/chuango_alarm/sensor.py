@@ -3,10 +3,11 @@ from __future__ import annotations
 from dataclasses import dataclass
 from typing import Any
 
-from homeassistant.components.sensor import SensorDeviceClass, SensorEntity
+from homeassistant.components.sensor import SensorDeviceClass, SensorEntity, SensorStateClass
 from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import UnitOfTime
 from homeassistant.core import HomeAssistant, callback
-from homeassistant.helpers import entity_platform
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entity import DeviceInfo
 from homeassistant.helpers.entity import EntityCategory
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
@@ -26,6 +27,7 @@ from .const import (
     CONF_EXPIRE_AT,
     CONF_LAST_LOGIN,
     CONF_USER_INFO,
+    COMMAND_LATENCY_ACTIONS,
     DOMAIN,
 )
 from .coordinator import DreamcatcherCoordinator
@@ -98,48 +100,28 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry, async_add_e
         #DreamcatcherMqttEndpointSensor(entry),
     ]
 
-    per_device_entities: list[SensorEntity] = []
-    known: set[tuple[str, str]] = set()
-
-    devices = (coordinator.data or {}).get("shared_devices") or {}
-    if isinstance(devices, dict):
-        for dev_id in devices.keys():
-            for d in DEV_DIAG_DEFS:
-                known.add((dev_id, d.key))
-                per_device_entities.append(DreamcatcherDeviceDiagSensor(coordinator, entry, dev_id, d))
-            # Firmware version sensor (data comes via MQTT dev_conf)
-            fw_key = (dev_id, "_fw_version")
-            if fw_key not in known:
-                known.add(fw_key)
-                per_device_entities.append(ChuangoFirmwareVersionSensor(coordinator, entry, dev_id))
+    def _device_entities(dev_id: str) -> list[SensorEntity]:
+        built: list[SensorEntity] = [
+            DreamcatcherDeviceDiagSensor(coordinator, entry, dev_id, d) for d in DEV_DIAG_DEFS
+        ]
+        # Firmware version sensor (data comes via MQTT dev_conf)
+        built.append(ChuangoFirmwareVersionSensor(coordinator, entry, dev_id))
+        # Command round-trip latency (publish -> dout response) per command type
+        built.extend(
+            ChuangoCommandLatencySensor(coordinator, entry, dev_id, action) for action in COMMAND_LATENCY_ACTIONS
+        )
+        return built
 
+    per_device_entities = [e for dev_id in coordinator.get_device_ids() for e in _device_entities(dev_id)]
     async_add_entities(base_entities + per_device_entities)
 
-    platform = entity_platform.async_get_current_platform()
-
     @callback
-    def _on_update() -> None:
-        devices_now = (coordinator.data or {}).get("shared_devices") or {}
-        if not isinstance(devices_now, dict):
-            return
-
-        new_entities: list[SensorEntity] = []
-        for dev_id in devices_now.keys():
-            for d in DEV_DIAG_DEFS:
-                k = (dev_id, d.key)
-                if k in known:
-                    continue
-                known.add(k)
-                new_entities.append(DreamcatcherDeviceDiagSensor(coordinator, entry, dev_id, d))
-            fw_key = (dev_id, "_fw_version")
-            if fw_key not in known:
-                known.add(fw_key)
-                new_entities.append(ChuangoFirmwareVersionSensor(coordinator, entry, dev_id))
-
-        if new_entities:
-            hass.async_create_task(platform.async_add_entities(new_entities))
-
-    coordinator.async_add_listener(_on_update)
+    def _on_devices_added(device_ids: list[str]) -> None:
+        async_add_entities([e for dev_id in device_ids for e in _device_entities(dev_id)])
+
+    entry.async_on_unload(
+        async_dispatcher_connect(hass, coordinator.signal_devices_added, _on_devices_added)
+    )
 
 
 class DreamcatcherUserSensor(CoordinatorEntity[DreamcatcherCoordinator], SensorEntity):
@@ -373,7 +355,7 @@ class ChuangoFirmwareVersionSensor(CoordinatorEntity[DreamcatcherCoordinator], S
         entry: ConfigEntry,
         device_id: str,
     ) -> None:
-        super().__init__(coordinator)
+        super().__init__(coordinator, context=device_id)
         self._entry = entry
         self._device_id = device_id
         self._attr_unique_id = f"{entry.entry_id}_{device_id}_firmware_version"
@@ -425,6 +407,59 @@ class ChuangoFirmwareVersionSensor(CoordinatorEntity[DreamcatcherCoordinator], S
         return attrs
 
 
+class ChuangoCommandLatencySensor(CoordinatorEntity[DreamcatcherCoordinator], SensorEntity):
+    """Median round-trip time of a command type, from MQTT publish to the hub's dout response."""
+
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_has_entity_name = True
+    _attr_icon = "mdi:timer-sand"
+    _attr_device_class = SensorDeviceClass.DURATION
+    _attr_state_class = SensorStateClass.MEASUREMENT
+    _attr_native_unit_of_measurement = UnitOfTime.MILLISECONDS
+
+    def __init__(
+        self,
+        coordinator: DreamcatcherCoordinator,
+        entry: ConfigEntry,
+        device_id: str,
+        action: str,
+    ) -> None:
+        super().__init__(coordinator, context=device_id)
+        self._entry = entry
+        self._device_id = device_id
+        self._action = action
+        self._attr_unique_id = f"{entry.entry_id}_{device_id}_command_latency_{action}"
+        self._attr_translation_key = f"command_latency_{action}"
+
+    @property
+    def device_info(self) -> DeviceInfo:
+        d = (self.coordinator.data or {}).get("shared_devices", {}).get(self._device_id, {})
+        alias = d.get("alias") or self._device_id
+        product_id = d.get("product_id") or d.get("mpid") or ""
+        dtype = d.get("dtype") or ""
+        return DeviceInfo(
+            identifiers={(DOMAIN, self._device_id)},
+            name=alias,
+            manufacturer="Chuango",
+            model=resolve_device_model(dtype, product_id),
+            model_id=str(product_id) if product_id else None,
+        )
+
+    @property
+    def native_value(self) -> float | None:
+        hist = self.coordinator.get_command_latency(self._device_id, self._action)
+        return hist.percentile(0.5) if hist is not None else None
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        hist = self.coordinator.get_command_latency(self._device_id, self._action)
+        if hist is None:
+            return {"count": 0, "timeouts": 0}
+        stats = hist.as_dict()
+        stats.pop("buckets", None)
+        return stats
+
+
 class DreamcatcherDeviceDiagSensor(CoordinatorEntity[DreamcatcherCoordinator], SensorEntity):
     _attr_entity_category = EntityCategory.DIAGNOSTIC
     _attr_has_entity_name = True
@@ -436,7 +471,7 @@ class DreamcatcherDeviceDiagSensor(CoordinatorEntity[DreamcatcherCoordinator], S
         device_id: str,
         definition: _DevDiagDef,
     ) -> None:
-        super().__init__(coordinator)
+        super().__init__(coordinator, context=device_id)
         self._entry = entry
         self._device_id = device_id
         self._def = definition
@@ -0,0 +1,349 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from typing import Any
+
+import voluptuous as vol
+
+from homeassistant.core import HomeAssistant, ServiceCall, ServiceResponse, SupportsResponse
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers import device_registry as dr
+from homeassistant.helpers.service import async_register_admin_service
+from homeassistant.util import dt as dt_util
+
+from .api import DreamcatcherAuthError, DreamcatcherError
+from .const import DOMAIN, EVENT_HISTORY_EXPORT, HISTORY_EXPORT_DIR, SET_MODE_ALL_CONCURRENCY
+from .coordinator import DreamcatcherCoordinator
+from .export import EXPORT_FORMATS, async_export_history
+from .history_query import INTERVALS, HistoryQuery
+from .utils import EVENT_CODE_MAP
+
+SERVICE_MODIFY_PARTS = "modify_parts"
+SERVICE_SET_MODE_ALL = "set_mode_all"
+SERVICE_BACKFILL_HISTORY = "backfill_history"
+SERVICE_QUERY_HISTORY = "query_history"
+SERVICE_EXPORT_HISTORY = "export_history"
+SERVICE_GET_HISTORY = "get_history"
+
+ATTR_DEVICE_ID = "device_id"
+ATTR_PARTS = "parts"
+ATTR_PART_ID = "id"
+ATTR_ZONE = "zone"
+ATTR_ENABLED = "enabled"
+ATTR_SOS = "sos"
+ATTR_ROLLBACK = "rollback"
+ATTR_MODE = "mode"
+ATTR_CONFIG_ENTRY_ID = "config_entry_id"
+ATTR_WAIT = "wait"
+ATTR_RESTART = "restart"
+ATTR_START = "start"
+ATTR_END = "end"
+ATTR_EVENT_TYPE = "event_type"
+ATTR_SOURCE_ID = "source_id"
+ATTR_ALARM_ORIGIN = "alarm_origin"
+ATTR_INTERVAL = "interval"
+ATTR_LIMIT = "limit"
+ATTR_FORMAT = "format"
+ATTR_SOURCE = "source"
+ATTR_FILENAME = "filename"
+ATTR_OFFSET = "offset"
+
+# export_history sources: local event log (oldest first) or the cloud REST history (newest first)
+EXPORT_SOURCES = ("log", "cloud")
+
+# service mode -> host_stat mode
+SET_MODE_ALL_MODES: dict[str, str] = {
+    "disarm": "d",
+    "arm_away": "a",
+    "arm_home": "h",
+}
+
+_PART_CHANGE_SCHEMA = vol.All(
+    {
+        vol.Required(ATTR_PART_ID): vol.Coerce(int),
+        vol.Optional(ATTR_ZONE): vol.All(vol.Coerce(int), vol.In([0, 1, 2, 3])),
+        vol.Optional(ATTR_ENABLED): cv.boolean,
+        vol.Optional(ATTR_SOS): cv.boolean,
+    },
+    cv.has_at_least_one_key(ATTR_ZONE, ATTR_ENABLED, ATTR_SOS),
+)
+
+MODIFY_PARTS_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_DEVICE_ID): cv.string,
+        vol.Required(ATTR_PARTS): vol.All(cv.ensure_list, vol.Length(min=1), [_PART_CHANGE_SCHEMA]),
+        vol.Optional(ATTR_ROLLBACK, default=False): cv.boolean,
+    }
+)
+
+SET_MODE_ALL_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_MODE): vol.In(list(SET_MODE_ALL_MODES)),
+        vol.Optional(ATTR_CONFIG_ENTRY_ID): vol.All(cv.ensure_list, [cv.string]),
+        vol.Optional(ATTR_WAIT, default=False): cv.boolean,
+    }
+)
+
+BACKFILL_HISTORY_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_DEVICE_ID): cv.string,
+        vol.Optional(ATTR_RESTART, default=False): cv.boolean,
+    }
+)
+
+QUERY_HISTORY_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_DEVICE_ID): cv.string,
+        vol.Optional(ATTR_START): cv.datetime,
+        vol.Optional(ATTR_END): cv.datetime,
+        vol.Optional(ATTR_EVENT_TYPE): vol.All(cv.ensure_list, [vol.In(list(EVENT_CODE_MAP.values()))]),
+        vol.Optional(ATTR_SOURCE_ID): vol.All(cv.ensure_list, [vol.Coerce(int)]),
+        vol.Optional(ATTR_ALARM_ORIGIN): vol.All(cv.ensure_list, [cv.string]),
+        vol.Optional(ATTR_INTERVAL, default="day"): vol.In(list(INTERVALS)),
+        vol.Optional(ATTR_LIMIT, default=100): vol.All(vol.Coerce(int), vol.Range(min=0, max=1000)),
+    }
+)
+
+EXPORT_HISTORY_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_DEVICE_ID): cv.string,
+        vol.Optional(ATTR_FORMAT, default="csv"): vol.In(EXPORT_FORMATS),
+        vol.Optional(ATTR_SOURCE, default="log"): vol.In(EXPORT_SOURCES),
+        vol.Optional(ATTR_START): cv.datetime,
+        vol.Optional(ATTR_END): cv.datetime,
+        # plain file name inside HISTORY_EXPORT_DIR
+        vol.Optional(ATTR_FILENAME): vol.All(cv.string, vol.Match(r"^[\w][\w.-]*$")),
+    }
+)
+
+GET_HISTORY_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_DEVICE_ID): cv.string,
+        vol.Optional(ATTR_LIMIT, default=50): vol.All(vol.Coerce(int), vol.Range(min=1, max=1000)),
+        vol.Optional(ATTR_OFFSET, default=0): vol.All(vol.Coerce(int), vol.Range(min=0)),
+    }
+)
+
+# event type -> itemEvent code
+_EVENT_TYPE_CODES: dict[str, int] = {name: code for code, name in EVENT_CODE_MAP.items()}
+
+
+def _resolve_hub(hass: HomeAssistant, device_id: str) -> tuple[DreamcatcherCoordinator, str]:
+    """Map an HA device id (hub or accessory) or a raw hub id to (coordinator, hub id)."""
+    hub_id = device_id
+    device = dr.async_get(hass).async_get(device_id)
+    if device is not None:
+        idents = [ident for domain, ident in device.identifiers if domain == DOMAIN]
+        if not idents:
+            raise HomeAssistantError(f"Device {device_id} does not belong to {DOMAIN}")
+        # accessories are registered as "<hub>_part_<id>" sub-devices
+        hub_id = idents[0].split("_part_", 1)[0]
+
+    for runtime in (hass.data.get(DOMAIN) or {}).values():
+        coordinator: DreamcatcherCoordinator | None = runtime.get("coordinator")
+        if coordinator is not None and hub_id in coordinator.get_device_ids():
+            return coordinator, hub_id
+
+    raise HomeAssistantError(f"Unknown device_id: {device_id}")
+
+
+async def _async_modify_parts(hass: HomeAssistant, call: ServiceCall) -> None:
+    coordinator, hub_id = _resolve_hub(hass, call.data[ATTR_DEVICE_ID])
+
+    changes: list[dict[str, Any]] = []
+    for item in call.data[ATTR_PARTS]:
+        change: dict[str, Any] = {"id": item[ATTR_PART_ID]}
+        if ATTR_ZONE in item:
+            change["z"] = item[ATTR_ZONE]
+        if ATTR_ENABLED in item:
+            change["e"] = 1 if item[ATTR_ENABLED] else 0
+        if ATTR_SOS in item:
+            change["ss"] = 1 if item[ATTR_SOS] else 0
+        changes.append(change)
+
+    await coordinator.async_send_modify_parts(hub_id, changes, rollback=call.data[ATTR_ROLLBACK])
+
+
+async def _async_set_mode_all(hass: HomeAssistant, call: ServiceCall) -> ServiceResponse:
+    """Send host_stat to every hub of the selected entries with bounded parallelism."""
+    mode = SET_MODE_ALL_MODES[call.data[ATTR_MODE]]
+    wait = call.data[ATTR_WAIT]
+    runtimes: dict[str, dict[str, Any]] = hass.data.get(DOMAIN) or {}
+
+    entry_ids = call.data.get(ATTR_CONFIG_ENTRY_ID) or list(runtimes)
+    targets: list[tuple[str, DreamcatcherCoordinator, str]] = []
+    for entry_id in entry_ids:
+        coordinator: DreamcatcherCoordinator | None = (runtimes.get(entry_id) or {}).get("coordinator")
+        if coordinator is None:
+            raise HomeAssistantError(f"Unknown or unloaded config entry: {entry_id}")
+        targets.extend((entry_id, coordinator, dev_id) for dev_id in coordinator.get_device_ids())
+
+    # Bounds concurrent publishes only; waiting for confirmations holds no slot.
+    semaphore = asyncio.Semaphore(SET_MODE_ALL_CONCURRENCY)
+
+    async def _one(entry_id: str, coordinator: DreamcatcherCoordinator, dev_id: str) -> dict[str, Any]:
+        result: dict[str, Any] = {"config_entry_id": entry_id}
+        start = time.monotonic()
+        try:
+            async with semaphore:
+                ack = await coordinator.async_send_alarm_command(dev_id, mode)
+            result["status"] = "published"
+            result["publish_ms"] = round((time.monotonic() - start) * 1000, 1)
+            if wait:
+                outcome = await ack
+                result["status"] = outcome.status
+                if outcome.latency is not None:
+                    result["latency_ms"] = round(outcome.latency * 1000, 1)
+        except Exception as err:  # noqa: BLE001 - reported per device
+            result["status"] = "error"
+            result["error"] = str(err)
+        return result
+
+    outcomes = await asyncio.gather(*(_one(*target) for target in targets))
+    results = {dev_id: outcome for (_, _, dev_id), outcome in zip(targets, outcomes)}
+
+    failed = [dev_id for dev_id, res in results.items() if res["status"] in ("error", "timeout")]
+    if failed and not call.return_response:
+        raise HomeAssistantError(f"set_mode_all failed for: {', '.join(failed)}")
+
+    return {"results": results} if call.return_response else None
+
+
+async def _async_backfill_history(hass: HomeAssistant, call: ServiceCall) -> ServiceResponse:
+    """Start the background history backfill of a hub; it keeps running after the call returns."""
+    coordinator, hub_id = _resolve_hub(hass, call.data[ATTR_DEVICE_ID])
+    progress = await coordinator.async_start_history_backfill(hub_id, restart=call.data[ATTR_RESTART])
+    return {"device_id": hub_id, **progress} if call.return_response else None
+
+
+def _timestamp(value: Any) -> int | None:
+    return int(dt_util.as_timestamp(value)) if value is not None else None
+
+
+async def _async_query_history(hass: HomeAssistant, call: ServiceCall) -> ServiceResponse:
+    coordinator, hub_id = _resolve_hub(hass, call.data[ATTR_DEVICE_ID])
+    start = call.data.get(ATTR_START)
+    end = call.data.get(ATTR_END)
+    query = HistoryQuery(
+        start=_timestamp(start),
+        end=_timestamp(end),
+        event_codes=tuple(_EVENT_TYPE_CODES[name] for name in call.data.get(ATTR_EVENT_TYPE) or ()),
+        source_ids=tuple(call.data.get(ATTR_SOURCE_ID) or ()),
+        alarm_origins=tuple(call.data.get(ATTR_ALARM_ORIGIN) or ()),
+        interval=call.data[ATTR_INTERVAL],
+        limit=call.data[ATTR_LIMIT],
+    )
+    return {"device_id": hub_id, **await coordinator.async_query_history(hub_id, query)}
+
+
+async def _async_get_history(hass: HomeAssistant, call: ServiceCall) -> ServiceResponse:
+    coordinator, hub_id = _resolve_hub(hass, call.data[ATTR_DEVICE_ID])
+    page = await coordinator.async_get_history(hub_id, offset=call.data[ATTR_OFFSET], limit=call.data[ATTR_LIMIT])
+    return {"device_id": hub_id, **page}
+
+
+async def _async_export_history(hass: HomeAssistant, call: ServiceCall) -> ServiceResponse:
+    """Stream the history of a hub to a file; progress is reported as EVENT_HISTORY_EXPORT bus events."""
+    coordinator, hub_id = _resolve_hub(hass, call.data[ATTR_DEVICE_ID])
+    fmt = call.data[ATTR_FORMAT]
+    filename = call.data.get(ATTR_FILENAME) or f"{hub_id}_{dt_util.now():%Y%m%d_%H%M%S}.{fmt}"
+    path = hass.config.path(HISTORY_EXPORT_DIR, filename)
+
+    if call.data[ATTR_SOURCE] == "cloud":
+        pages = coordinator.async_iter_cloud_history(hub_id)
+    else:
+        pages = coordinator.async_iter_logged_history(
+            hub_id, _timestamp(call.data.get(ATTR_START)), _timestamp(call.data.get(ATTR_END))
+        )
+
+    def _progress(rows: int, done: bool = False) -> None:
+        hass.bus.async_fire(EVENT_HISTORY_EXPORT, {"device_id": hub_id, "path": path, "rows": rows, "done": done})
+
+    try:
+        rows = await async_export_history(hass, pages, path, fmt, _progress)
+    except OSError as err:
+        raise HomeAssistantError(f"Cannot write {path}: {err}") from err
+    except DreamcatcherAuthError as err:
+        raise HomeAssistantError(f"Authentication failed while reading the alarm history: {err}") from err
+    except DreamcatcherError as err:
+        raise HomeAssistantError(f"Cannot read the alarm history of {hub_id}: {err}") from err
+    _progress(rows, done=True)
+    return {"device_id": hub_id, "path": path, "rows": rows} if call.return_response else None
+
+
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register the integration services (once for all config entries)."""
+    if hass.services.has_service(DOMAIN, SERVICE_MODIFY_PARTS):
+        return
+
+    async def _handle_modify_parts(call: ServiceCall) -> None:
+        await _async_modify_parts(hass, call)
+
+    async def _handle_set_mode_all(call: ServiceCall) -> ServiceResponse:
+        return await _async_set_mode_all(hass, call)
+
+    async def _handle_backfill_history(call: ServiceCall) -> ServiceResponse:
+        return await _async_backfill_history(hass, call)
+
+    async def _handle_query_history(call: ServiceCall) -> ServiceResponse:
+        return await _async_query_history(hass, call)
+
+    async def _handle_export_history(call: ServiceCall) -> ServiceResponse:
+        return await _async_export_history(hass, call)
+
+    async def _handle_get_history(call: ServiceCall) -> ServiceResponse:
+        return await _async_get_history(hass, call)
+
+    hass.services.async_register(DOMAIN, SERVICE_MODIFY_PARTS, _handle_modify_parts, schema=MODIFY_PARTS_SCHEMA)
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_SET_MODE_ALL,
+        _handle_set_mode_all,
+        schema=SET_MODE_ALL_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    # backfill and export fetch from the cloud and write files under the config directory: admins only
+    async_register_admin_service(
+        hass,
+        DOMAIN,
+        SERVICE_BACKFILL_HISTORY,
+        _handle_backfill_history,
+        schema=BACKFILL_HISTORY_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_QUERY_HISTORY,
+        _handle_query_history,
+        schema=QUERY_HISTORY_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
+    async_register_admin_service(
+        hass,
+        DOMAIN,
+        SERVICE_EXPORT_HISTORY,
+        _handle_export_history,
+        schema=EXPORT_HISTORY_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_GET_HISTORY,
+        _handle_get_history,
+        schema=GET_HISTORY_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
+
+
+def async_unload_services(hass: HomeAssistant) -> None:
+    """Remove the integration services once the last config entry is unloaded."""
+    if hass.data.get(DOMAIN):
+        return
+    hass.services.async_remove(DOMAIN, SERVICE_MODIFY_PARTS)
+    hass.services.async_remove(DOMAIN, SERVICE_SET_MODE_ALL)
+    hass.services.async_remove(DOMAIN, SERVICE_BACKFILL_HISTORY)
+    hass.services.async_remove(DOMAIN, SERVICE_QUERY_HISTORY)
+    hass.services.async_remove(DOMAIN, SERVICE_EXPORT_HISTORY)
+    hass.services.async_remove(DOMAIN, SERVICE_GET_HISTORY)
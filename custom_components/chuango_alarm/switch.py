@@ -1,35 +1,20 @@
 from __future__ import annotations
 
+from collections.abc import Iterable
 from typing import Any
 
 from homeassistant.components.switch import SwitchEntity
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant, callback
-from homeassistant.helpers import entity_platform
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entity import DeviceInfo
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from .const import DOMAIN
 from .coordinator import DreamcatcherCoordinator
+from .parts import PartRecord, PartsChange
 from .utils import resolve_device_model
 
-MTYPE_KEYFOB = 2
-
-
-def _part_is_keyfob(part: dict[str, Any]) -> bool:
-    c_val = part.get("c")
-    if c_val is not None:
-        try:
-            return (int(c_val) & 0x0F) == MTYPE_KEYFOB
-        except (ValueError, TypeError):
-            pass
-
-    t_val = part.get("t")
-    try:
-        return int(t_val) == 44
-    except (ValueError, TypeError):
-        return False
-
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry, async_add_entities) -> None:
     coordinator: DreamcatcherCoordinator = hass.data[DOMAIN][entry.entry_id]["coordinator"]
@@ -37,82 +22,45 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry, async_add_e
     if coordinator.data is None:
         await coordinator.async_config_entry_first_refresh()
 
-    known: set[tuple[str, str]] = set()
-    entities: list[SwitchEntity] = []
+    def _device_entities(dev_id: str) -> list[SwitchEntity]:
+        return [
+            ArmDisarmBeepSwitch(coordinator, entry, dev_id),
+            EntryDelayToneSwitch(coordinator, entry, dev_id),
+            ExitDelayToneSwitch(coordinator, entry, dev_id),
+            TestModeSwitch(coordinator, entry, dev_id),
+        ]
 
-    for dev_id in coordinator.get_device_ids():
-        known.add((dev_id, "arm_disarm_beep"))
-        known.add((dev_id, "entry_delay_tone"))
-        known.add((dev_id, "exit_delay_tone"))
-        known.add((dev_id, "test_mode"))
-        entities.append(ArmDisarmBeepSwitch(coordinator, entry, dev_id))
-        entities.append(EntryDelayToneSwitch(coordinator, entry, dev_id))
-        entities.append(ExitDelayToneSwitch(coordinator, entry, dev_id))
-        entities.append(TestModeSwitch(coordinator, entry, dev_id))
-
-    def _build_part_switch_entities() -> list[SwitchEntity]:
+    def _part_entities(dev_id: str, parts: Iterable[PartRecord]) -> list[SwitchEntity]:
         built: list[SwitchEntity] = []
-        mqtt_state = (coordinator.data or {}).get("mqtt_state") or {}
-        if not isinstance(mqtt_state, dict):
-            return built
-
-        for dev_id in coordinator.get_device_ids():
-            dev_state = mqtt_state.get(dev_id) or {}
-            parts = dev_state.get("parts") or []
-            if not isinstance(parts, list):
-                continue
-
-            for part in parts:
-                if not isinstance(part, dict):
-                    continue
-                part_id = part.get("id")
-                if part_id is None:
-                    continue
-
-                key = (dev_id, f"part_enabled_{part_id}")
-                if key in known:
-                    pass
-                else:
-                    known.add(key)
-                    built.append(PartEnabledSwitch(coordinator, entry, dev_id, int(part_id)))
-
-                if _part_is_keyfob(part):
-                    sos_key = (dev_id, f"part_sos_{part_id}")
-                    if sos_key in known:
-                        continue
-                    known.add(sos_key)
-                    built.append(PartSosSwitch(coordinator, entry, dev_id, int(part_id)))
-
+        for part in parts:
+            built.append(PartEnabledSwitch(coordinator, entry, dev_id, part.id))
+            if part.is_keyfob:
+                built.append(PartSosSwitch(coordinator, entry, dev_id, part.id))
         return built
 
-    entities.extend(_build_part_switch_entities())
+    entities: list[SwitchEntity] = []
+    for dev_id in coordinator.get_device_ids():
+        entities.extend(_device_entities(dev_id))
+        entities.extend(_part_entities(dev_id, coordinator.get_parts(dev_id)))
 
     async_add_entities(entities)
 
-    platform = entity_platform.async_get_current_platform()
+    @callback
+    def _on_devices_added(device_ids: list[str]) -> None:
+        async_add_entities([e for dev_id in device_ids for e in _device_entities(dev_id)])
 
     @callback
-    def _on_update() -> None:
-        now_ids = set(coordinator.get_device_ids())
-        new: list[SwitchEntity] = []
-        for dev_id in now_ids:
-            if (dev_id, "arm_disarm_beep") not in known:
-                known.add((dev_id, "arm_disarm_beep"))
-                new.append(ArmDisarmBeepSwitch(coordinator, entry, dev_id))
-            if (dev_id, "entry_delay_tone") not in known:
-                known.add((dev_id, "entry_delay_tone"))
-                new.append(EntryDelayToneSwitch(coordinator, entry, dev_id))
-            if (dev_id, "exit_delay_tone") not in known:
-                known.add((dev_id, "exit_delay_tone"))
-                new.append(ExitDelayToneSwitch(coordinator, entry, dev_id))
-            if (dev_id, "test_mode") not in known:
-                known.add((dev_id, "test_mode"))
-                new.append(TestModeSwitch(coordinator, entry, dev_id))
-        new.extend(_build_part_switch_entities())
+    def _on_parts_changed(change: PartsChange) -> None:
+        new = _part_entities(change.device_id, change.added)
         if new:
-            hass.async_create_task(platform.async_add_entities(new))
+            async_add_entities(new)
 
-    coordinator.async_add_listener(_on_update)
+    entry.async_on_unload(
+        async_dispatcher_connect(hass, coordinator.signal_devices_added, _on_devices_added)
+    )
+    entry.async_on_unload(
+        async_dispatcher_connect(hass, coordinator.signal_parts_changed, _on_parts_changed)
+    )
 
 
 class ArmDisarmBeepSwitch(CoordinatorEntity[DreamcatcherCoordinator], SwitchEntity):
@@ -123,7 +71,7 @@ class ArmDisarmBeepSwitch(CoordinatorEntity[DreamcatcherCoordinator], SwitchEnti
     _attr_icon = "mdi:volume-vibrate"
 
     def __init__(self, coordinator: DreamcatcherCoordinator, entry: ConfigEntry, device_id: str) -> None:
-        super().__init__(coordinator)
+        super().__init__(coordinator, context=device_id)
         self._entry = entry
         self.device_id = device_id
         self._attr_unique_id = f"{entry.entry_id}_{device_id}_arm_beep"
@@ -265,7 +213,7 @@ class PartEnabledSwitch(CoordinatorEntity[DreamcatcherCoordinator], SwitchEntity
     _attr_icon = "mdi:power"
 
     def __init__(self, coordinator: DreamcatcherCoordinator, entry: ConfigEntry, device_id: str, part_id: int) -> None:
-        super().__init__(coordinator)
+        super().__init__(coordinator, context=device_id)
         self._entry = entry
         self.device_id = device_id
         self._part_id = part_id
@@ -280,16 +228,8 @@ class PartEnabledSwitch(CoordinatorEntity[DreamcatcherCoordinator], SwitchEntity
         return {}
 
     @property
-    def _part(self) -> dict[str, Any] | None:
-        parts = self._st.get("parts") or []
-        if not isinstance(parts, list):
-            return None
-        for part in parts:
-            if not isinstance(part, dict):
-                continue
-            if part.get("id") == self._part_id:
-                return part
-        return None
+    def _part(self) -> PartRecord | None:
+        return self.coordinator.get_part(self.device_id, self._part_id)
 
     @property
     def available(self) -> bool:
@@ -299,17 +239,14 @@ class PartEnabledSwitch(CoordinatorEntity[DreamcatcherCoordinator], SwitchEntity
 
     @property
     def device_info(self) -> DeviceInfo:
-        part = self._part or {}
-        part_name = part.get("n") or f"Part {self._part_id}"
-        category = part.get("c")
-        ptype = part.get("t")
-        model = "Sensor" if category == 129 else ("Key Fob" if category == 130 else f"Accessory (c={category}, t={ptype})")
+        part = self._part
+        part_name = (part.name if part else None) or f"Part {self._part_id}"
 
         return DeviceInfo(
             identifiers={(DOMAIN, f"{self.device_id}_part_{self._part_id}")},
             name=part_name,
             manufacturer="Chuango",
-            model=model,
+            model=part.model if part else None,
             via_device=(DOMAIN, self.device_id),
         )
 
@@ -319,29 +256,9 @@ class PartEnabledSwitch(CoordinatorEntity[DreamcatcherCoordinator], SwitchEntity
         if not part:
             return None
 
-        # Primary source (if present): explicit enable flag.
-        val = part.get("e")
-        if val is not None:
-            try:
-                # Live logs indicate: e=0 -> disabled, e=1 -> enabled
-                return int(val) == 1
-            except (ValueError, TypeError):
-                pass
-
-        # Fallback source: c bitfield from parts_list.
-        # Observed behavior:
-        # - c=129 (1000_0001) -> enabled
-        # - c=1   (0000_0001) -> disabled
-        c_val = part.get("c")
-        if c_val is not None:
-            try:
-                c_int = int(c_val)
-                status_bit = (c_int >> 7) & 0x01
-                return status_bit == 1
-            except (ValueError, TypeError):
-                return None
-
-        return True
+        # PartRecord.enabled prefers the explicit e flag and falls back to
+        # the c bitfield status bit (c=129 -> enabled, c=1 -> disabled).
+        return part.enabled if part.enabled is not None else True
 
     async def async_turn_on(self, **kwargs: Any) -> None:
         await self.coordinator.async_send_modify_part_enabled(self.device_id, self._part_id, enabled=True)
@@ -365,13 +282,9 @@ class PartSosSwitch(PartEnabledSwitch):
         part = self._part
         if not part:
             return None
-        val = part.get("ss")
-        if val is None:
-            return None
-        try:
-            return int(val) == 1
-        except (ValueError, TypeError):
+        if part.ss is None:
             return None
+        return part.ss == 1
 
     async def async_turn_on(self, **kwargs: Any) -> None:
         await self.coordinator.async_send_modify_part_sos(self.device_id, self._part_id, sos_enabled=True)
@@ -16,7 +16,7 @@ from homeassistant.components.update import (
 )
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant, callback
-from homeassistant.helpers import entity_platform
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entity import DeviceInfo, EntityCategory
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
@@ -31,48 +31,27 @@ FIRMWARE_UPDATE_ADVISORY_ZH_HANS = "建议：请使用 DreamCatcher Live App 执
 FIRMWARE_UPDATE_ADVISORY_ZH_HANT = "建議：請使用 DreamCatcher Live App 執行韌體更新。"
 
 
-async def async_setup_entry(
-    hass: HomeAssistant,
-    entry: ConfigEntry,
-    async_add_entities,
-) -> None:
+async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry, async_add_entities) -> None:
     """Set up Chuango firmware update entities."""
     coordinator: DreamcatcherCoordinator = hass.data[DOMAIN][entry.entry_id]["coordinator"]
 
     if coordinator.data is None:
         await coordinator.async_config_entry_first_refresh()
 
-    known: set[str] = set()
-    entities: list[UpdateEntity] = []
+    def _device_entities(dev_id: str) -> list[UpdateEntity]:
+        return [
+            ChuangoFirmwareUpdateEntity(coordinator, entry, dev_id),
+        ]
 
-    devices = (coordinator.data or {}).get("shared_devices") or {}
-    if isinstance(devices, dict):
-        for dev_id in devices.keys():
-            if dev_id not in known:
-                known.add(dev_id)
-                entities.append(
-                    ChuangoFirmwareUpdateEntity(coordinator, entry, dev_id)
-                )
-
-    if entities:
-        async_add_entities(entities)
-
-    platform = entity_platform.async_get_current_platform()
+    async_add_entities([e for dev_id in coordinator.get_device_ids() for e in _device_entities(dev_id)])
 
     @callback
-    def _on_update() -> None:
-        devices_now = (coordinator.data or {}).get("shared_devices") or {}
-        if not isinstance(devices_now, dict):
-            return
-        new: list[UpdateEntity] = []
-        for dev_id in devices_now.keys():
-            if dev_id not in known:
-                known.add(dev_id)
-                new.append(ChuangoFirmwareUpdateEntity(coordinator, entry, dev_id))
-        if new:
-            hass.async_create_task(platform.async_add_entities(new))
+    def _on_devices_added(device_ids: list[str]) -> None:
+        async_add_entities([e for dev_id in device_ids for e in _device_entities(dev_id)])
 
-    coordinator.async_add_listener(_on_update)
+    entry.async_on_unload(
+        async_dispatcher_connect(hass, coordinator.signal_devices_added, _on_devices_added)
+    )
 
 
 class ChuangoFirmwareUpdateEntity(
@@ -91,7 +70,7 @@ class ChuangoFirmwareUpdateEntity(
         entry: ConfigEntry,
         device_id: str,
     ) -> None:
-        super().__init__(coordinator)
+        super().__init__(coordinator, context=device_id)
         self._entry = entry
         self._device_id = device_id
         self._attr_unique_id = f"{entry.entry_id}_{device_id}_firmware_update"
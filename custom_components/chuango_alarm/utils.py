@@ -1,8 +1,10 @@
 from __future__ import annotations
 
 import hashlib
+import json
 import random
 import time
+from typing import Any
 
 
 PRODUCT_ID_LABELS: dict[str, str] = {
@@ -36,6 +38,40 @@ HOST_MODE_LABELS: dict[str, str] = {
     "s": "sos_alarm",
 }
 
+# itemEvent / iE code → event type string
+# Source: DreamCatcher Life APK – Config.EventEnum
+EVENT_CODE_MAP: dict[int, str] = {
+    10: "normal_alarm",
+    11: "sos",
+    12: "disarmed",
+    13: "armed",
+    14: "armed_home",
+    15: "tamper",
+    16: "low_battery",
+    17: "duress_alarm",
+    18: "offline",
+    19: "line_cut",
+    20: "ac_power_lost",
+    21: "ac_power_restored",
+    23: "above_limit",
+    24: "below_limit",
+    25: "deviation",
+    26: "sensor_triggered",
+    27: "schedule_alarm",
+    30: "door_open",
+    31: "door_closed",
+    40: "smoke_detected",
+    41: "alarm_test",
+    42: "system_fault",
+    43: "sensor_end_of_life",
+    53: "rf_interference",
+    54: "chime",
+    55: "door_unlocked",
+}
+
+# Events that set triggered_by: SOS (app/keyfob), tamper, sensor trigger
+TRIGGER_EVENT_CODES: tuple[int, ...] = (11, 15, 26)
+
 
 def md5_hex(value: str) -> str:
     return hashlib.md5(value.encode("utf-8")).hexdigest()
@@ -57,6 +93,37 @@ def generate_vendor_uuid() -> str:
     return f"uuid_{ts_ms}_{rnd:06d}"
 
 
+def parse_json_payload(payload: bytes | bytearray | memoryview | str | None) -> Any | None:
+    """Parse a JSON MQTT payload straight from its buffer.
+
+    json.loads detects the UTF-8 encoding of bytes input itself, so no
+    intermediate text copy is made. Returns None for empty/invalid payloads.
+    """
+    if isinstance(payload, memoryview):
+        payload = payload.tobytes()
+    if not payload:
+        return None
+    try:
+        return json.loads(payload)
+    except (TypeError, ValueError):
+        return None
+
+
+class LazyPayloadPreview:
+    """Log argument that decodes a payload only when the record is emitted."""
+
+    __slots__ = ("_payload",)
+
+    def __init__(self, payload: bytes | bytearray | memoryview | str | None) -> None:
+        self._payload = payload
+
+    def __str__(self) -> str:
+        payload = self._payload
+        if isinstance(payload, (bytes, bytearray, memoryview)):
+            return bytes(payload).decode("utf-8", errors="replace")
+        return str(payload)
+
+
 def product_name_from_id(product_id: str | int | None) -> str | None:
     if product_id is None:
         return None
@@ -191,3 +258,113 @@ def derive_alarm_origin(
         return "user_or_app"
 
     return "unknown"
+
+
+# Only live /dout/alarm events carry a serial ("sN") and source ("iI", "iT").
+# REST history items (ALARM_HISTORY_PATH) are only known to carry itemEvent,
+# itemName and time, so they are identified by (time, code, name) and matched
+# to live items where those agree (see history_items_match).
+
+
+def history_item_sn(item: dict[str, Any]) -> int | None:
+    """Return the event serial of an alarm history item, if it carries one."""
+    value = item.get("sN")
+    if value is None:
+        return None
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def history_item_time(item: dict[str, Any]) -> float:
+    try:
+        return float(item.get("time") or 0)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def format_history_item(item: dict[str, Any]) -> dict[str, Any]:
+    """Readable form of a history item (REST, live or event log format)."""
+    code = item.get("itemEvent")
+    try:
+        evt_i = int(code)
+    except (TypeError, ValueError):
+        evt_i = None
+    source_type = item.get("iT")
+    return {
+        "type": EVENT_CODE_MAP.get(evt_i, f"unknown_{code}"),
+        "event_code": evt_i,
+        "name": item.get("itemName") or "",
+        "time": int(history_item_time(item)),
+        "sn": history_item_sn(item),
+        "source_id": item.get("iI"),
+        "source_type": source_type,
+        "source_type_label": alarm_source_type_label(source_type),
+        "alarm_origin": derive_alarm_origin(event_code=evt_i, trigger_type=None, source_type=source_type),
+    }
+
+
+def history_item_key(item: dict[str, Any]) -> tuple[Any, ...]:
+    """Identity of a history item: its serial, else (time, event code, name, source id)."""
+    sn = history_item_sn(item)
+    if sn is not None:
+        return ("sn", sn)
+    return ("te", history_item_time(item), str(item.get("itemEvent")), item.get("itemName") or "", item.get("iI"))
+
+
+def history_items_match(a: dict[str, Any], b: dict[str, Any]) -> bool:
+    """Same event: equal time and code; serial, source and name must agree where both carry them.
+
+    A live item and its REST copy (which has no serial or source) match;
+    different sensors firing in the same second do not.
+    """
+    if history_item_time(a) != history_item_time(b) or str(a.get("itemEvent")) != str(b.get("itemEvent")):
+        return False
+    for mine, theirs in (
+        (history_item_sn(a), history_item_sn(b)),
+        (a.get("iI"), b.get("iI")),
+        (a.get("iT"), b.get("iT")),
+        (a.get("itemName") or None, b.get("itemName") or None),
+    ):
+        if mine is not None and theirs is not None and str(mine) != str(theirs):
+            return False
+    return True
+
+
+def merge_alarm_history(
+    known: list[dict[str, Any]],
+    incoming: list[dict[str, Any]],
+    limit: int,
+) -> tuple[list[dict[str, Any]], int]:
+    """Merge history items newest first without duplicates; return (items, added).
+
+    A live item and its REST counterpart are the same event; the REST item wins
+    (it is the canonical record), the serial from the live one is kept. Incoming
+    items are only matched against known ones (each absorbs at most one), never
+    against each other: look-alikes within a page are distinct events.
+    """
+    items = [item for item in known if isinstance(item, dict)]
+    unclaimed: dict[tuple[float, str], list[int]] = {}
+    for index, item in enumerate(items):
+        unclaimed.setdefault((history_item_time(item), str(item.get("itemEvent"))), []).append(index)
+
+    added = 0
+    for item in incoming:
+        if not isinstance(item, dict):
+            continue
+        candidates = unclaimed.get((history_item_time(item), str(item.get("itemEvent"))), [])
+        index = next((index for index in candidates if history_items_match(items[index], item)), None)
+        if index is None:
+            items.append(item)
+            added += 1
+            continue
+        candidates.remove(index)
+        items[index] = {**items[index], **item}
+
+    items = sorted(
+        items,
+        key=lambda i: (history_item_time(i), history_item_sn(i) or 0),
+        reverse=True,
+    )
+    return items[:limit], added
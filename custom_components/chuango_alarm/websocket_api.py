@@ -0,0 +1,46 @@
+"""Websocket commands: alarm history on demand for dashboards and cards."""
+from __future__ import annotations
+
+from typing import Any
+
+import voluptuous as vol
+
+from homeassistant.components import websocket_api
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.exceptions import HomeAssistantError
+
+from .const import DOMAIN
+from .services import _resolve_hub
+
+_REGISTERED = f"{DOMAIN}_websocket_registered"
+
+
+@callback
+def async_setup_websocket_api(hass: HomeAssistant) -> None:
+    """Register the websocket commands (once; commands cannot be unregistered)."""
+    if hass.data.get(_REGISTERED):
+        return
+    hass.data[_REGISTERED] = True
+    websocket_api.async_register_command(hass, ws_get_history)
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): f"{DOMAIN}/history",
+        vol.Required("device_id"): str,
+        vol.Optional("limit", default=50): vol.All(vol.Coerce(int), vol.Range(min=1, max=1000)),
+        vol.Optional("offset", default=0): vol.All(vol.Coerce(int), vol.Range(min=0)),
+    }
+)
+@websocket_api.async_response
+async def ws_get_history(
+    hass: HomeAssistant, connection: websocket_api.ActiveConnection, msg: dict[str, Any]
+) -> None:
+    """Return a page of the alarm history of a hub, newest first."""
+    try:
+        coordinator, hub_id = _resolve_hub(hass, msg["device_id"])
+        page = await coordinator.async_get_history(hub_id, offset=msg["offset"], limit=msg["limit"])
+    except HomeAssistantError as err:
+        connection.send_error(msg["id"], websocket_api.ERR_NOT_FOUND, str(err))
+        return
+    connection.send_result(msg["id"], {"device_id": hub_id, **page})
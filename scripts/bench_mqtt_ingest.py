@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""Microbenchmark for the MQTT payload ingestion path.
+
+Compares the previous pipeline (eager utf-8 preview for the debug log,
+second decode to text, json.loads on str) with the current one
+(json.loads straight from the bytes buffer, lazy preview).
+
+Runs without Home Assistant installed:
+
+    python scripts/bench_mqtt_ingest.py [--messages 200000] [--debug]
+"""
+from __future__ import annotations
+
+import argparse
+import importlib.util
+import json
+import logging
+import time
+from pathlib import Path
+from typing import Any
+
+UTILS_PATH = Path(__file__).resolve().parents[1] / "custom_components" / "chuango_alarm" / "utils.py"
+
+_spec = importlib.util.spec_from_file_location("chuango_alarm_utils", UTILS_PATH)
+utils = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(utils)
+
+_LOGGER = logging.getLogger("bench_mqtt_ingest")
+
+# Representative OV-300 dout payloads (host_stat, host_conf, dev_conf, parts_list page, alarm)
+SAMPLES: list[bytes] = [
+    json.dumps({"m": {"res": {"a": "host_stat", "mode": "d", "alarm": 0, "trig": 0, "power": "ac", "test": 0, "time": 1735689600}}}).encode(),
+    json.dumps({"m": {"res": {"a": "host_conf", "IS": {"v": 2, "t": 1, "tm": 3}, "delay": {"o": 30, "ot": 1, "i": 15, "it": 1}}}}).encode(),
+    json.dumps({"m": {"res": {"a": "dev_conf", "tz": "+01:00", "w_v": "1.2.3", "ip": "192.168.1.20", "qs_d": 1, "qs_p": 1}}}).encode(),
+    json.dumps(
+        {
+            "m": {
+                "res": {
+                    "a": "parts_list",
+                    "page": 1,
+                    "finish": 1,
+                    "parts": [
+                        {"id": i, "n": f"Fenster Küche {i}", "c": 129, "t": 45, "md": 1, "z": 1, "si": i, "ss": 0, "e": 1}
+                        for i in range(1, 9)
+                    ],
+                }
+            }
+        },
+        ensure_ascii=False,
+    ).encode(),
+    json.dumps({"iN": "Home Assistant", "iE": 13, "tS": 1735689600, "sN": 4711, "iI": 0, "iT": 0}).encode(),
+]
+
+
+def _legacy_ingest(payload: bytes) -> Any | None:
+    try:
+        preview = payload.decode("utf-8", errors="replace")
+    except Exception:
+        preview = repr(payload)
+    _LOGGER.debug("MQTT RX DOUT payload=%s", preview)
+    try:
+        text = bytes(payload).decode("utf-8", errors="replace")
+        return json.loads(text)
+    except Exception:
+        return None
+
+
+def _current_ingest(payload: bytes) -> Any | None:
+    _LOGGER.debug("MQTT RX DOUT payload=%s", utils.LazyPayloadPreview(payload))
+    return utils.parse_json_payload(payload)
+
+
+def _run(fn, messages: int) -> float:
+    samples = SAMPLES
+    n = len(samples)
+    start = time.perf_counter()
+    for i in range(messages):
+        fn(samples[i % n])
+    return messages / (time.perf_counter() - start)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--messages", type=int, default=200_000)
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--debug", action="store_true", help="enable DEBUG logging (to a null handler)")
+    args = parser.parse_args()
+
+    _LOGGER.addHandler(logging.NullHandler())
+    _LOGGER.propagate = False
+    _LOGGER.setLevel(logging.DEBUG if args.debug else logging.INFO)
+
+    for payload in SAMPLES:
+        assert _legacy_ingest(payload) == _current_ingest(payload)
+
+    for name, fn in (("before", _legacy_ingest), ("after", _current_ingest)):
+        best = max(_run(fn, args.messages) for _ in range(args.rounds))
+        print(f"{name:>6}: {best:12,.0f} msg/s")
+
+
+if __name__ == "__main__":
+    main()
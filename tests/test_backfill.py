@@ -0,0 +1,69 @@
+"""Tests for the full alarm history backfill."""
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import Any
+
+from custom_components.chuango_alarm.backfill import BackfillProgress, HistoryBackfill, RateLimiter
+from custom_components.chuango_alarm.event_log import _DeviceLog
+
+
+class _EventLog:
+    """AlarmEventLog stand-in writing one device log directly."""
+
+    def __init__(self, log: _DeviceLog) -> None:
+        self.log = log
+
+    async def async_append(self, device_id: str, items: list[dict[str, Any]]) -> int:
+        return self.log.append(items)
+
+
+def _history(count: int) -> list[dict[str, Any]]:
+    """REST items newest first; four per second, two look-alike pairs each (no serial, no source)."""
+    return [{"itemEvent": 26, "itemName": f"Zone {i % 2}", "time": 1000 + i // 4} for i in reversed(range(count))]
+
+
+def _run(tmp_path, history: list[dict[str, Any]], on_fetch=None) -> _DeviceLog:
+    log = _DeviceLog(str(tmp_path / "dev"))
+
+    async def fetch(offset: int, count: int) -> dict[str, Any]:
+        page = {"items": [dict(item) for item in history[offset : offset + count]], "total": len(history)}
+        if on_fetch is not None:
+            on_fetch()
+        return page
+
+    backfill = HistoryBackfill(
+        device_id="dev",
+        fetch=fetch,
+        event_log=_EventLog(log),
+        progress=BackfillProgress(page_size=20),
+        on_progress=lambda: None,
+        concurrency=3,
+        limiter=RateLimiter(1000, burst=1000),
+        logger=logging.getLogger(__name__),
+    )
+    progress = asyncio.run(backfill.run())
+    assert progress.finished
+    return log
+
+
+def test_overlapping_chunks_lose_no_same_second_events(tmp_path) -> None:
+    history = _history(230)
+    log = _run(tmp_path, history)
+    assert log.count() == 230
+
+
+def test_events_arriving_during_backfill(tmp_path) -> None:
+    history = _history(230)
+    original = len(history)
+    newest = history[0]["time"]
+
+    def _new_event() -> None:
+        # two new events shift all offsets by two
+        if len(history) < original + 20:
+            history[:0] = [{"itemEvent": 12, "itemName": "Keyfob", "time": newest + len(history)}] * 2
+
+    log = _run(tmp_path, history, _new_event)
+    logged = log.read_range(None, newest)
+    assert len(logged) == original
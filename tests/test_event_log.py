@@ -0,0 +1,47 @@
+"""Tests for the on-disk alarm event log."""
+from __future__ import annotations
+
+from custom_components.chuango_alarm.event_log import _DeviceLog
+
+
+def _log(tmp_path) -> _DeviceLog:
+    return _DeviceLog(str(tmp_path / "dev"))
+
+
+def test_same_second_events_from_different_sources_are_kept(tmp_path) -> None:
+    log = _log(tmp_path)
+    added = log.append(
+        [
+            {"itemEvent": 26, "itemName": "Front door", "time": 1000, "iI": 3},
+            {"itemEvent": 26, "itemName": "Back door", "time": 1000, "iI": 7},
+        ]
+    )
+    assert added == 2
+    assert log.count() == 2
+
+
+def test_rest_copy_of_live_event_is_deduplicated(tmp_path) -> None:
+    log = _log(tmp_path)
+    log.append([{"itemEvent": 26, "itemName": "Front door", "time": 1000, "sN": 41, "iI": 3, "iT": 1}])
+    assert log.append([{"itemEvent": 26, "itemName": "Front door", "time": 1000}]) == 0
+    assert log.append([{"itemEvent": 26, "itemName": "Back door", "time": 1000}]) == 1
+    assert log.count() == 2
+
+
+def test_lookalike_items_of_one_batch_are_kept(tmp_path) -> None:
+    log = _log(tmp_path)
+    item = {"itemEvent": 12, "itemName": "Keyfob", "time": 1000}
+    assert log.append([item, dict(item)]) == 2
+    # a repeated page matches each logged record once
+    assert log.append([item, dict(item), dict(item)]) == 1
+    assert log.count() == 3
+
+
+def test_identical_records_across_a_page_boundary_are_all_read(tmp_path) -> None:
+    log = _log(tmp_path)
+    item = {"itemEvent": 12, "itemName": "Keyfob", "time": 1000}
+    log.append([dict(item) for _ in range(3)] + [{**item, "time": 1001}])
+    first = log.read_page(None, None, None, 0, 2)
+    second = log.read_page(None, None, first[-1], 2, 2)
+    assert [record.time for record in first + second] == [1000, 1000, 1000, 1001]
+    assert log.read_page(None, None, second[-1], 1, 2) == []
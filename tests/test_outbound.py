@@ -0,0 +1,55 @@
+"""Tests for the per-device outbound command scheduler."""
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+from typing import Any
+
+from custom_components.chuango_alarm.outbound import Lane, OutboundScheduler
+
+
+class _Hass:
+    """The parts of HomeAssistant the scheduler uses."""
+
+    def __init__(self) -> None:
+        self.loop = asyncio.get_running_loop()
+
+    def async_create_task(self, coro: Any) -> asyncio.Task:
+        return self.loop.create_task(coro)
+
+
+def _build(effective: dict[Any, Any]) -> dict[str, Any] | None:
+    return {"delay": dict(effective)} if effective else None
+
+
+async def _scheduler() -> tuple[OutboundScheduler, list[dict[str, Any]]]:
+    sent: list[dict[str, Any]] = []
+
+    async def publish(payload: str) -> None:
+        sent.append(json.loads(payload))
+
+    return OutboundScheduler(_Hass(), "dev", publish, logging.getLogger(__name__), window=0), sent
+
+
+def test_change_back_while_unacked_is_sent() -> None:
+    async def scenario() -> None:
+        scheduler, sent = await _scheduler()
+        # exit delay 20 -> 30 is published, the hub has not answered yet
+        assert await scheduler.submit(
+            Lane.NORMAL, _build, key="delay", changes={"o": 30}, baseline={"o": 20}, on_publish=lambda: None
+        )
+        assert scheduler.unacked_values("delay") == {"o": 30}
+        # back to 20: equal to the stale reported state, but not to the unacked 30
+        assert await scheduler.submit(
+            Lane.NORMAL, _build, key="delay", changes={"o": 20}, baseline={"o": 20}, on_publish=lambda: None
+        )
+        assert sent == [{"delay": {"o": 30}}, {"delay": {"o": 20}}]
+
+        scheduler.settle("delay")
+        scheduler.settle("delay")
+        assert scheduler.unacked_values("delay") == {}
+        # answered: the reported state is the baseline again
+        assert not await scheduler.submit(Lane.NORMAL, _build, key="delay", changes={"o": 20}, baseline={"o": 20})
+
+    asyncio.run(scenario())
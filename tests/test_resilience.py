@@ -0,0 +1,29 @@
+"""Tests for the REST failure handling helpers."""
+from __future__ import annotations
+
+from custom_components.chuango_alarm.resilience import LatencyWindow, adaptive_timeout
+
+
+def _timeout(window: LatencyWindow) -> float:
+    return adaptive_timeout(window, default=20, minimum=5)
+
+
+def test_timeouts_raise_the_adaptive_timeout_again() -> None:
+    window = LatencyWindow(size=50)
+    for _ in range(40):
+        window.observe(200)
+    assert _timeout(window) == 5
+
+    # the cloud slows down: timed out requests count at the applied timeout
+    for _ in range(3):
+        window.observe(_timeout(window) * 1000)
+    assert _timeout(window) == 20
+
+
+def test_old_samples_leave_the_window() -> None:
+    window = LatencyWindow(size=50)
+    for _ in range(50):
+        window.observe(30000)
+    for _ in range(50):
+        window.observe(300)
+    assert _timeout(window) == 5
@@ -0,0 +1,21 @@
+"""Tests for the alarm history helpers."""
+from __future__ import annotations
+
+from custom_components.chuango_alarm.utils import merge_alarm_history
+
+FRONT = {"itemEvent": 26, "itemName": "Front door", "time": 1000, "iI": 3}
+BACK = {"itemEvent": 26, "itemName": "Back door", "time": 1000, "iI": 7}
+
+
+def test_merge_keeps_same_second_items_of_one_page() -> None:
+    items, added = merge_alarm_history([], [FRONT, BACK], 100)
+    assert added == 2
+    assert [item["itemName"] for item in items] == ["Front door", "Back door"]
+
+
+def test_merge_matches_rest_copy_of_live_item() -> None:
+    live = {**FRONT, "sN": 41}
+    rest = {"itemEvent": 26, "itemName": "Front door", "time": 1000}
+    items, added = merge_alarm_history([live], [rest], 100)
+    assert added == 0
+    assert items == [{**live, **rest}]